@@ -7,6 +7,10 @@ load_dotenv()
 # Ollama
 OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11435")
 
+# Several GPU boxes: "http://gpu1:11434, http://gpu2:11434=qwen2.5-coder:14b|gemma2:9b"
+# (a host without "=models" serves every model). Empty = just OLLAMA_HOST.
+OLLAMA_HOSTS = os.getenv("OLLAMA_HOSTS", "")
+
 # SSH tunnel
 SSH_HOST = os.getenv("SSH_HOST", "152.66.244.201")
 SSH_PORT = int(os.getenv("SSH_PORT", "46422"))
@@ -17,3 +21,23 @@ SSH_TUNNEL_REMOTE_PORT = int(os.getenv("SSH_TUNNEL_REMOTE_PORT", "11434"))
 # LeetCode
 LEETCODE_GRAPHQL_URL = os.getenv("LEETCODE_GRAPHQL_URL", "https://leetcode.com/graphql")
 LEETCODE_SESSION = os.getenv("LEETCODE_SESSION", "")
+
+# Max in-flight generations per model for AsyncOllamaClient
+OLLAMA_MAX_CONCURRENCY = int(os.getenv("OLLAMA_MAX_CONCURRENCY", "2"))
+
+# How long a model stays loaded while --group-models still has requests queued for it
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "10m")
+
+# On-disk cache of LLM responses
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "data/llm_cache.sqlite")
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+
+# Local copy of fetched problems (TTL 0 = never expire)
+PROBLEM_STORE_PATH = os.getenv("PROBLEM_STORE_PATH", "data/problems.sqlite")
+PROBLEM_STORE_TTL_DAYS = float(os.getenv("PROBLEM_STORE_TTL_DAYS", "30"))
+
+# Verdicts of already judged code, keyed on (slug, lang, normalized code)
+SUBMISSION_CACHE_PATH = os.getenv("SUBMISSION_CACHE_PATH", "data/submissions.sqlite")
+
+# Every finished benchmark/compare run, indexed for queries across runs
+RESULTS_DB_PATH = os.getenv("RESULTS_DB_PATH", "data/results.sqlite")
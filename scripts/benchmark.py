@@ -1,4 +1,5 @@
 import argparse
+import asyncio
 import json
 import random
 import time
@@ -10,10 +11,15 @@ sys.path.insert(0, ".")
 import httpx
 
 import config
-from src.clients import OllamaClient, LeetCodeClient, LeetCodeSubmitter
+from src.clients import (
+    AsyncOllamaClient, LeetCodeClient, LeetCodeSubmitter, OllamaPool, ProblemPrefetcher,
+    ProblemStore, ResponseCache, SubmissionCache,
+)
+from src.clients.ollama_pool import parse_hosts
+from src.evaluation import BoundedSubmitter, Checkpoint, JobScheduler, ResultsStore
 from src.models import BenchmarkEntry, SolveResult, SubmissionResult
 from src.prompts import WRITER_SYSTEM, writer_prompt
-from src.utils import extract_code
+from src.utils.tracing import Tracer, span, use_tracer
 
 RESULTS_DIR = Path("results")
 
@@ -23,14 +29,13 @@ def pick_problems(all_problems: list[dict], difficulty: str, n: int) -> list[dic
     return random.sample(pool, min(n, len(pool)))
 
 
-def generate_solution(slug: str, model: str, leetcode: LeetCodeClient, ollama: OllamaClient) -> tuple[SolveResult, str | None]:
-    problem = leetcode.fetch_problem(slug)
+async def generate_solution(slug: str, model: str, problems: ProblemPrefetcher, ollama: AsyncOllamaClient) -> tuple[SolveResult, str | None]:
+    problem = await asyncio.to_thread(problems.get, slug)
     start = time.time()
 
     try:
-        raw = ollama.generate(model=model, prompt=writer_prompt(problem), system=WRITER_SYSTEM)
+        gen = await ollama.generate_code(model=model, prompt=writer_prompt(problem), system=WRITER_SYSTEM)
         elapsed = time.time() - start
-        code = extract_code(raw)
     except Exception as e:
         elapsed = time.time() - start
         result = SolveResult(
@@ -42,16 +47,70 @@ def generate_solution(slug: str, model: str, leetcode: LeetCodeClient, ollama: O
 
     result = SolveResult(
         slug=slug, title=problem.title, difficulty=problem.difficulty,
-        model=model, raw_response=raw, extracted_code=code,
-        generation_seconds=round(elapsed, 1),
+        model=model, raw_response=gen.text, extracted_code=gen.code,
+        generation_seconds=round(elapsed, 1), tokens_saved=gen.tokens_saved, stopped_early=gen.stopped_early,
     )
     return result, problem.id
 
 
-def submit_solution(slug: str, question_id: str, code: str, submitter: LeetCodeSubmitter) -> SubmissionResult:
+def submit_solution(slug: str, question_id: str, code: str, submitter: BoundedSubmitter) -> SubmissionResult:
     return submitter.submit(slug=slug, question_id=question_id, code=code)
 
 
+async def run_problem(p: dict, model: str, problems: ProblemPrefetcher, ollama: AsyncOllamaClient,
+                      submitter: BoundedSubmitter | None) -> BenchmarkEntry | None:
+    tag = f"[{p['slug']}]"
+    with span("problem", problem=p["slug"], model=model):
+        # Generate solution and extract code block
+        try:
+            solve, question_id = await generate_solution(p["slug"], model, problems, ollama)
+        except Exception as e:
+            print(f"  {tag} skip (fetch failed: {e})")
+            return None
+
+        if solve.error:
+            print(f"  {tag} generation error: {solve.error}")
+            return BenchmarkEntry(solve=solve)
+
+        if solve.extracted_code:
+            saved = f", ~{solve.tokens_saved} tokens saved" if solve.tokens_saved else ""
+            print(f"  {tag} generated in {solve.generation_seconds:.0f}s{saved}")
+        else:
+            print(f"  {tag} no code block found in response")
+            return BenchmarkEntry(solve=solve)
+
+        # Submit to LeetCod
+        submission = None
+        if submitter and solve.extracted_code:
+            try:
+                submission = await asyncio.to_thread(
+                    submit_solution, p["slug"], question_id, solve.extracted_code, submitter,
+                )
+                icon = "+" if submission.accepted else "x"
+                print(f"  {tag} [{icon}] {submission.status} ({submission.total_correct}/{submission.total_testcases})")
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code == 403:
+                    print(f"  {tag} skip (premium-only problem)")
+                else:
+                    print(f"  {tag} submit error: {e}")
+            except Exception as e:
+                print(f"  {tag} submit error: {e}")
+
+        return BenchmarkEntry(solve=solve, submission=submission)
+
+
+async def run_and_record(p: dict, model: str, problems: ProblemPrefetcher, ollama: AsyncOllamaClient,
+                         submitter: BoundedSubmitter | None, checkpoint: Checkpoint) -> None:
+    entry = await run_problem(p, model, problems, ollama, submitter)
+    if entry is None:
+        return
+    # Generation or submit errors are kept for the report but retried on --resume
+    done = entry.solve.error is None and (
+        submitter is None or not entry.solve.extracted_code or entry.submission is not None
+    )
+    checkpoint.append((p["slug"],), entry.model_dump(), done=done)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--model", default="qwen2.5-coder:32b")
@@ -60,6 +119,17 @@ def main() -> None:
     parser.add_argument("--hard", type=int, default=10)
     parser.add_argument("--seed", type=int, default=42)
     parser.add_argument("--no-submit", action="store_true", help="skip leetcode submission")
+    parser.add_argument("--jobs", type=int, default=4, help="problems running at once")
+    parser.add_argument("--ollama-concurrency", type=int, default=config.OLLAMA_MAX_CONCURRENCY,
+                        help="in-flight generations per model")
+    parser.add_argument("--submit-concurrency", type=int, default=2, help="in-flight leetcode submissions")
+    parser.add_argument("--no-cache", action="store_true", help="bypass the on-disk LLM response cache")
+    parser.add_argument("--no-submission-cache", action="store_true",
+                        help="always submit, even code that was already judged")
+    parser.add_argument("--trace", action="store_true",
+                        help="record stage timings, saved as JSONL and Chrome trace next to the results")
+    parser.add_argument("--resume", type=Path, metavar="CHECKPOINT",
+                        help="continue an interrupted run from its results/benchmark_*.jsonl checkpoint")
     args = parser.parse_args()
 
     random.seed(args.seed)
@@ -83,61 +153,70 @@ def main() -> None:
         print("submissions: ON (results will be verified on leetcode)")
     print("=" * 60)
 
-    leetcode = LeetCodeClient(graphql_url=config.LEETCODE_GRAPHQL_URL)
-    ollama = OllamaClient(host=config.OLLAMA_HOST)
-    submitter = None if args.no_submit else LeetCodeSubmitter(
-        session_cookie=config.LEETCODE_SESSION,
-        graphql_url=config.LEETCODE_GRAPHQL_URL,
+    # Every finished problem is appended here right away
+    settings = {
+        "model": args.model,
+        "seed": args.seed,
+        "submit": not args.no_submit,
+        "slugs": [p["slug"] for p in selected],
+    }
+    RESULTS_DIR.mkdir(exist_ok=True)
+    safe_model = args.model.replace(":", "_").replace("/", "_")
+    checkpoint_path = args.resume or RESULTS_DIR / f"benchmark_{safe_model}_{time.strftime('%Y%m%d_%H%M%S')}.jsonl"
+    try:
+        checkpoint = Checkpoint(checkpoint_path, settings, resume=args.resume is not None)
+    except (OSError, ValueError) as e:
+        print(f"cannot use checkpoint: {e}")
+        sys.exit(1)
+
+    pending = [p for p in selected if not checkpoint.is_done(p["slug"])]
+    if args.resume:
+        print(f"resuming {checkpoint_path}: {len(selected) - len(pending)} problems already done")
+
+    store = ProblemStore(config.PROBLEM_STORE_PATH, ttl_seconds=config.PROBLEM_STORE_TTL_DAYS * 86400 or None)
+    leetcode = LeetCodeClient(graphql_url=config.LEETCODE_GRAPHQL_URL, store=store)
+    cache = ResponseCache(config.LLM_CACHE_PATH, max_entries=config.LLM_CACHE_MAX_ENTRIES, enabled=not args.no_cache)
+    if config.OLLAMA_HOSTS:
+        ollama = OllamaPool(parse_hosts(config.OLLAMA_HOSTS), max_concurrency=args.ollama_concurrency, cache=cache)
+    else:
+        ollama = AsyncOllamaClient(host=config.OLLAMA_HOST, max_concurrency=args.ollama_concurrency, cache=cache)
+    submitter = None if args.no_submit else BoundedSubmitter(
+        LeetCodeSubmitter(
+            session_cookie=config.LEETCODE_SESSION,
+            graphql_url=config.LEETCODE_GRAPHQL_URL,
+            batch_poll=True,
+            cache=SubmissionCache(config.SUBMISSION_CACHE_PATH, enabled=not args.no_submission_cache),
+        ),
+        max_concurrency=args.submit_concurrency,
     )
 
-    entries: list[BenchmarkEntry] = []
+    # Problem details load in the background, a few problems ahead of the jobs
+    problems = ProblemPrefetcher(leetcode, [p["slug"] for p in pending], ahead=max(5, args.jobs))
+    tracer = Tracer() if args.trace else None
     t0 = time.time()
 
-    for i, p in enumerate(selected):
-        print(f"\n[{i+1}/{len(selected)}] {p['title']} ({p['difficulty']})")
-
-        # Generate solution and extract code block
-        try:
-            solve, question_id = generate_solution(p["slug"], args.model, leetcode, ollama)
-        except Exception as e:
-            print(f"  skip (fetch failed: {e})")
-            continue
-
-        if solve.error:
-            print(f"  generation error: {solve.error}")
-            entries.append(BenchmarkEntry(solve=solve))
-            continue
-
-        if solve.extracted_code:
-            print(f"  generated in {solve.generation_seconds:.0f}s")
-        else:
-            print(f"  no code block found in response")
-            entries.append(BenchmarkEntry(solve=solve))
-            continue
-
-        # Submit to LeetCod
-        submission = None
-        if submitter and solve.extracted_code:
-            try:
-                submission = submit_solution(p["slug"], question_id, solve.extracted_code, submitter)
-                icon = "+" if submission.accepted else "x"
-                print(f"  [{icon}] {submission.status} ({submission.total_correct}/{submission.total_testcases})")
-            except httpx.HTTPStatusError as e:
-                if e.response.status_code == 403:
-                    print(f"  skip (premium-only problem)")
-                else:
-                    print(f"  submit error: {e}")
-            except Exception as e:
-                print(f"  submit error: {e}")
-
-        entries.append(BenchmarkEntry(solve=solve, submission=submission))
+    # One job per problem that has no finished record yet
+    jobs = [
+        (lambda p=p: run_and_record(p, args.model, problems, ollama, submitter, checkpoint))
+        for p in pending
+    ]
+    print(f"\nRunning {len(jobs)} problems ({args.jobs} at once)...")
+    with use_tracer(tracer):
+        JobScheduler(max_jobs=args.jobs).run_sync(jobs)
+    problems.close()
+    checkpoint.close()
+
+    # Entries come from the checkpoint (selection order), so resumed runs include earlier sessions
+    entries: list[BenchmarkEntry] = [
+        BenchmarkEntry.model_validate(checkpoint.get(p["slug"]))
+        for p in selected
+        if checkpoint.get(p["slug"]) is not None
+    ]
 
     total_time = time.time() - t0
 
     # Save into json (later I can turn it into a md table or something)
-    RESULTS_DIR.mkdir(exist_ok=True)
-    safe_model = args.model.replace(":", "_").replace("/", "_")
-    out_path = RESULTS_DIR / f"benchmark_{safe_model}_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    out_path = checkpoint_path.with_suffix(".json")
 
     payload = {
         "model": args.model,
@@ -147,10 +226,19 @@ def main() -> None:
     }
     with open(out_path, "w", encoding="utf-8") as f:
         json.dump(payload, f, indent=2, ensure_ascii=False)
+    ResultsStore(config.RESULTS_DB_PATH).save_run(out_path.stem, payload)
 
     # Printsum
     print(f"\n{'=' * 60}")
-    print(f"done in {total_time / 60:.1f} min — saved to {out_path}")
+    print(f"done in {total_time / 60:.1f} min — saved to {out_path} and {config.RESULTS_DB_PATH}")
+    if cache.enabled:
+        print(f"llm cache: {cache.stats()}")
+    if isinstance(ollama, OllamaPool):
+        print(f"ollama hosts: {ollama.stats()}")
+    if tracer:
+        tracer.write_jsonl(out_path.with_suffix(".trace.jsonl"))
+        tracer.write_chrome_trace(out_path.with_suffix(".trace.json"))
+        print(f"trace: {out_path.with_suffix('.trace.json')} ({len(tracer.spans)} spans)")
 
     for diff in ["Easy", "Medium", "Hard"]:
         group = [e for e in entries if e.solve.difficulty == diff]
@@ -13,9 +13,18 @@ import logging
 
 import httpx
 import config
-from src.clients import OllamaClient, LeetCodeClient, LeetCodeSubmitter
-from src.agents import Baseline, BaselineFix, Reviewer, ReviewerFix, AgentPipeline
+from src.clients import (
+    AsyncOllamaClient, LeetCodeClient, LeetCodeSubmitter, OllamaPool, ProblemStore, ResponseCache, SubmissionCache,
+)
+from src.clients.ollama_pool import parse_hosts
+from src.agents import (
+    AsyncBaseline, AsyncBaselineFix, AsyncBestOfN, AsyncReviewer, AsyncReviewerFix, AsyncAgentPipeline,
+)
+from src.evaluation import BoundedSubmitter, Checkpoint, JobScheduler, LocalJudge, ResultsStore
+from src.models.problem import Problem
 from src.utils import ReportGenerator
+from src.utils.telemetry import summarize_generations
+from src.utils.tracing import Tracer, use_tracer
 from src.models.config import SolveConfig
 from src.models.pipeline_run_result import PipelineRunResult
 
@@ -32,41 +41,56 @@ def pick_problems(all_problems: list[dict], difficulty: str, n: int) -> list[dic
     return random.sample(pool, min(n, len(pool)))
 
 
-def run_pipeline(pipeline: AgentPipeline, problem) -> PipelineRunResult:
+async def run_pipeline(pipeline: AsyncAgentPipeline, problem: Problem) -> PipelineRunResult:
     t0 = time.time()
     try:
-        result = pipeline.run(problem)
+        result = await pipeline.run(problem)
     except httpx.HTTPStatusError as e:
         short = f"HTTP {e.response.status_code}"
-        print(f"  [{pipeline.name}] error: {short}")
-        return PipelineRunResult(time=round(time.time() - t0, 1), status=short)
+        print(f"  [{problem.slug}] [{pipeline.name}] error: {short}")
+        return PipelineRunResult(time=round(time.time() - t0, 1), status=short, error=short)
     except Exception as e:
         short = str(e).split("\n")[0][:80]
-        print(f"  [{pipeline.name}] error: {short}")
-        return PipelineRunResult(time=round(time.time() - t0, 1), status=short)
+        print(f"  [{problem.slug}] [{pipeline.name}] error: {short}")
+        return PipelineRunResult(time=round(time.time() - t0, 1), status=short, error=short)
     elapsed = round(time.time() - t0, 1)
 
     reviews = len(result.reviews)
     review_info = f", {reviews} reviews" if reviews else ""
+    telemetry = summarize_generations(result.generations)
+    raw = {
+        "code": result.code,
+        "raw_response": result.raw_response,
+        "raw_stopped_early": result.raw_stopped_early,
+        "raw_reviews": [r.raw for r in result.reviews],
+        "review_verdicts": [r.accepted for r in result.reviews],
+    }
 
     if not result.code:
-        print(f"  [{pipeline.name}] no code ({elapsed:.0f}s)")
-        return PipelineRunResult(time=elapsed, status="no code")
+        print(f"  [{problem.slug}] [{pipeline.name}] no code ({elapsed:.0f}s)")
+        return PipelineRunResult(time=elapsed, status="no code", **telemetry, **raw)
 
     if not result.submission:
-        print(f"  [{pipeline.name}] generated ({elapsed:.0f}s{review_info})")
-        return PipelineRunResult(time=elapsed, status="not submitted", num_reviews=reviews)
+        print(f"  [{problem.slug}] [{pipeline.name}] generated ({elapsed:.0f}s{review_info})")
+        return PipelineRunResult(time=elapsed, status="not submitted", num_reviews=reviews, **telemetry, **raw)
 
     icon = "+" if result.submission.accepted else "x"
-    print(f"  [{pipeline.name}] [{icon}] {result.submission.status} ({elapsed:.0f}s{review_info})")
+    print(f"  [{problem.slug}] [{pipeline.name}] [{icon}] {result.submission.status} ({elapsed:.0f}s{review_info})")
     return PipelineRunResult(
         time=elapsed,
         accepted=result.submission.accepted,
         status=result.submission.status,
         num_reviews=reviews,
+        **telemetry,
+        **raw,
     )
 
 
+async def run_and_record(pipeline: AsyncAgentPipeline, problem: Problem, checkpoint: Checkpoint) -> None:
+    result = await run_pipeline(pipeline, problem)
+    checkpoint.append((problem.slug, pipeline.name), result.model_dump(), done=result.error is None)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Compare baseline vs reviewer-loop")
     parser.add_argument("--easy", type=int, default=10)
@@ -74,6 +98,31 @@ def main() -> None:
     parser.add_argument("--hard", type=int, default=10)
     parser.add_argument("--seed", type=int, default=42)
     parser.add_argument("--max-iterations", type=int, default=3)
+    parser.add_argument("--jobs", type=int, default=4, help="(problem, pipeline) jobs running at once")
+    parser.add_argument("--ollama-concurrency", type=int, default=config.OLLAMA_MAX_CONCURRENCY,
+                        help="in-flight generations per model")
+    parser.add_argument("--submit-concurrency", type=int, default=2, help="in-flight leetcode submissions")
+    parser.add_argument("--group-models", action="store_true",
+                        help="run queued requests for one model back to back instead of alternating "
+                             "writer/reviewer (use with a high --jobs when both models don't fit in VRAM)")
+    parser.add_argument("--no-cache", action="store_true", help="bypass the on-disk LLM response cache")
+    parser.add_argument("--no-submission-cache", action="store_true",
+                        help="always submit, even code that was already judged")
+    parser.add_argument("--local-judge", action="store_true",
+                        help="run the description examples locally before spending a submission (fix pipelines)")
+    parser.add_argument("--conversation", action="store_true",
+                        help="send writer revisions as turns of one conversation to reuse the KV cache")
+    parser.add_argument("--structured-review", action="store_true",
+                        help="have the reviewer return a JSON verdict and issue list instead of free text")
+    parser.add_argument("--review-max-tokens", type=int, default=256,
+                        help="output token cap for --structured-review (default: 256)")
+    parser.add_argument("--best-of", type=int, default=0, metavar="N",
+                        help="also run the best-of-n pipeline with N concurrent writer samples")
+    parser.add_argument("--temperature", type=float, default=0.8, help="sampling temperature for --best-of")
+    parser.add_argument("--trace", action="store_true",
+                        help="record stage timings, saved as JSONL and Chrome trace next to the results")
+    parser.add_argument("--resume", type=Path, metavar="CHECKPOINT",
+                        help="continue an interrupted run from its results/compare_*.jsonl checkpoint")
     args = parser.parse_args()
 
     random.seed(args.seed)
@@ -97,51 +146,122 @@ def main() -> None:
     print(f"Reviewer: {REVIEWER_MODEL}")
     print("=" * 60)
 
-    leetcode = LeetCodeClient(graphql_url=config.LEETCODE_GRAPHQL_URL)
-    ollama = OllamaClient(host=config.OLLAMA_HOST)
-    submitter = LeetCodeSubmitter(
-        session_cookie=config.LEETCODE_SESSION,
-        graphql_url=config.LEETCODE_GRAPHQL_URL,
+    # Every finished (problem, pipeline) run is appended here right away
+    settings = {
+        "writer_model": WRITER_MODEL,
+        "reviewer_model": REVIEWER_MODEL,
+        "seed": args.seed,
+        "easy": args.easy,
+        "medium": args.medium,
+        "hard": args.hard,
+        "max_iterations": args.max_iterations,
+        "conversation": args.conversation,
+        "structured_review": args.structured_review,
+        "review_max_tokens": args.review_max_tokens,
+        "best_of": args.best_of,
+        "temperature": args.temperature,
+        # Guards against problem_list.json changing between sessions
+        "slugs": [p["slug"] for p in selected],
+    }
+    RESULTS_DIR.mkdir(exist_ok=True)
+    checkpoint_path = args.resume or RESULTS_DIR / f"compare_{time.strftime('%Y%m%d_%H%M%S')}.jsonl"
+    try:
+        checkpoint = Checkpoint(checkpoint_path, settings, resume=args.resume is not None)
+    except (OSError, ValueError) as e:
+        print(f"Cannot use checkpoint: {e}")
+        sys.exit(1)
+
+    store = ProblemStore(config.PROBLEM_STORE_PATH, ttl_seconds=config.PROBLEM_STORE_TTL_DAYS * 86400 or None)
+    leetcode = LeetCodeClient(graphql_url=config.LEETCODE_GRAPHQL_URL, store=store)
+    cache = ResponseCache(config.LLM_CACHE_PATH, max_entries=config.LLM_CACHE_MAX_ENTRIES, enabled=not args.no_cache)
+    if config.OLLAMA_HOSTS:
+        ollama = OllamaPool(
+            parse_hosts(config.OLLAMA_HOSTS),
+            max_concurrency=args.ollama_concurrency,
+            cache=cache,
+            group_models=args.group_models,
+            keep_alive=config.OLLAMA_KEEP_ALIVE,
+        )
+    else:
+        ollama = AsyncOllamaClient(
+            host=config.OLLAMA_HOST,
+            max_concurrency=args.ollama_concurrency,
+            cache=cache,
+            group_models=args.group_models,
+            keep_alive=config.OLLAMA_KEEP_ALIVE,
+        )
+    submitter = BoundedSubmitter(
+        LeetCodeSubmitter(
+            session_cookie=config.LEETCODE_SESSION,
+            graphql_url=config.LEETCODE_GRAPHQL_URL,
+            batch_poll=True,
+            cache=SubmissionCache(config.SUBMISSION_CACHE_PATH, enabled=not args.no_submission_cache),
+        ),
+        max_concurrency=args.submit_concurrency,
     )
 
     cfg = SolveConfig(
         writer_model=WRITER_MODEL,
         reviewer_model=REVIEWER_MODEL,
         max_iterations=args.max_iterations,
+        conversation=args.conversation,
+        structured_review=args.structured_review,
+        review_max_tokens=args.review_max_tokens,
     )
 
-    pipelines: list[AgentPipeline] = [
-        Baseline(ollama, WRITER_MODEL, submitter),
-        BaselineFix(ollama, WRITER_MODEL, submitter),
-        Reviewer(ollama, cfg, submitter),
-        ReviewerFix(ollama, cfg, submitter),
+    judge = LocalJudge() if args.local_judge else None
+
+    pipelines: list[AsyncAgentPipeline] = [
+        AsyncBaseline(ollama, WRITER_MODEL, submitter),
+        AsyncBaselineFix(ollama, WRITER_MODEL, submitter, judge=judge),
+        AsyncReviewer(ollama, cfg, submitter),
+        AsyncReviewerFix(ollama, cfg, submitter, judge=judge),
     ]
+    if args.best_of:
+        pipelines.append(AsyncBestOfN(
+            ollama, WRITER_MODEL, submitter, n=args.best_of, temperature=args.temperature, judge=judge,
+        ))
 
     pipeline_names = [p.name for p in pipelines]
     results = []
+    tracer = Tracer() if args.trace else None
     t0 = time.time()
 
-    for i, p in enumerate(selected):
-        print(f"\n[{i+1}/{len(selected)}] {p['title']} ({p['difficulty']})")
-
-        try:
-            problem = leetcode.fetch_problem(p["slug"])
-        except Exception as e:
-            print(f"  skip (fetch failed: {e})")
-            continue
-
-        entry = {"slug": p["slug"], "title": p["title"], "difficulty": p["difficulty"]}
-
-        for pipeline in pipelines:
-            print(f"  [{pipeline.name}] running...")
-            entry[pipeline.name] = run_pipeline(pipeline, problem).model_dump()
-
-        results.append(entry)
+    pending = [p for p in selected if not all(checkpoint.is_done(p["slug"], name) for name in pipeline_names)]
+    if args.resume:
+        print(f"Resuming {checkpoint_path}: {len(selected) - len(pending)} problems already done")
+
+    with use_tracer(tracer):
+        # All problem details in a few batched requests
+        fetched = leetcode.fetch_problems([p["slug"] for p in pending])
+        problems: list[Problem] = []
+        for p in pending:
+            if p["slug"] in fetched:
+                problems.append(fetched[p["slug"]])
+            else:
+                print(f"  skip {p['title']} (fetch failed)")
+
+        # One job per (problem, pipeline) that has no finished record yet
+        jobs = [
+            (lambda pipeline=pipeline, problem=problem: run_and_record(pipeline, problem, checkpoint))
+            for problem in problems
+            for pipeline in pipelines
+            if not checkpoint.is_done(problem.slug, pipeline.name)
+        ]
+        print(f"\nRunning {len(jobs)} jobs ({args.jobs} at once)...")
+        JobScheduler(max_jobs=args.jobs).run_sync(jobs)
+    checkpoint.close()
+
+    # The report is built from the checkpoint, so resumed runs include earlier sessions
+    for p in selected:
+        records = {name: checkpoint.get(p["slug"], name) for name in pipeline_names}
+        records = {name: r for name, r in records.items() if r is not None}
+        if records:
+            results.append({"slug": p["slug"], "title": p["title"], "difficulty": p["difficulty"], **records})
 
     # Save results to JSON
     total_time = time.time() - t0
-    RESULTS_DIR.mkdir(exist_ok=True)
-    out_path = RESULTS_DIR / f"compare_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    out_path = checkpoint_path.with_suffix(".json")
 
     payload = {
         "writer_model": WRITER_MODEL,
@@ -154,10 +274,23 @@ def main() -> None:
     }
     with open(out_path, "w", encoding="utf-8") as f:
         json.dump(payload, f, indent=2, ensure_ascii=False)
+    store = ResultsStore(config.RESULTS_DB_PATH)
+    store.save_run(out_path.stem, payload)
 
     # Console summary
     print(f"\n{'=' * 60}")
-    print(f"Done in {total_time / 60:.1f} min — saved to {out_path}\n")
+    print(f"Done in {total_time / 60:.1f} min — saved to {out_path} and {config.RESULTS_DB_PATH}")
+    if cache.enabled:
+        print(f"LLM cache: {cache.stats()}")
+    if isinstance(ollama, OllamaPool):
+        print(f"Ollama hosts: {ollama.stats()}")
+    elif ollama.scheduler:
+        print(f"Model switches: {ollama.scheduler.switches}")
+    if tracer:
+        tracer.write_jsonl(out_path.with_suffix(".trace.jsonl"))
+        tracer.write_chrome_trace(out_path.with_suffix(".trace.json"))
+        print(f"Trace: {out_path.with_suffix('.trace.json')} ({len(tracer.spans)} spans)")
+    print()
 
     for diff in ["Easy", "Medium", "Hard"]:
         group = [e for e in results if e["difficulty"] == diff]
@@ -174,7 +307,7 @@ def main() -> None:
 
     # Generate Markdown report
     md_path = out_path.with_suffix(".md")
-    report = ReportGenerator(payload)
+    report = ReportGenerator.from_store(store, out_path.stem)
     md_path.write_text(report.generate(), encoding="utf-8")
     print(f"Report: {md_path}")
 
@@ -1,22 +1,53 @@
+import argparse
 import json
 import sys
+from pathlib import Path
+
 sys.path.insert(0, ".")
 
 import config
 from src.clients import LeetCodeClient
 
 
+def diff_problem_lists(existing: list[dict], fresh: list[dict]) -> tuple[int, int, int]:
+    """Number of added, changed and removed entries in a fresh (free-only) list vs. the existing one."""
+    old = {p["slug"]: p for p in existing}
+    new = {p["slug"]: p for p in fresh}
+
+    added = sum(1 for slug in new if slug not in old)
+    changed = sum(1 for slug, p in new.items() if slug in old and old[slug] != p)
+    removed = sum(1 for slug in old if slug not in new)
+    return added, changed, removed
+
+
 def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--incremental", action="store_true",
+                        help="still refetches every page, but reports added/changed/removed problems "
+                             "and leaves the file alone if nothing changed")
+    parser.add_argument("--workers", type=int, default=4, help="pages fetched in parallel")
+    args = parser.parse_args()
+
+    out_path = Path("data/problem_list.json")
     client = LeetCodeClient(graphql_url=config.LEETCODE_GRAPHQL_URL)
 
     print("Fetching all LeetCode problems...")
-    problems = client.fetch_problem_list()
+    problems = client.fetch_problem_list(max_workers=args.workers)
 
     # Filter out paid-only problems (we can't access those)
     free = [p for p in problems if not p["paid_only"]]
 
+    if args.incremental and out_path.exists():
+        with open(out_path, encoding="utf-8") as f:
+            existing = json.load(f)
+        added, changed, removed = diff_problem_lists(existing, free)
+        print(f"\nIncremental: {added} new, {changed} changed, {removed} removed")
+        if not (added or changed or removed):
+            print(f"Nothing to update in {out_path}")
+            return
+
     # Save to JSON
-    out_path = "data/problem_list.json"
+    out_path.parent.mkdir(exist_ok=True)
     with open(out_path, "w", encoding="utf-8") as f:
         json.dump(free, f, indent=2, ensure_ascii=False)
 
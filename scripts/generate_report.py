@@ -1,28 +1,52 @@
 import argparse
+import json
 import sys
+import time
 from pathlib import Path
 
 sys.path.insert(0, ".")
 
-from src.utils import ReportGenerator
+from src.utils import ReportGenerator, ResultsAggregator
+
+
+def load_difficulties() -> dict[str, str]:
+    # Checkpoints of compare runs only store slugs
+    data_path = Path("data/problem_list.json")
+    if not data_path.exists():
+        return {}
+    with open(data_path) as f:
+        return {p["slug"]: p["difficulty"] for p in json.load(f)}
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Generate markdown report from JSON")
-    parser.add_argument("json_file", type=Path, help="Path to comparison JSON file")
+    parser.add_argument("json_files", type=Path, nargs="+",
+                        help="comparison JSON file; several files (or .jsonl checkpoints) are aggregated")
+    parser.add_argument("--resamples", type=int, default=2000, help="bootstrap resamples for the aggregate CIs")
+    parser.add_argument("--seed", type=int, default=0)
     args = parser.parse_args()
 
-    if not args.json_file.exists():
-        print(f"File not found: {args.json_file}")
+    missing = [p for p in args.json_files if not p.exists()]
+    if missing:
+        print(f"File not found: {', '.join(map(str, missing))}")
         sys.exit(1)
 
-    report = ReportGenerator.from_json(args.json_file)
-    md = report.generate()
+    if len(args.json_files) == 1 and args.json_files[0].suffix == ".json":
+        report = ReportGenerator.from_json(args.json_files[0])
+        md = report.generate()
+
+        out_path = args.json_files[0].with_suffix(".md")
+        out_path.write_text(md, encoding="utf-8")
+        print(f"Report saved to {out_path}")
+        return
 
-    out_path = args.json_file.with_suffix(".md")
-    out_path.write_text(md, encoding="utf-8")
-    print(f"Report saved to {out_path}")
+    aggregator = ResultsAggregator(difficulties=load_difficulties(), seed=args.seed, resamples=args.resamples)
+    for path in args.json_files:
+        aggregator.add(path)
+    out_path = args.json_files[0].parent / f"aggregate_{time.strftime('%Y%m%d_%H%M%S')}.md"
+    out_path.write_text(aggregator.to_markdown(), encoding="utf-8")
+    print(f"Aggregated {aggregator.files} files into {out_path}")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
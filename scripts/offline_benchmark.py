@@ -0,0 +1,286 @@
+"""Harness throughput for every agent, against local mock Ollama and LeetCode servers.
+
+Needs no tunnel and no LeetCode session. Each pipeline solves the same
+synthetic problems in turn; the report gives problems/hour and the mean
+time per problem spent in each traced stage (model calls, submit queue,
+rate limiter, submit POST, judge wait). "harness" is what's left of the
+pipeline's time outside those stages.
+
+Stages can overlap (best-of-n generates candidates at once, and submits
+while others are still generating), so each stage counts the union of
+its spans within a problem, not their sum. "ollama.queue" is the wait for
+a per-model slot and is taken out of the model call times.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from collections import defaultdict
+from typing import Callable
+
+sys.path.insert(0, ".")
+
+from src.agents import (
+    AsyncBaseline, AsyncBaselineFix, AsyncBestOfN, AsyncReviewer, AsyncReviewerFix,
+    Baseline, BaselineFix, Reviewer, ReviewerFix,
+)
+from src.clients import AsyncOllamaClient, LeetCodeClient, LeetCodeSubmitter, OllamaClient, SubmissionRateLimiter
+from src.evaluation import BoundedSubmitter, JobScheduler, Latency, MockLeetCode, MockOllama
+from src.evaluation.mock_servers import synthetic_problems
+from src.models.config import SolveConfig
+from src.models.problem import Problem
+from src.utils.tracing import Tracer, use_tracer
+
+logging.basicConfig(level=logging.WARNING, format="%(name)s | %(message)s")
+
+RESULTS_DIR = Path("results")
+
+WRITER_MODEL = "mock-writer"
+REVIEWER_MODEL = "mock-reviewer"
+
+STAGES = (
+    "ollama.queue", "ollama.generate_code", "ollama.generate", "local_judge",
+    "leetcode.queue", "leetcode.rate_limit", "leetcode.post", "leetcode.judge",
+)
+
+# Stages whose spans contain an ollama.queue span, which is counted on its own
+_QUEUED_STAGES = ("ollama.generate_code", "ollama.generate")
+
+Intervals = list[tuple[float, float]]
+
+
+def build_pipelines(names: list[str], ollama_url: str, args: argparse.Namespace,
+                    submitter: BoundedSubmitter) -> dict[str, Callable[[], tuple[object, bool]]]:
+    """{name: factory returning (pipeline, is_async)} for the requested pipeline names.
+
+    Each pipeline gets its own AsyncOllamaClient when it is built, because
+    every run happens in a fresh event loop.
+    """
+    def async_ollama() -> AsyncOllamaClient:
+        return AsyncOllamaClient(
+            host=ollama_url, max_concurrency=args.ollama_concurrency, group_models=args.group_models,
+        )
+
+    sync_ollama = OllamaClient(host=ollama_url)
+    cfg = SolveConfig(
+        writer_model=WRITER_MODEL,
+        reviewer_model=REVIEWER_MODEL,
+        max_iterations=args.max_iterations,
+        conversation=args.conversation,
+        structured_review=args.structured_review,
+    )
+
+    factories: dict[str, Callable[[], tuple[object, bool]]] = {
+        "baseline": lambda: (AsyncBaseline(async_ollama(), WRITER_MODEL, submitter), True),
+        "baseline+fix": lambda: (AsyncBaselineFix(async_ollama(), WRITER_MODEL, submitter), True),
+        "reviewer": lambda: (AsyncReviewer(async_ollama(), cfg, submitter), True),
+        "reviewer+fix": lambda: (AsyncReviewerFix(async_ollama(), cfg, submitter), True),
+        "best-of-n": lambda: (AsyncBestOfN(async_ollama(), WRITER_MODEL, submitter, n=args.best_of), True),
+        "sync-baseline": lambda: (Baseline(sync_ollama, WRITER_MODEL, submitter), False),
+        "sync-baseline+fix": lambda: (BaselineFix(sync_ollama, WRITER_MODEL, submitter), False),
+        "sync-reviewer": lambda: (Reviewer(sync_ollama, cfg, submitter), False),
+        "sync-reviewer+fix": lambda: (ReviewerFix(sync_ollama, cfg, submitter), False),
+    }
+    unknown = [n for n in names if n not in factories]
+    if unknown:
+        print(f"Unknown pipelines: {', '.join(unknown)} (choose from {', '.join(factories)})")
+        sys.exit(1)
+    return {name: factories[name] for name in names}
+
+
+def run_pipeline(pipeline: object, is_async: bool, problems: list[Problem], jobs: int) -> tuple[float, int, int]:
+    """Solve every problem; returns (wall seconds, accepted, errors)."""
+    async def solve(problem: Problem):
+        if is_async:
+            return await pipeline.run(problem)
+        return await asyncio.to_thread(pipeline.run, problem)
+
+    async def safe(problem: Problem):
+        try:
+            return await solve(problem)
+        except Exception as e:
+            print(f"  [{problem.slug}] error: {str(e).splitlines()[0][:80]}")
+            return None
+
+    t0 = time.monotonic()
+    results = JobScheduler(max_jobs=jobs).run_sync([lambda p=p: safe(p) for p in problems])
+    wall = time.monotonic() - t0
+    accepted = sum(1 for r in results if r is not None and r.submission is not None and r.submission.accepted)
+    errors = sum(1 for r in results if r is None)
+    return wall, accepted, errors
+
+
+def union(intervals: Intervals) -> Intervals:
+    merged: Intervals = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract(intervals: Intervals, holes: Intervals) -> Intervals:
+    """Both unions; the parts of `intervals` not covered by `holes`."""
+    result: Intervals = []
+    for start, end in intervals:
+        for hole_start, hole_end in holes:
+            if hole_end <= start or hole_start >= end:
+                continue
+            if hole_start > start:
+                result.append((start, hole_start))
+            start = max(start, hole_end)
+        if start < end:
+            result.append((start, end))
+    return result
+
+
+def covered(intervals: Intervals) -> float:
+    return sum(end - start for start, end in intervals)
+
+
+def stage_seconds(tracer: Tracer, problems: int) -> dict[str, float]:
+    """Mean seconds per problem in each stage, plus the "harness" time no stage covers."""
+    # A model call's own wait for a slot is not model time
+    queued: dict[int, Intervals] = defaultdict(list)
+    for s in tracer.spans:
+        if s.name == "ollama.queue" and s.parent_id is not None:
+            queued[s.parent_id].append((s.start, s.end))
+
+    # root span id -> stage -> intervals
+    by_root: dict[int, dict[str, Intervals]] = defaultdict(lambda: defaultdict(list))
+    for s in tracer.spans:
+        if s.name in _QUEUED_STAGES:
+            by_root[s.root_id][s.name] += subtract([(s.start, s.end)], union(queued[s.id]))
+        elif s.name in STAGES or (s.name == "pipeline" and s.parent_id is None):
+            by_root[s.root_id][s.name].append((s.start, s.end))
+
+    totals = dict.fromkeys((*STAGES, "harness"), 0.0)
+    for stages in by_root.values():
+        every_stage: Intervals = []
+        for name in STAGES:
+            intervals = union(stages[name])
+            totals[name] += covered(intervals)
+            every_stage += intervals
+        totals["harness"] += max(0.0, covered(union(stages["pipeline"])) - covered(union(every_stage)))
+    return {name: total / problems for name, total in totals.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the agents against mock Ollama/LeetCode servers")
+    parser.add_argument("--problems", type=int, default=12, help="number of synthetic problems")
+    parser.add_argument("--pipelines", nargs="+",
+                        default=["baseline", "baseline+fix", "reviewer", "reviewer+fix", "best-of-n"],
+                        help="pipelines to run (sync-* variants are the sequential agents)")
+    parser.add_argument("--jobs", type=int, default=8, help="problems solved at once")
+    parser.add_argument("--ollama-concurrency", type=int, default=2, help="in-flight generations per model")
+    parser.add_argument("--submit-concurrency", type=int, default=2, help="in-flight LeetCode submissions")
+    parser.add_argument("--group-models", action="store_true", help="batch generations by model")
+    parser.add_argument("--conversation", action="store_true", help="writer revisions as conversation turns")
+    parser.add_argument("--structured-review", action="store_true", help="JSON reviewer verdicts")
+    parser.add_argument("--max-iterations", type=int, default=3)
+    parser.add_argument("--best-of", type=int, default=4, help="candidates for the best-of-n pipeline")
+    parser.add_argument("--time-scale", type=float, default=0.1,
+                        help="multiply every simulated latency (1.0 = roughly real-world timings)")
+    parser.add_argument("--tokens-per-second", type=float, default=40.0, help="simulated generation speed at scale 1")
+    parser.add_argument("--first-token", type=Latency.parse, default=Latency(0.5, 0.3),
+                        help="time to first token, MEDIAN[:SPREAD] seconds")
+    parser.add_argument("--model-load", type=Latency.parse, default=Latency(5.0, 0.2),
+                        help="model load time, MEDIAN[:SPREAD] seconds")
+    parser.add_argument("--judge-latency", type=Latency.parse, default=Latency(8.0, 0.3),
+                        help="LeetCode judge time, MEDIAN[:SPREAD] seconds")
+    parser.add_argument("--max-loaded", type=int, default=1, help="models that fit in VRAM at once")
+    parser.add_argument("--accept-rate", type=float, default=0.7, help="chance the mock reviewer accepts")
+    parser.add_argument("--submit-rate", type=float, default=0.2,
+                        help="submissions/s the mock LeetCode allows before answering 429 (0 = unlimited)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--trace", action="store_true", help="also save each pipeline's Chrome trace")
+    args = parser.parse_args()
+
+    scale = args.time_scale
+    problems = synthetic_problems(args.problems)
+    ollama_server = MockOllama(
+        first_token=args.first_token.scaled(scale),
+        tokens_per_second=args.tokens_per_second / scale,
+        load=args.model_load.scaled(scale),
+        max_loaded=args.max_loaded,
+        accept_rate=args.accept_rate,
+        seed=args.seed,
+    )
+    leetcode_server = MockLeetCode(
+        problems,
+        judge_latency=args.judge_latency.scaled(scale),
+        post_latency=Latency(0.3 * scale, 0.3),
+        rate_limit=args.submit_rate / scale if args.submit_rate else None,
+        seed=args.seed,
+    )
+
+    results: dict[str, dict] = {}
+    with ollama_server, leetcode_server:
+        graphql_url = f"{leetcode_server.url}/graphql"
+        fetched = LeetCodeClient(graphql_url=graphql_url).fetch_problems([p.slug for p in problems])
+        problems = [fetched[p.slug] for p in problems]
+        submitter = BoundedSubmitter(
+            LeetCodeSubmitter(
+                session_cookie="mock",
+                graphql_url=graphql_url,
+                batch_poll=True,
+                # Scaled like the mock, so the limiter and poller see the same dynamics as live
+                rate_limiter=SubmissionRateLimiter(rate=0.2 / scale, max_rate=2.0 / scale, increase=0.01 / scale),
+                judge_latency=args.judge_latency.median * scale,
+            ),
+            max_concurrency=args.submit_concurrency,
+        )
+        pipelines = build_pipelines(args.pipelines, ollama_server.url, args, submitter)
+
+        print(f"{len(problems)} problems, {args.jobs} at once, time scale {scale}\n")
+        for name, build in pipelines.items():
+            pipeline, is_async = build()
+            tracer = Tracer()
+            with use_tracer(tracer):
+                wall, accepted, errors = run_pipeline(pipeline, is_async, problems, args.jobs)
+            # Problems/hour in simulated (unscaled) time
+            per_hour = len(problems) / (wall / scale) * 3600
+            stages = stage_seconds(tracer, len(problems))
+            results[name] = {
+                "wall_seconds": round(wall, 2),
+                "problems_per_hour": round(per_hour, 1),
+                "accepted": accepted,
+                "errors": errors,
+                "stage_seconds": {k: round(v / scale, 2) for k, v in stages.items()},
+            }
+            print(f"  {name:18s} {per_hour:8.1f} problems/h  ({accepted}/{len(problems)} accepted, "
+                  f"{errors} errors, {wall:.1f}s wall)")
+            if args.trace:
+                RESULTS_DIR.mkdir(exist_ok=True)
+                tracer.write_chrome_trace(RESULTS_DIR / f"offline_{name.replace('+', '_')}.trace.json")
+
+        print(f"\nMock Ollama: {ollama_server.requests} requests, {ollama_server.loads} model loads")
+        print(f"Mock LeetCode: {leetcode_server.submissions_received} submissions, "
+              f"{leetcode_server.throttled} throttled\n")
+
+    # Mean simulated seconds per problem, per stage
+    names = list(results)
+    print("| Stage | " + " | ".join(names) + " |")
+    print("|---|" + "---|" * len(names))
+    for stage in (*STAGES, "harness"):
+        row = " | ".join(f"{results[n]['stage_seconds'][stage]:.1f}s" for n in names)
+        print(f"| {stage} | {row} |")
+    print("| **problems/hour** | " + " | ".join(f"{results[n]['problems_per_hour']:.0f}" for n in names) + " |")
+
+    RESULTS_DIR.mkdir(exist_ok=True)
+    out_path = RESULTS_DIR / f"offline_benchmark_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump({"settings": vars(args) | {"first_token": str(args.first_token),
+                                              "model_load": str(args.model_load),
+                                              "judge_latency": str(args.judge_latency)},
+                   "pipelines": results}, f, indent=2)
+    print(f"\nSaved to {out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Prompt size per template, with the raw HTML description vs. the Markdown one.
+
+Token counts are estimated at ~4 characters per token, which is close
+enough for tracking how prompt-eval cost moves between versions.
+"""
+
+import argparse
+import json
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, ".")
+
+import config
+from src import prompts
+from src.clients import LeetCodeClient, ProblemStore
+from src.models.problem import Problem
+
+CHARS_PER_TOKEN = 4
+
+SAMPLE_CODE = "class Solution:\n    def solve(self, nums: list[int]) -> int:\n        return 0"
+SAMPLE_FEEDBACK = "REVISE\nThe loop misses the last element."
+SAMPLE_ERROR = "IndexError: list index out of range"
+
+TEMPLATES = {
+    "writer": lambda p: prompts.WRITER_SYSTEM + prompts.writer_prompt(p),
+    "reviewer": lambda p: prompts.REVIEWER_SYSTEM + prompts.reviewer_prompt(p, SAMPLE_CODE),
+    "writer revision": lambda p: prompts.WRITER_SYSTEM + prompts.writer_revision_prompt(p, SAMPLE_CODE, SAMPLE_FEEDBACK),
+    "writer error": lambda p: prompts.WRITER_SYSTEM + prompts.writer_error_prompt(p, SAMPLE_CODE, "Runtime Error", SAMPLE_ERROR),
+    "revision turn": lambda p: prompts.writer_revision_turn(SAMPLE_FEEDBACK),
+    "error turn": lambda p: prompts.writer_error_turn("Runtime Error", SAMPLE_ERROR),
+}
+
+
+def as_html(problem: Problem) -> Problem:
+    """The problem as prompts used to see it, with the HTML description inlined."""
+    return problem.model_copy(update={"description_md": problem.description})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Report prompt sizes per template")
+    parser.add_argument("slugs", nargs="*", help="problems to measure (default: a random sample)")
+    parser.add_argument("--sample", type=int, default=20, help="number of random problems if no slugs are given")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    slugs = args.slugs
+    if not slugs:
+        data_path = Path("data/problem_list.json")
+        if not data_path.exists():
+            print("data/problem_list.json not found — run scripts/fetch_problem_list.py first")
+            sys.exit(1)
+        with open(data_path) as f:
+            free = [p["slug"] for p in json.load(f) if not p["paid_only"]]
+        random.seed(args.seed)
+        slugs = random.sample(free, min(args.sample, len(free)))
+
+    store = ProblemStore(config.PROBLEM_STORE_PATH, ttl_seconds=config.PROBLEM_STORE_TTL_DAYS * 86400 or None)
+    leetcode = LeetCodeClient(graphql_url=config.LEETCODE_GRAPHQL_URL, store=store)
+    problems = list(leetcode.fetch_problems(slugs).values())
+    store.close()
+    if not problems:
+        print("No problems could be loaded")
+        sys.exit(1)
+
+    print(f"Average over {len(problems)} problems (~{CHARS_PER_TOKEN} chars/token)\n")
+    print("| Template | Chars (HTML) | Chars (Markdown) | Tokens (HTML) | Tokens (Markdown) | Saved |")
+    print("|---|---|---|---|---|---|")
+    for name, render in TEMPLATES.items():
+        html_chars = sum(len(render(as_html(p))) for p in problems) / len(problems)
+        md_chars = sum(len(render(p)) for p in problems) / len(problems)
+        saved = 1 - md_chars / html_chars if html_chars else 0.0
+        print(f"| {name} | {html_chars:.0f} | {md_chars:.0f} | {html_chars / CHARS_PER_TOKEN:.0f} "
+              f"| {md_chars / CHARS_PER_TOKEN:.0f} | {saved:.0%} |")
+
+
+if __name__ == "__main__":
+    main()
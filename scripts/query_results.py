@@ -0,0 +1,129 @@
+"""Query the results database written by benchmark.py and compare_methods.py.
+
+    python scripts/query_results.py runs
+    python scripts/query_results.py import results/*.json
+    python scripts/query_results.py rates --model qwen2.5-coder:14b --since 30
+    python scripts/query_results.py rows --slug two-sum
+    python scripts/query_results.py aggregate --difficulty Hard
+    python scripts/query_results.py report compare_20250101_120000
+    python scripts/query_results.py sql "SELECT pipeline, AVG(seconds) FROM results GROUP BY pipeline"
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, ".")
+
+import config
+from src.evaluation import ResultsStore
+from src.utils import ReportGenerator, ResultsAggregator
+
+
+def print_table(columns: list[str], rows: list) -> None:
+    print("| " + " | ".join(columns) + " |")
+    print("|" + "---|" * len(columns))
+    for row in rows:
+        print("| " + " | ".join("—" if v is None else f"{v:.1f}" if isinstance(v, float) else str(v)
+                                for v in row) + " |")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Query stored benchmark/compare results")
+    parser.add_argument("--db", type=Path, default=Path(config.RESULTS_DB_PATH))
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("runs", help="list stored runs")
+    imp = commands.add_parser("import", help="add existing results JSON files to the database")
+    imp.add_argument("files", type=Path, nargs="+")
+    report = commands.add_parser("report", help="Markdown report for one run")
+    report.add_argument("run", help="run name (results file stem)")
+    sql = commands.add_parser("sql", help="read-only SQL over the runs and results tables")
+    sql.add_argument("query")
+
+    for name, help_text in [("rates", "accepted/submitted per model, pipeline and difficulty"),
+                            ("rows", "matching results, one per line"),
+                            ("aggregate", "pass rates with bootstrap CIs and pass@k")]:
+        sub = commands.add_parser(name, help=help_text)
+        sub.add_argument("--model")
+        sub.add_argument("--pipeline")
+        sub.add_argument("--slug")
+        sub.add_argument("--difficulty", choices=["Easy", "Medium", "Hard"])
+        sub.add_argument("--run", help="run name (results file stem)")
+        sub.add_argument("--since", type=float, metavar="DAYS", help="only runs from the last DAYS days")
+        sub.add_argument("--all-runs", action="store_true",
+                         help="also count runs that a re-evaluated run replaces")
+    args = parser.parse_args()
+
+    store = ResultsStore(args.db)
+
+    if args.command == "runs":
+        print_table(
+            ["Run", "Kind", "Date", "Results", "Models", "Time (min)", "Superseded by"],
+            [(r["name"], r["kind"], time.strftime("%Y-%m-%d %H:%M", time.localtime(r["created_at"])), r["results"],
+              r["models"], r["total_time_seconds"] / 60 if r["total_time_seconds"] else None, r["superseded_by"])
+             for r in store.runs()],
+        )
+        return
+
+    if args.command == "import":
+        for path in args.files:
+            try:
+                store.import_json(path)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"  skip {path}: {e}")
+                continue
+            print(f"  {path.stem}")
+        return
+
+    if args.command == "report":
+        try:
+            print(ReportGenerator.from_store(store, args.run).generate())
+        except KeyError:
+            print(f"No run named {args.run}")
+            sys.exit(1)
+        return
+
+    if args.command == "sql":
+        try:
+            columns, rows = store.execute(args.query)
+        except Exception as e:
+            print(f"Query failed: {e}")
+            sys.exit(1)
+        print_table(columns, rows)
+        return
+
+    filters = {
+        "run": args.run,
+        "since": time.time() - args.since * 86400 if args.since is not None else None,
+        "model": args.model,
+        "pipeline": args.pipeline,
+        "slug": args.slug,
+        "difficulty": args.difficulty,
+        "include_superseded": args.all_runs,
+    }
+    t0 = time.perf_counter()
+    if args.command == "rates":
+        rates = store.pass_rates(**filters)
+        print_table(
+            ["Model", "Pipeline", "Difficulty", "Accepted", "Runs"],
+            [(r["model"], r["pipeline"], r["difficulty"], f"{r['accepted']}/{r['submitted']}", r["runs"])
+             for r in rates],
+        )
+    elif args.command == "rows":
+        rows = store.query(**filters)
+        print_table(
+            ["Run", "Problem", "Difficulty", "Model", "Pipeline", "Status", "Time (s)"],
+            [(r["run"], r["slug"], r["difficulty"], r["model"], r["pipeline"], r["status"], r["seconds"])
+             for r in rows],
+        )
+    else:
+        aggregator = ResultsAggregator()
+        aggregator.add_rows(store.iter_outcomes(**filters))
+        print(aggregator.to_markdown())
+    print(f"\n({time.perf_counter() - t0:.3f}s)")
+
+
+if __name__ == "__main__":
+    main()
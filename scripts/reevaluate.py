@@ -0,0 +1,182 @@
+"""Replay stored model outputs through the current parsers, without running any model.
+
+Works on the JSON written by benchmark.py or compare_methods.py:
+
+- Code is extracted again from every stored raw writer response. If it
+  differs from the code that was judged (ignoring formatting, comments
+  and docstrings), it is submitted again. Unchanged code keeps its verdict.
+- Stored reviewer outputs are parsed again. A run whose verdicts change
+  would have taken a different path; it is flagged, since only a rerun
+  with the models can tell how it would have ended.
+
+Limitation: the writer stream is stopped at the closing fence of its first
+code block, so for those runs the stored output ends there. A parser change
+that would pick a later block, or read text after the block, can't be
+replayed from them; they are counted as partially replayable.
+
+Writes <results>.reeval.json and a Markdown report next to it, and adds
+the re-evaluated run to the results database.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, ".")
+
+import config
+from src.clients import LeetCodeClient, LeetCodeSubmitter, ProblemStore, SubmissionCache
+from src.clients.submission_cache import normalized_code_hash
+from src.evaluation import BoundedSubmitter, JobScheduler, ResultsStore
+from src.models import SubmissionResult
+from src.utils import ReportGenerator, extract_code, parse_structured_review
+
+
+def code_changed(old: Optional[str], new: Optional[str]) -> bool:
+    if old is None or new is None:
+        return old != new
+    return normalized_code_hash(old) != normalized_code_hash(new)
+
+
+def reparse_reviews(raw_reviews: list[str], old_verdicts: list[bool]) -> Optional[int]:
+    """1-based number of the first review whose verdict changes, or None."""
+    for i, (raw, old) in enumerate(zip(raw_reviews, old_verdicts)):
+        # Falls back to the plain ACCEPT/REVISE parser for free-text reviews
+        accepted, _ = parse_structured_review(raw)
+        if accepted != old:
+            return i + 1
+    return None
+
+
+def benchmark_to_report(payload: dict) -> dict:
+    """benchmark.py entries in the shape ReportGenerator reads (one column for the model)."""
+    model = payload.get("model", "?")
+    entries = []
+    for e in payload["entries"]:
+        solve, sub = e["solve"], e.get("submission")
+        entries.append({
+            "slug": solve["slug"],
+            "title": solve["title"],
+            "difficulty": solve["difficulty"],
+            model: {
+                "time": solve["generation_seconds"],
+                "accepted": sub["accepted"] if sub else None,
+                "status": sub["status"] if sub else ("no code" if not solve["extracted_code"] else "not submitted"),
+            },
+        })
+    return {"writer_model": model, "seed": payload.get("seed"), "pipelines": [model], "entries": entries,
+            "total_time_seconds": payload.get("total_time_seconds", 0)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Re-evaluate stored results with the current parsers")
+    parser.add_argument("results", type=Path, help="benchmark_*.json or compare_*.json")
+    parser.add_argument("--no-submit", action="store_true", help="only re-parse; don't resubmit changed code")
+    parser.add_argument("--submit-concurrency", type=int, default=2, help="in-flight leetcode submissions")
+    args = parser.parse_args()
+
+    if not args.results.exists():
+        print(f"File not found: {args.results}")
+        sys.exit(1)
+    with open(args.results, encoding="utf-8") as f:
+        payload = json.load(f)
+    is_compare = "pipelines" in payload
+
+    # (slug, record to update, new code) for every stored run whose extracted code changed
+    changed: list[tuple[str, dict, Optional[str]]] = []
+    diverged: list[tuple[str, str, int]] = []
+    replayed = missing_raw = partial = 0
+
+    for entry in payload["entries"]:
+        if is_compare:
+            runs = [(name, entry[name]) for name in payload["pipelines"] if name in entry]
+        else:
+            runs = [(payload.get("model", "?"), entry["solve"])]
+
+        for name, record in runs:
+            raw = record.get("raw_response")
+            if raw is None or record.get("error"):
+                # Crashed runs, and results from before raw outputs were stored
+                missing_raw += 1
+                continue
+            replayed += 1
+            if record.get("raw_stopped_early" if is_compare else "stopped_early"):
+                partial += 1
+
+            code_key = "code" if is_compare else "extracted_code"
+            new_code = extract_code(raw)
+            if code_changed(record.get(code_key), new_code):
+                changed.append((entry.get("slug") or record["slug"], entry if not is_compare else record, new_code))
+                record[code_key] = new_code
+
+            review = reparse_reviews(record.get("raw_reviews", []), record.get("review_verdicts", []))
+            if review is not None:
+                diverged.append((entry.get("slug") or record["slug"], name, review))
+                record["diverged_at_review"] = review
+
+    print(f"Replayed {replayed} runs ({missing_raw} without stored output)")
+    print(f"  {partial} partially replayable (output stopped at the first code fence)")
+    print(f"  {len(changed)} with different extracted code")
+    print(f"  {len(diverged)} with a changed review verdict (need a model rerun)")
+    for slug, name, review in diverged:
+        print(f"    {slug} [{name}] from review #{review}")
+
+    results: list[Optional[SubmissionResult]] = [None] * len(changed)
+    to_submit = [i for i, (_, _, code) in enumerate(changed) if code]
+    if to_submit and not args.no_submit:
+        store = ProblemStore(config.PROBLEM_STORE_PATH, ttl_seconds=config.PROBLEM_STORE_TTL_DAYS * 86400 or None)
+        problems = LeetCodeClient(graphql_url=config.LEETCODE_GRAPHQL_URL, store=store).fetch_problems(
+            [changed[i][0] for i in to_submit],
+        )
+        # Code judged before (by any earlier run) comes straight from the submission cache
+        submitter = BoundedSubmitter(
+            LeetCodeSubmitter(
+                session_cookie=config.LEETCODE_SESSION,
+                graphql_url=config.LEETCODE_GRAPHQL_URL,
+                batch_poll=True,
+                cache=SubmissionCache(config.SUBMISSION_CACHE_PATH),
+            ),
+            max_concurrency=args.submit_concurrency,
+        )
+
+        async def submit(i: int) -> None:
+            slug, _, code = changed[i]
+            if slug not in problems:
+                print(f"  [{slug}] skip (fetch failed)")
+                return
+            try:
+                results[i] = await asyncio.to_thread(submitter.submit, slug, problems[slug].id, code)
+            except Exception as e:
+                print(f"  [{slug}] submit error: {e}")
+                return
+            print(f"  [{slug}] {results[i].status}")
+
+        print(f"\nResubmitting {len(to_submit)} changed solutions...")
+        JobScheduler(max_jobs=args.submit_concurrency * 2).run_sync([lambda i=i: submit(i) for i in to_submit])
+
+    for (slug, record, code), submission in zip(changed, results):
+        if is_compare:
+            record["accepted"] = submission.accepted if submission else None
+            record["status"] = (submission.status if submission
+                                else "no code" if not code else "changed, not resubmitted")
+        else:
+            record["submission"] = submission.model_dump() if submission else None
+
+    payload["reevaluated_from"] = str(args.results)
+    out_path = args.results.with_suffix(".reeval.json")
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, ensure_ascii=False)
+
+    ResultsStore(config.RESULTS_DB_PATH).save_run(out_path.stem, payload)
+
+    md_path = out_path.with_suffix(".md")
+    report = ReportGenerator(payload if is_compare else benchmark_to_report(payload))
+    md_path.write_text(report.generate(), encoding="utf-8")
+    print(f"\nSaved to {out_path}, report: {md_path}")
+
+
+if __name__ == "__main__":
+    main()
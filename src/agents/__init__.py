@@ -1,11 +1,16 @@
-from src.agents.pipeline import AgentPipeline, PipelineResult
+from src.agents.pipeline import AgentPipeline, AsyncAgentPipeline, PipelineResult
 from src.agents.baseline import Baseline
 from src.agents.baseline_fix import BaselineFix
 from src.agents.reviewer import Reviewer
 from src.agents.reviewer_fix import ReviewerFix
+from src.agents.async_agents import AsyncBaseline, AsyncBaselineFix, AsyncReviewer, AsyncReviewerFix
+from src.agents.best_of_n import AsyncBestOfN
 
 __all__ = [
-    "AgentPipeline", "PipelineResult",
+    "AgentPipeline", "AsyncAgentPipeline", "PipelineResult",
     "Baseline", "BaselineFix",
     "Reviewer", "ReviewerFix",
+    "AsyncBaseline", "AsyncBaselineFix",
+    "AsyncReviewer", "AsyncReviewerFix",
+    "AsyncBestOfN",
 ]
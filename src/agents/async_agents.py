@@ -0,0 +1,115 @@
+"""Async versions of the four pipelines, for use with AsyncOllamaClient.
+
+Names match the sync pipelines so results stay comparable in reports.
+"""
+
+import asyncio
+from typing import Any, Optional
+
+from src.agents.async_solve_loop import async_solve_with_review
+from src.agents.pipeline import PipelineResult, instrument_run
+from src.agents.steps import FixError, LocalCheck, Step, Write, async_run_steps, fix_loop
+from src.clients.async_ollama_client import AsyncOllamaClient
+from src.clients.leetcode_submitter import LeetCodeSubmitter
+from src.evaluation.local_judge import LocalJudge, local_failure
+from src.models.config import SolveConfig
+from src.models.problem import Problem
+from src.prompts import WRITER_SYSTEM, writer_prompt, writer_error_prompt
+
+
+class AsyncBaseline:
+    name = "baseline"
+
+    def __init__(self, ollama: AsyncOllamaClient, model: str, submitter: Optional[LeetCodeSubmitter] = None) -> None:
+        self.ollama = ollama
+        self.model = model
+        self.submitter = submitter
+
+    @instrument_run
+    async def run(self, problem: Problem) -> PipelineResult:
+        gen = await self.ollama.generate_code(
+            model=self.model, prompt=writer_prompt(problem), system=WRITER_SYSTEM,
+        )
+        code = gen.code
+
+        submission = None
+        if code and self.submitter:
+            submission = await asyncio.to_thread(self.submitter.submit, problem.slug, problem.id, code)
+
+        return PipelineResult(code=code, raw=gen, submission=submission)
+
+
+class AsyncBaselineFix:
+    name = "baseline+fix"
+
+    def __init__(self, ollama: AsyncOllamaClient, model: str, submitter: LeetCodeSubmitter, max_fixes: int = 3,
+                 judge: Optional[LocalJudge] = None) -> None:
+        self.ollama = ollama
+        self.model = model
+        self.submitter = submitter
+        self.max_fixes = max_fixes
+        self.judge = judge
+
+    @instrument_run
+    async def run(self, problem: Problem) -> PipelineResult:
+        async def execute(step: Step) -> Any:
+            if isinstance(step, Write):
+                return await self.ollama.generate_code(
+                    model=self.model, prompt=writer_prompt(problem), system=WRITER_SYSTEM,
+                )
+            if isinstance(step, FixError):
+                return await self.ollama.generate_code(
+                    model=self.model,
+                    prompt=writer_error_prompt(problem, step.code, step.error_type, step.error_msg),
+                    system=WRITER_SYSTEM,
+                )
+            if isinstance(step, LocalCheck):
+                return await asyncio.to_thread(local_failure, self.judge, problem, step.code)
+            try:
+                return await asyncio.to_thread(
+                    self.submitter.submit, problem.slug, problem.id, step.code, priority=step.priority,
+                )
+            except Exception as e:
+                return e
+
+        code, raw, submission = await async_run_steps(fix_loop(self.max_fixes), execute)
+        return PipelineResult(code=code, raw=raw, submission=submission)
+
+
+class AsyncReviewer:
+    name = "reviewer"
+
+    def __init__(self, ollama: AsyncOllamaClient, config: SolveConfig, submitter: Optional[LeetCodeSubmitter] = None) -> None:
+        self.ollama = ollama
+        self.config = config
+        self.submitter = submitter
+
+    @instrument_run
+    async def run(self, problem: Problem) -> PipelineResult:
+        code, raw, reviews, _ = await async_solve_with_review(
+            problem=problem, ollama=self.ollama, config=self.config, submitter=None,
+        )
+
+        submission = None
+        if code and self.submitter:
+            submission = await asyncio.to_thread(self.submitter.submit, problem.slug, problem.id, code)
+
+        return PipelineResult(code=code, raw=raw, reviews=reviews, submission=submission)
+
+
+class AsyncReviewerFix:
+    name = "reviewer+fix"
+
+    def __init__(self, ollama: AsyncOllamaClient, config: SolveConfig, submitter: LeetCodeSubmitter,
+                 judge: Optional[LocalJudge] = None) -> None:
+        self.ollama = ollama
+        self.config = config
+        self.submitter = submitter
+        self.judge = judge
+
+    @instrument_run
+    async def run(self, problem: Problem) -> PipelineResult:
+        code, raw, reviews, submission = await async_solve_with_review(
+            problem=problem, ollama=self.ollama, config=self.config, submitter=self.submitter, judge=self.judge,
+        )
+        return PipelineResult(code=code, raw=raw, reviews=reviews, submission=submission)
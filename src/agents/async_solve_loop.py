@@ -0,0 +1,51 @@
+import asyncio
+from typing import Any, Optional
+
+from src.agents.steps import (
+    FixError, LocalCheck, LoopResult, Review, Revise, Step, Write, async_run_steps, review_loop,
+)
+from src.agents.writer_session import AsyncWriterSession
+from src.clients.async_ollama_client import AsyncOllamaClient
+from src.clients.leetcode_submitter import LeetCodeSubmitter
+from src.evaluation.local_judge import LocalJudge, local_failure
+from src.models.config import SolveConfig
+from src.models.problem import Problem
+from src.prompts import reviewer_prompt, reviewer_request
+
+
+async def async_solve_with_review(
+    problem: Problem,
+    ollama: AsyncOllamaClient,
+    config: SolveConfig,
+    submitter: Optional[LeetCodeSubmitter] = None,
+    judge: Optional[LocalJudge] = None,
+) -> LoopResult:
+    """Same loop as solve_with_review (steps.review_loop), but awaits the model calls.
+
+    The submitter and local judge are blocking, so they run in a worker thread.
+    """
+    writer = AsyncWriterSession(ollama, problem, config)
+
+    async def execute(step: Step) -> Any:
+        if isinstance(step, Write):
+            return await writer.start()
+        if isinstance(step, Revise):
+            return await writer.revise(step.code, step.feedback)
+        if isinstance(step, FixError):
+            return await writer.fix_error(step.code, step.error_type, step.error_msg)
+        if isinstance(step, Review):
+            return await ollama.generate(
+                model=config.reviewer_model,
+                prompt=reviewer_prompt(problem, step.code),
+                **reviewer_request(config),
+            )
+        if isinstance(step, LocalCheck):
+            return await asyncio.to_thread(local_failure, judge, problem, step.code)
+        try:
+            return await asyncio.to_thread(
+                submitter.submit, problem.slug, problem.id, step.code, priority=step.priority,
+            )
+        except Exception as e:
+            return e
+
+    return await async_run_steps(review_loop(config, submit=submitter is not None), execute)
@@ -1,11 +1,10 @@
 from typing import Optional
 
-from src.agents.pipeline import PipelineResult
+from src.agents.pipeline import PipelineResult, instrument_run
 from src.clients.ollama_client import OllamaClient
 from src.clients.leetcode_submitter import LeetCodeSubmitter
 from src.models.problem import Problem
 from src.prompts import WRITER_SYSTEM, writer_prompt
-from src.utils.parsers import extract_code
 
 
 class Baseline:
@@ -16,14 +15,15 @@ class Baseline:
         self.model = model
         self.submitter = submitter
 
+    @instrument_run
     def run(self, problem: Problem) -> PipelineResult:
-        raw = self.ollama.generate(
+        gen = self.ollama.generate_code(
             model=self.model, prompt=writer_prompt(problem), system=WRITER_SYSTEM,
         )
-        code = extract_code(raw)
+        code = gen.code
 
         submission = None
         if code and self.submitter:
             submission = self.submitter.submit(problem.slug, problem.id, code)
 
-        return PipelineResult(code=code, submission=submission)
\ No newline at end of file
+        return PipelineResult(code=code, raw=gen, submission=submission)
\ No newline at end of file
@@ -1,55 +1,42 @@
-import logging
+from typing import Any, Optional
 
-from src.agents.pipeline import PipelineResult
+from src.agents.pipeline import PipelineResult, instrument_run
+from src.agents.steps import FixError, LocalCheck, Step, Write, fix_loop, run_steps
 from src.clients.ollama_client import OllamaClient
 from src.clients.leetcode_submitter import LeetCodeSubmitter
+from src.evaluation.local_judge import LocalJudge, local_failure
 from src.models.problem import Problem
 from src.prompts import WRITER_SYSTEM, writer_prompt, writer_error_prompt
-from src.utils.parsers import extract_code
-
-log = logging.getLogger(__name__)
 
 
 class BaselineFix:
     name = "baseline+fix"
 
-    def __init__(self, ollama: OllamaClient, model: str, submitter: LeetCodeSubmitter, max_fixes: int = 3) -> None:
+    def __init__(self, ollama: OllamaClient, model: str, submitter: LeetCodeSubmitter, max_fixes: int = 3,
+                 judge: Optional[LocalJudge] = None) -> None:
         self.ollama = ollama
         self.model = model
         self.submitter = submitter
         self.max_fixes = max_fixes
+        self.judge = judge
 
+    @instrument_run
     def run(self, problem: Problem) -> PipelineResult:
-        raw = self.ollama.generate(
-            model=self.model, prompt=writer_prompt(problem), system=WRITER_SYSTEM,
-        )
-        code = extract_code(raw)
-        if not code:
-            return PipelineResult(code=None)
-
-        last_sub = None
-        for _ in range(self.max_fixes):
+        def execute(step: Step) -> Any:
+            if isinstance(step, Write):
+                return self.ollama.generate_code(model=self.model, prompt=writer_prompt(problem), system=WRITER_SYSTEM)
+            if isinstance(step, FixError):
+                return self.ollama.generate_code(
+                    model=self.model,
+                    prompt=writer_error_prompt(problem, step.code, step.error_type, step.error_msg),
+                    system=WRITER_SYSTEM,
+                )
+            if isinstance(step, LocalCheck):
+                return local_failure(self.judge, problem, step.code)
             try:
-                last_sub = self.submitter.submit(problem.slug, problem.id, code)
+                return self.submitter.submit(problem.slug, problem.id, step.code, priority=step.priority)
             except Exception as e:
-                log.error("Submit failed: %s", e)
-                return PipelineResult(code=code, submission=last_sub)
-
-            if last_sub.status not in ("Runtime Error", "Compile Error"):
-                return PipelineResult(code=code, submission=last_sub)
-
-            error_msg = last_sub.compile_error or last_sub.runtime_error or ""
-            log.info("Submit error: %s — retrying", last_sub.status)
-
-            raw = self.ollama.generate(
-                model=self.model,
-                prompt=writer_error_prompt(problem, code, last_sub.status, error_msg),
-                system=WRITER_SYSTEM,
-            )
-            new_code = extract_code(raw)
-            if not new_code:
-                log.warning("No code block after error fix attempt")
-                return PipelineResult(code=code, submission=last_sub)
-            code = new_code
+                return e
 
-        return PipelineResult(code=code, submission=last_sub)
\ No newline at end of file
+        code, raw, submission = run_steps(fix_loop(self.max_fixes), execute)
+        return PipelineResult(code=code, raw=raw, submission=submission)
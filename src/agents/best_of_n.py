@@ -0,0 +1,141 @@
+import asyncio
+import heapq
+import logging
+from typing import Optional
+
+from src.agents.pipeline import PipelineResult, instrument_run
+from src.clients.async_ollama_client import AsyncOllamaClient
+from src.clients.leetcode_submitter import LeetCodeSubmitter
+from src.clients.submission_cache import normalized_code_hash
+from src.evaluation.local_judge import LocalJudge
+from src.evaluation.static_check import check_solution
+from src.models.generation import CodeGeneration
+from src.models.problem import Problem
+from src.models.result import SubmissionResult
+from src.prompts import WRITER_SYSTEM, writer_prompt
+from src.utils.tracing import span
+
+log = logging.getLogger(__name__)
+
+
+class AsyncBestOfN:
+    """Samples `n` writer candidates at once and submits the best until one is accepted.
+
+    Candidates are screened as they arrive. Code that fails the static
+    checks (syntax, stub classes and method signatures) and duplicates of
+    an earlier candidate are dropped. The rest are ranked by the local
+    judge if one is given: examples passed first, then unjudged, then
+    failed. Whenever the submitter is free, the best candidate so far
+    is submitted. Once one is accepted, generations still running are
+    cancelled.
+    """
+
+    name = "best-of-n"
+
+    def __init__(self, ollama: AsyncOllamaClient, model: str, submitter: Optional[LeetCodeSubmitter] = None,
+                 n: int = 4, temperature: float = 0.8, max_submissions: int = 3,
+                 judge: Optional[LocalJudge] = None) -> None:
+        self.ollama = ollama
+        self.model = model
+        self.submitter = submitter
+        self.n = n
+        self.temperature = temperature
+        self.max_submissions = max_submissions
+        self.judge = judge
+
+    @instrument_run
+    async def run(self, problem: Problem) -> PipelineResult:
+        pending = {asyncio.create_task(self._sample(problem, i)) for i in range(self.n)}
+        ranked: list[tuple[tuple, int, str, CodeGeneration]] = []
+        seen: set[str] = set()
+
+        if not self.submitter:
+            # Nothing to submit: rank every candidate and return the best one
+            await asyncio.wait(pending)
+            for task in pending:
+                await self._add_candidate(problem, task, ranked, seen)
+            if not ranked:
+                return PipelineResult(code=None)
+            _, _, code, gen = ranked[0]
+            return PipelineResult(code=code, raw=gen)
+
+        code: Optional[str] = None
+        raw: Optional[CodeGeneration] = None
+        last_sub: Optional[SubmissionResult] = None
+        submitted = 0
+        try:
+            while (pending or ranked) and submitted < self.max_submissions:
+                # Take in every candidate that has finished, waiting only if there's nothing to submit
+                done = {t for t in pending if t.done()}
+                if not done and not ranked:
+                    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    pending.discard(task)
+                    await self._add_candidate(problem, task, ranked, seen)
+                if not ranked:
+                    continue
+
+                rank, i, candidate, gen = heapq.heappop(ranked)
+                log.info("Submitting candidate %d (rank %s, %d/%d)", i, rank, submitted + 1, self.max_submissions)
+                try:
+                    result = await asyncio.to_thread(
+                        self.submitter.submit, problem.slug, problem.id, candidate, priority=-submitted,
+                    )
+                except Exception as e:
+                    log.error("Submit failed: %s", e)
+                    if last_sub is None:
+                        # Nothing judged yet: report the candidate we tried
+                        code, raw = candidate, gen
+                    break
+                code, raw, last_sub = candidate, gen, result
+                submitted += 1
+                if last_sub.accepted:
+                    break
+        finally:
+            running = [t for t in pending if not t.done()]
+            if running:
+                log.info("Cancelling %d outstanding candidates", len(running))
+                for task in running:
+                    task.cancel()
+                await asyncio.gather(*running, return_exceptions=True)
+
+        return PipelineResult(code=code, raw=raw, submission=last_sub)
+
+    async def _sample(self, problem: Problem, i: int) -> CodeGeneration:
+        with span("candidate", candidate=i):
+            gen = await self.ollama.generate_code(
+                model=self.model,
+                prompt=writer_prompt(problem),
+                system=WRITER_SYSTEM,
+                temperature=self.temperature,
+                # Distinct seeds give distinct samples (and distinct cache entries)
+                options={"seed": i},
+            )
+        return gen
+
+    async def _add_candidate(self, problem: Problem, task: asyncio.Task, ranked: list, seen: set[str]) -> None:
+        if task.exception() is not None:
+            log.warning("Candidate generation failed: %s", task.exception())
+            return
+        gen = task.result()
+        code = gen.code
+        if not code:
+            return
+        errors = check_solution(problem, code)
+        if errors:
+            log.info("Dropping candidate: %s", errors[0])
+            return
+
+        code_hash = normalized_code_hash(code)
+        if code_hash in seen:
+            return
+        seen.add(code_hash)
+
+        rank: tuple = (1, 0.0)
+        if self.judge:
+            local = await asyncio.to_thread(self.judge.judge, problem, code)
+            if local.status == "Accepted":
+                rank = (0, 0.0)
+            elif local.status != "Skipped":
+                rank = (2, -(local.passed / local.total) if local.total else 0.0)
+        heapq.heappush(ranked, (rank, len(seen), code, gen))
@@ -1,20 +1,63 @@
 from __future__ import annotations
 
+import functools
+import inspect
 from dataclasses import dataclass, field
-from typing import Optional, Protocol
+from typing import Callable, Optional, Protocol
 
+from src.models.generation import CodeGeneration, GenerationStats
 from src.models.problem import Problem
 from src.models.result import ReviewerFeedback, SubmissionResult
+from src.utils.telemetry import collect_generations
+from src.utils.tracing import span
 
 
 @dataclass
 class PipelineResult:
     code: Optional[str]
+    # Writer output the final code was extracted from
+    raw: Optional[CodeGeneration] = None
     reviews: list[ReviewerFeedback] = field(default_factory=list)
     submission: Optional[SubmissionResult] = None
+    generations: list[GenerationStats] = field(default_factory=list)
+
+    @property
+    def raw_response(self) -> Optional[str]:
+        return self.raw.text if self.raw else None
+
+    @property
+    def raw_stopped_early(self) -> bool:
+        """The writer output was cut at the closing fence of its first code block."""
+        return self.raw is not None and self.raw.stopped_early
 
 
 class AgentPipeline(Protocol):
     name: str
 
-    def run(self, problem: Problem) -> PipelineResult: ...
\ No newline at end of file
+    def run(self, problem: Problem) -> PipelineResult: ...
+
+
+class AsyncAgentPipeline(Protocol):
+    name: str
+
+    async def run(self, problem: Problem) -> PipelineResult: ...
+
+
+def instrument_run(run: Callable) -> Callable:
+    """Decorator for run(): traces the run and attaches the stats of every model call made during it."""
+    if inspect.iscoroutinefunction(run):
+        @functools.wraps(run)
+        async def async_wrapper(self, problem: Problem) -> PipelineResult:
+            with span("pipeline", problem=problem.slug, pipeline=self.name), collect_generations() as calls:
+                result = await run(self, problem)
+            result.generations = calls
+            return result
+        return async_wrapper
+
+    @functools.wraps(run)
+    def wrapper(self, problem: Problem) -> PipelineResult:
+        with span("pipeline", problem=problem.slug, pipeline=self.name), collect_generations() as calls:
+            result = run(self, problem)
+        result.generations = calls
+        return result
+    return wrapper
\ No newline at end of file
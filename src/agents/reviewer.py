@@ -1,6 +1,6 @@
 from typing import Optional
 
-from src.agents.pipeline import PipelineResult
+from src.agents.pipeline import PipelineResult, instrument_run
 from src.agents.solve_loop import solve_with_review
 from src.clients.ollama_client import OllamaClient
 from src.clients.leetcode_submitter import LeetCodeSubmitter
@@ -16,8 +16,9 @@ class Reviewer:
         self.config = config
         self.submitter = submitter
 
+    @instrument_run
     def run(self, problem: Problem) -> PipelineResult:
-        code, reviews, _ = solve_with_review(
+        code, raw, reviews, _ = solve_with_review(
             problem=problem, ollama=self.ollama, config=self.config, submitter=None,
         )
 
@@ -25,4 +26,4 @@ class Reviewer:
         if code and self.submitter:
             submission = self.submitter.submit(problem.slug, problem.id, code)
 
-        return PipelineResult(code=code, reviews=reviews, submission=submission)
\ No newline at end of file
+        return PipelineResult(code=code, raw=raw, reviews=reviews, submission=submission)
\ No newline at end of file
@@ -1,7 +1,10 @@
-from src.agents.pipeline import PipelineResult
+from typing import Optional
+
+from src.agents.pipeline import PipelineResult, instrument_run
 from src.agents.solve_loop import solve_with_review
 from src.clients.ollama_client import OllamaClient
 from src.clients.leetcode_submitter import LeetCodeSubmitter
+from src.evaluation.local_judge import LocalJudge
 from src.models.config import SolveConfig
 from src.models.problem import Problem
 
@@ -9,13 +12,16 @@ from src.models.problem import Problem
 class ReviewerFix:
     name = "reviewer+fix"
 
-    def __init__(self, ollama: OllamaClient, config: SolveConfig, submitter: LeetCodeSubmitter) -> None:
+    def __init__(self, ollama: OllamaClient, config: SolveConfig, submitter: LeetCodeSubmitter,
+                 judge: Optional[LocalJudge] = None) -> None:
         self.ollama = ollama
         self.config = config
         self.submitter = submitter
+        self.judge = judge
 
+    @instrument_run
     def run(self, problem: Problem) -> PipelineResult:
-        code, reviews, submission = solve_with_review(
-            problem=problem, ollama=self.ollama, config=self.config, submitter=self.submitter,
+        code, raw, reviews, submission = solve_with_review(
+            problem=problem, ollama=self.ollama, config=self.config, submitter=self.submitter, judge=self.judge,
         )
-        return PipelineResult(code=code, reviews=reviews, submission=submission)
\ No newline at end of file
+        return PipelineResult(code=code, raw=raw, reviews=reviews, submission=submission)
\ No newline at end of file
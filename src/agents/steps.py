@@ -0,0 +1,231 @@
+"""Decision logic of the review and fix loops, shared by the sync and async agents.
+
+The loops are generators: they yield the next step (a writer or reviewer
+call, a local check, a submission) and are sent its result. solve_loop.py,
+async_solve_loop.py and the fix pipelines only carry the steps out,
+blocking or awaiting, so the sync and async agents can't drift apart.
+
+A Submit step is answered with the SubmissionResult, or with the
+exception the submitter raised.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Generator, Optional, Union
+
+from src.models.config import SolveConfig
+from src.models.generation import CodeGeneration
+from src.models.result import ReviewerFeedback, SubmissionResult
+from src.utils.parsers import parse_review, parse_structured_review
+from src.utils.tracing import span
+
+log = logging.getLogger(__name__)
+
+# LeetCode verdicts that go back to the writer as an error to fix
+RETRY_STATUSES = ("Runtime Error", "Compile Error")
+
+
+@dataclass
+class Write:
+    """First writer answer for the problem."""
+
+
+@dataclass
+class Revise:
+    code: str
+    feedback: str
+
+
+@dataclass
+class FixError:
+    code: str
+    error_type: str
+    error_msg: str
+
+
+@dataclass
+class Review:
+    code: str
+
+
+@dataclass
+class LocalCheck:
+    code: str
+
+
+@dataclass
+class Submit:
+    code: str
+    priority: int
+
+
+Step = Union[Write, Revise, FixError, Review, LocalCheck, Submit]
+LoopResult = tuple[Optional[str], CodeGeneration, list[ReviewerFeedback], Optional[SubmissionResult]]
+
+
+def review_loop(config: SolveConfig, submit: bool) -> Generator[Step, Any, LoopResult]:
+    """Writer/reviewer loop; returns (code, writer output the code came from, reviews, last_submission).
+
+    With `submit`, every reviewer accept is checked locally and submitted,
+    and Compile/Runtime errors go back to the writer.
+    """
+    gen: CodeGeneration = yield Write()
+    code, raw = gen.code, gen
+
+    if not code:
+        log.warning("No code block in first response")
+        return None, gen, [], None
+
+    reviews: list[ReviewerFeedback] = []
+    last_sub: Optional[SubmissionResult] = None
+    # Set when the local check turned down code the reviewer accepted, until something is submitted
+    unsubmitted_accept = False
+
+    for i in range(config.max_iterations):
+        with span("iteration", iteration=i + 1):
+            # Review the current code
+            review_raw = yield Review(code)
+            if config.structured_review:
+                accepted, feedback = parse_structured_review(review_raw)
+            else:
+                accepted, feedback = parse_review(review_raw)
+
+            reviews.append(ReviewerFeedback(
+                accepted=accepted,
+                feedback=feedback,
+                model=config.reviewer_model,
+                message_number=i + 1,
+                raw=review_raw,
+            ))
+
+            log.info("Review #%d: %s", i + 1, "ACCEPT" if accepted else "REVISE")
+
+            if accepted:
+                if submit:
+                    # Cheap local check first; the last iteration always goes to leetcode
+                    failure = None
+                    if i < config.max_iterations - 1:
+                        failure = yield LocalCheck(code)
+
+                    unsubmitted_accept = failure is not None
+                    if failure is None:
+                        result = yield Submit(code, priority=-i)
+                        if isinstance(result, Exception):
+                            log.error("Submit failed: %s", result)
+                            break
+                        last_sub = result
+
+                        if last_sub.status in RETRY_STATUSES:
+                            failure = (last_sub.status, last_sub.compile_error or last_sub.runtime_error or "")
+
+                    # Compile or Runtime err (from leetcode or the local judge)
+                    if failure:
+                        error_type, error_msg = failure
+                        log.info("Submit error: %s — retrying", error_type)
+
+                        gen = yield FixError(code, error_type, error_msg)
+                        if gen.code:
+                            code, raw = gen.code, gen
+                            continue
+                        log.warning("No code block after error fix attempt")
+
+                break
+
+            # Revise based on reviewer feedback
+            gen = yield Revise(code, feedback)
+            if not gen.code:
+                log.warning("No code block in revision #%d", i + 1)
+                break
+
+            code, raw = gen.code, gen
+
+    if unsubmitted_accept:
+        # The local check can be wrong; LeetCode gets the last word rather than no submission at all
+        result = yield Submit(code, priority=-config.max_iterations)
+        if isinstance(result, Exception):
+            log.error("Submit failed: %s", result)
+        else:
+            last_sub = result
+
+    return code, raw, reviews, last_sub
+
+
+def fix_loop(
+    max_fixes: int,
+) -> Generator[Step, Any, tuple[Optional[str], CodeGeneration, Optional[SubmissionResult]]]:
+    """Write, then submit and fix Compile/Runtime errors; returns (code, writer output, last_submission)."""
+    gen: CodeGeneration = yield Write()
+    code, raw = gen.code, gen
+    if not code:
+        return None, raw, None
+
+    last_sub: Optional[SubmissionResult] = None
+    for attempt in range(max_fixes):
+        with span("iteration", iteration=attempt + 1):
+            # Cheap local check first; the last attempt always goes to leetcode
+            failure = (yield LocalCheck(code)) if attempt < max_fixes - 1 else None
+
+            if failure:
+                error_type, error_msg = failure
+                log.info("Local check: %s — retrying without submitting", error_type)
+            else:
+                result = yield Submit(code, priority=-attempt)
+                if isinstance(result, Exception):
+                    log.error("Submit failed: %s", result)
+                    return code, raw, last_sub
+                last_sub = result
+
+                if last_sub.status not in RETRY_STATUSES:
+                    return code, raw, last_sub
+
+                error_type = last_sub.status
+                error_msg = last_sub.compile_error or last_sub.runtime_error or ""
+                log.info("Submit error: %s — retrying", error_type)
+
+            gen = yield FixError(code, error_type, error_msg)
+            if not gen.code:
+                log.warning("No code block after error fix attempt")
+                break
+            code, raw = gen.code, gen
+
+    if last_sub is None:
+        # Only the local check has seen this code and it can be wrong; submit rather than report nothing
+        result = yield Submit(code, priority=-max_fixes)
+        if isinstance(result, Exception):
+            log.error("Submit failed: %s", result)
+        else:
+            last_sub = result
+
+    return code, raw, last_sub
+
+
+def run_steps(steps: Generator[Step, Any, Any], execute: Callable[[Step], Any]) -> Any:
+    """Drive a loop with a blocking `execute`; returns the loop's result."""
+    step = next(steps)
+    while True:
+        try:
+            try:
+                result = execute(step)
+            except BaseException as e:
+                # Raised at the loop's yield, so its spans record the error
+                step = steps.throw(e)
+            else:
+                step = steps.send(result)
+        except StopIteration as stop:
+            return stop.value
+
+
+async def async_run_steps(steps: Generator[Step, Any, Any], execute: Callable[[Step], Awaitable[Any]]) -> Any:
+    """Drive a loop with an async `execute`; returns the loop's result."""
+    step = next(steps)
+    while True:
+        try:
+            try:
+                result = await execute(step)
+            except BaseException as e:
+                # Raised at the loop's yield, so its spans record the error
+                step = steps.throw(e)
+            else:
+                step = steps.send(result)
+        except StopIteration as stop:
+            return stop.value
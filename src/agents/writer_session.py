@@ -0,0 +1,114 @@
+"""Writer side of the solve loop, either single-shot prompts or one conversation.
+
+In conversation mode the system prompt, the problem and every earlier
+answer stay a byte-identical prefix, and revisions are sent as short extra
+turns with keep_alive. Ollama then only evaluates the new turn instead of
+the whole problem again. For every follow-up we estimate the prompt-eval
+time that saved: the full single-shot prompt's length times the per-char
+prompt-eval rate measured on the first turn.
+"""
+
+import logging
+from typing import Optional
+
+from src.clients.async_ollama_client import AsyncOllamaClient
+from src.clients.ollama_client import OllamaClient
+from src.models.config import SolveConfig
+from src.models.generation import CodeGeneration
+from src.models.problem import Problem
+from src.prompts import (
+    WRITER_SYSTEM, writer_prompt,
+    writer_revision_prompt, writer_revision_turn,
+    writer_error_prompt, writer_error_turn,
+)
+
+log = logging.getLogger(__name__)
+
+
+class _WriterTurns:
+
+    def __init__(self, problem: Problem, config: SolveConfig) -> None:
+        self.problem = problem
+        self.model = config.writer_model
+        self.conversation = config.conversation
+        self.keep_alive = config.keep_alive
+        self.messages: list[dict[str, str]] = [{"role": "system", "content": WRITER_SYSTEM}]
+        # Total estimated prompt-eval seconds saved over all follow-up turns
+        self.prompt_eval_saved = 0.0
+        self._seconds_per_char: Optional[float] = None
+
+    def _record(self, gen: CodeGeneration, full_prompt: str) -> None:
+        """Append the answer to the history and estimate the prompt eval it saved."""
+        self.messages.append({"role": "assistant", "content": gen.text})
+        if gen.stats is None:
+            return
+
+        full_chars = len(WRITER_SYSTEM) + len(full_prompt)
+        if len(self.messages) == 3:
+            # First turn: nothing cached yet, so this is the full-prompt rate
+            self._seconds_per_char = gen.stats.prompt_eval_duration / full_chars
+            return
+        if self._seconds_per_char is None:
+            return
+
+        saved = max(0.0, full_chars * self._seconds_per_char - gen.stats.prompt_eval_duration)
+        gen.stats.prompt_eval_saved = saved
+        self.prompt_eval_saved += saved
+        log.info("Writer turn %d: prompt eval %.2fs (~%.2fs saved vs. full prompt)",
+                 len(self.messages) // 2, gen.stats.prompt_eval_duration, saved)
+
+
+class WriterSession(_WriterTurns):
+
+    def __init__(self, ollama: OllamaClient, problem: Problem, config: SolveConfig) -> None:
+        super().__init__(problem, config)
+        self.ollama = ollama
+
+    def start(self) -> CodeGeneration:
+        return self._turn(writer_prompt(self.problem), writer_prompt(self.problem))
+
+    def revise(self, code: str, feedback: str) -> CodeGeneration:
+        return self._turn(writer_revision_turn(feedback), writer_revision_prompt(self.problem, code, feedback))
+
+    def fix_error(self, code: str, error_type: str, error_msg: str) -> CodeGeneration:
+        return self._turn(
+            writer_error_turn(error_type, error_msg),
+            writer_error_prompt(self.problem, code, error_type, error_msg),
+        )
+
+    def _turn(self, turn: str, full_prompt: str) -> CodeGeneration:
+        if not self.conversation:
+            return self.ollama.generate_code(model=self.model, prompt=full_prompt, system=WRITER_SYSTEM)
+
+        self.messages.append({"role": "user", "content": turn})
+        gen = self.ollama.chat_code(model=self.model, messages=self.messages, keep_alive=self.keep_alive)
+        self._record(gen, full_prompt)
+        return gen
+
+
+class AsyncWriterSession(_WriterTurns):
+
+    def __init__(self, ollama: AsyncOllamaClient, problem: Problem, config: SolveConfig) -> None:
+        super().__init__(problem, config)
+        self.ollama = ollama
+
+    async def start(self) -> CodeGeneration:
+        return await self._turn(writer_prompt(self.problem), writer_prompt(self.problem))
+
+    async def revise(self, code: str, feedback: str) -> CodeGeneration:
+        return await self._turn(writer_revision_turn(feedback), writer_revision_prompt(self.problem, code, feedback))
+
+    async def fix_error(self, code: str, error_type: str, error_msg: str) -> CodeGeneration:
+        return await self._turn(
+            writer_error_turn(error_type, error_msg),
+            writer_error_prompt(self.problem, code, error_type, error_msg),
+        )
+
+    async def _turn(self, turn: str, full_prompt: str) -> CodeGeneration:
+        if not self.conversation:
+            return await self.ollama.generate_code(model=self.model, prompt=full_prompt, system=WRITER_SYSTEM)
+
+        self.messages.append({"role": "user", "content": turn})
+        gen = await self.ollama.chat_code(model=self.model, messages=self.messages, keep_alive=self.keep_alive)
+        self._record(gen, full_prompt)
+        return gen
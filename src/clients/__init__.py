@@ -1,5 +1,18 @@
+from src.clients.async_ollama_client import AsyncOllamaClient
+from src.clients.judge_poller import JudgePoller
 from src.clients.leetcode_client import LeetCodeClient
 from src.clients.leetcode_submitter import LeetCodeSubmitter
+from src.clients.model_scheduler import ModelScheduler
 from src.clients.ollama_client import OllamaClient
+from src.clients.ollama_pool import OllamaPool
+from src.clients.problem_prefetcher import ProblemPrefetcher
+from src.clients.problem_store import ProblemStore
+from src.clients.response_cache import ResponseCache
+from src.clients.submission_cache import SubmissionCache
+from src.clients.submission_rate_limiter import SubmissionRateLimiter
 
-__all__ = ["LeetCodeClient", "LeetCodeSubmitter", "OllamaClient"] 
\ No newline at end of file
+__all__ = [
+    "AsyncOllamaClient", "JudgePoller", "LeetCodeClient", "LeetCodeSubmitter", "ModelScheduler",
+    "OllamaClient", "OllamaPool", "ProblemPrefetcher", "ProblemStore", "ResponseCache", "SubmissionCache",
+    "SubmissionRateLimiter",
+]
@@ -0,0 +1,205 @@
+import asyncio
+import logging
+import time
+from contextlib import AsyncExitStack, asynccontextmanager, nullcontext
+from typing import AsyncIterator, Optional, Union
+
+from ollama import AsyncClient
+
+from src.clients.ollama_client import code_cache_key, code_generation_from_stream
+from src.clients.model_scheduler import KeepAlive, ModelScheduler
+from src.clients.response_cache import ResponseCache
+from src.models.generation import CodeGeneration, GenerationStats
+from src.utils.parsers import CodeBlockStream, ends_at_first_block, extract_code
+from src.utils.telemetry import record_generation, stats_from_response
+from src.utils.tracing import annotate, span, traced
+
+log = logging.getLogger(__name__)
+
+
+class AsyncOllamaClient:
+    """Asyncio counterpart of OllamaClient.
+
+    Every model gets its own semaphore, so one process can keep several
+    generations in flight without flooding the server with a single model.
+    With group_models=True a ModelScheduler also runs requests for the same
+    model back to back, for servers that can't hold all models in VRAM.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        timeout: int = 300,
+        max_concurrency: int = 2,
+        model_concurrency: Optional[dict[str, int]] = None,
+        cache: Optional[ResponseCache] = None,
+        group_models: bool = False,
+        keep_alive: KeepAlive = "10m",
+    ) -> None:
+        self._client = AsyncClient(host=host, timeout=timeout)
+        self.cache = cache
+        self.scheduler = ModelScheduler(self.loaded_models, keep_alive=keep_alive) if group_models else None
+        self._default_limit = max_concurrency
+        self._model_limits = model_concurrency or {}
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._full_lengths: dict[str, float] = {}
+
+    def _semaphore(self, model: str) -> asyncio.Semaphore:
+        if model not in self._semaphores:
+            limit = self._model_limits.get(model, self._default_limit)
+            self._semaphores[model] = asyncio.Semaphore(limit)
+        return self._semaphores[model]
+
+    def _slot(self, model: str):
+        # Yields the keep_alive chosen by the scheduler, or None without one
+        return self.scheduler.slot(model) if self.scheduler else nullcontext()
+
+    @asynccontextmanager
+    async def _acquire(self, model: str) -> AsyncIterator[Optional[KeepAlive]]:
+        """Scheduler slot, then concurrency slot for `model`; the wait is traced as ollama.queue."""
+        async with AsyncExitStack() as stack:
+            queued_at = time.monotonic()
+            with span("ollama.queue", model=model):
+                scheduled_keep_alive = await stack.enter_async_context(self._slot(model))
+                await stack.enter_async_context(self._semaphore(model))
+            # Time spent waiting for a free slot shows up as a stall in the trace
+            annotate(queued=round(time.monotonic() - queued_at, 3))
+            yield scheduled_keep_alive
+
+    @traced("ollama.generate", "model")
+    async def generate(
+        self,
+        model: str,
+        prompt: str,
+        system: str = "",
+        temperature: float = 0.2,
+        options: Optional[dict] = None,
+        format: Optional[Union[str, dict]] = None,
+    ) -> str:
+        """Single chat turn; `format` ("json" or a JSON schema) constrains the output."""
+
+        messages: list[dict[str, str]] = []
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.append({"role": "user", "content": prompt})
+
+        key = None
+        if self.cache:
+            key = ResponseCache.key(
+                model, system, prompt, temperature, {**(options or {}), "format": format} if format else options,
+            )
+            cached = self.cache.get(key)
+            if cached is not None:
+                log.info("Cache hit for model=%s (%d chars)", model, len(cached))
+                annotate(cached=True)
+                record_generation(GenerationStats(model=model, cached=True))
+                return cached
+
+        async with self._acquire(model) as scheduled_keep_alive:
+            log.info("Calling model=%s (prompt length=%d chars)", model, len(prompt))
+            response = await self._client.chat(
+                model=model,
+                messages=messages,
+                options={**(options or {}), "temperature": temperature},
+                format=format,
+                keep_alive=scheduled_keep_alive,
+            )
+        text = response.message.content
+        log.info("Response: %d chars", len(text))
+        record_generation(stats_from_response(model, response))
+
+        if key:
+            self.cache.put(key, model, text)
+        return text
+
+    async def generate_code(
+        self,
+        model: str,
+        prompt: str,
+        system: str = "",
+        temperature: float = 0.2,
+        options: Optional[dict] = None,
+    ) -> CodeGeneration:
+        """Streaming generate that stops at the end of the first code block (see OllamaClient)."""
+        messages: list[dict[str, str]] = []
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.append({"role": "user", "content": prompt})
+        return await self.chat_code(model, messages, temperature, options)
+
+    @traced("ollama.generate_code", "model")
+    async def chat_code(
+        self,
+        model: str,
+        messages: list[dict[str, str]],
+        temperature: float = 0.2,
+        options: Optional[dict] = None,
+        keep_alive: Optional[str] = None,
+    ) -> CodeGeneration:
+        key = None
+        if self.cache:
+            key = code_cache_key(model, messages, temperature, options)
+            cached = self.cache.get(key)
+            if cached is not None:
+                log.info("Cache hit for model=%s (%d chars)", model, len(cached))
+                annotate(cached=True)
+                record_generation(GenerationStats(model=model, cached=True))
+                # The cache keeps only the text; if it ends at the first block, assume the stream was cut there
+                return CodeGeneration(
+                    text=cached, code=extract_code(cached), stopped_early=ends_at_first_block(cached), cached=True,
+                )
+
+        async with self._acquire(model) as scheduled_keep_alive:
+            log.info("Streaming model=%s (%d messages, %d chars)", model, len(messages),
+                     sum(len(m["content"]) for m in messages))
+            started = time.monotonic()
+            stream = await self._client.chat(
+                model=model,
+                messages=messages,
+                options={**(options or {}), "temperature": temperature},
+                stream=True,
+                keep_alive=scheduled_keep_alive if scheduled_keep_alive is not None else keep_alive,
+            )
+            block = CodeBlockStream()
+            chunks = 0
+            first_at = final = None
+            try:
+                async for chunk in stream:
+                    chunks += 1
+                    first_at = first_at or time.monotonic()
+                    if chunk.done:
+                        final = chunk
+                    if block.feed(chunk.message.content or ""):
+                        break
+            except asyncio.CancelledError:
+                # Cancelled candidate (e.g. best-of-n found a winner): still count the GPU time it used
+                record_generation(GenerationStats(
+                    model=model, eval_count=chunks, total_duration=time.monotonic() - started, estimated=True,
+                ))
+                raise
+            finally:
+                await stream.aclose()
+
+        result = code_generation_from_stream(
+            self._full_lengths, model, block, chunks, final, started, first_at,
+        )
+        if key:
+            self.cache.put(key, model, result.text)
+        return result
+
+    async def loaded_models(self) -> set[str]:
+        """Models currently resident on the server (/api/ps)."""
+        response = await self._client.ps()
+        return {m.model for m in response.models}
+
+    async def list_models(self) -> list[str]:
+        response = await self._client.list()
+        return [m.model for m in response.models]
+
+    async def ping(self, model: str = "tinyllama") -> bool:
+        try:
+            reply = await self.generate(model=model, prompt="Say OK.", temperature=0.0)
+            return len(reply) > 0
+        except Exception as exc:
+            log.error("Ping failed: %s", exc)
+            return False
@@ -0,0 +1,153 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+
+import httpx
+
+from src.clients.submission_details import SUBMISSION_DETAILS_FIELDS, to_submission_result
+from src.models.result import SubmissionResult
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class _Pending:
+    slug: str
+    submitted_at: float
+    deadline: float
+    next_poll: float
+    interval: float
+    future: Future = field(default_factory=Future)
+
+
+class JudgePoller:
+    """Polls the judge for many submissions at once.
+
+    All submissions that are due get checked with one aliased
+    submissionDetails request. The first poll for each submission is timed
+    from a running average of observed judge latency. After that the interval
+    backs off from `min_interval` up to `max_interval`.
+    """
+
+    def __init__(
+        self,
+        http: httpx.Client,
+        graphql_url: str,
+        initial_latency: float = 10.0,
+        min_interval: float = 1.0,
+        max_interval: float = 5.0,
+        max_wait: float = 60.0,
+    ) -> None:
+        self._http = http
+        self._graphql_url = graphql_url
+        self.latency_estimate = initial_latency
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.max_wait = max_wait
+        self.requests_sent = 0
+
+        self._pending: dict[int, _Pending] = {}
+        self._wakeup = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._loop, name="judge-poller", daemon=True)
+        self._thread.start()
+
+    def watch(self, slug: str, submission_id: int) -> "Future[SubmissionResult]":
+        now = time.time()
+        # Poll a bit before the expected finish; a miss only costs one cheap batched request
+        first_poll = now + 0.8 * self.latency_estimate
+        pending = _Pending(
+            slug=slug,
+            submitted_at=now,
+            deadline=now + self.max_wait,
+            next_poll=first_poll,
+            interval=self.min_interval,
+        )
+        with self._wakeup:
+            self._pending[submission_id] = pending
+            self._wakeup.notify()
+        return pending.future
+
+    def close(self) -> None:
+        with self._wakeup:
+            self._closed = True
+            self._wakeup.notify()
+        self._thread.join(timeout=5)
+
+    def _loop(self) -> None:
+        while True:
+            with self._wakeup:
+                while not self._closed:
+                    if self._pending:
+                        delay = min(p.next_poll for p in self._pending.values()) - time.time()
+                        if delay <= 0:
+                            break
+                        self._wakeup.wait(timeout=delay)
+                    else:
+                        self._wakeup.wait()
+                if self._closed:
+                    for p in self._pending.values():
+                        p.future.cancel()
+                    return
+
+                now = time.time()
+                due = {sid: p for sid, p in self._pending.items() if p.next_poll <= now}
+
+            self._poll(due)
+
+    def _poll(self, due: dict[int, _Pending]) -> None:
+        ids = list(due)
+        params = ", ".join(f"$id{i}: Int!" for i in range(len(ids)))
+        fields = "\n".join(
+            f"    s{i}: submissionDetails(submissionId: $id{i}) {{{SUBMISSION_DETAILS_FIELDS}    }}"
+            for i in range(len(ids))
+        )
+        query = f"query submissionDetailsBatch({params}) {{\n{fields}\n}}"
+
+        try:
+            resp = self._http.post(
+                self._graphql_url,
+                json={"query": query, "variables": {f"id{i}": sid for i, sid in enumerate(ids)}},
+            )
+            resp.raise_for_status()
+            # A GraphQL error reply has "data": null; treat it like a failed poll
+            data = resp.json()["data"] or {}
+        except Exception as e:
+            log.warning("Batched judge poll failed: %s", e)
+            data = {}
+        self.requests_sent += 1
+
+        now = time.time()
+        with self._wakeup:
+            for i, sid in enumerate(ids):
+                pending = due[sid]
+                details = data.get(f"s{i}")
+
+                if details is not None:
+                    del self._pending[sid]
+                    self._observe(now - pending.submitted_at)
+                    try:
+                        result = to_submission_result(pending.slug, sid, details)
+                    except Exception as e:
+                        # A malformed reply fails this submission only, not the poller thread
+                        pending.future.set_exception(e)
+                    else:
+                        pending.future.set_result(result)
+                elif now >= pending.deadline:
+                    del self._pending[sid]
+                    pending.future.set_exception(TimeoutError(
+                        f"Judge did not finish within {self.max_wait:.0f}s for submission {sid}"
+                    ))
+                else:
+                    # Not ready yet
+                    pending.next_poll = now + pending.interval
+                    pending.interval = min(pending.interval * 1.5, self.max_interval)
+
+        log.info("Polled %d submissions in one request (%d still pending, latency estimate %.1fs)",
+                 len(ids), len(self._pending), self.latency_estimate)
+
+    def _observe(self, latency: float) -> None:
+        # Exponential moving average; observed latency overshoots by up to one poll interval
+        self.latency_estimate = 0.7 * self.latency_estimate + 0.3 * latency
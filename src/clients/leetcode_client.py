@@ -1,6 +1,12 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
 import httpx
+from src.clients.problem_store import ProblemStore
 from src.models.problem import Problem
+from src.utils.description import html_to_markdown
+from src.utils.tracing import traced
 
 log = logging.getLogger(__name__)
 
@@ -19,6 +25,17 @@ query getQuestionDetail($titleSlug: String!) {
 }
 """
  
+# Same fields as _PROBLEM_QUERY, repeated under an alias per slug so that
+# many problems come back in one request
+_PROBLEM_FIELDS = """
+        questionId
+        title
+        titleSlug
+        difficulty
+        content
+        codeSnippets { langSlug code }
+"""
+
 # Fetch the full problem list (slug, title, difficulty)
 _PROBLEMSET_QUERY = """
 query problemsetQuestionList($categorySlug: String, $limit: Int, $skip: Int, $filters: QuestionListFilterInput) {
@@ -43,61 +60,139 @@ query problemsetQuestionList($categorySlug: String, $limit: Int, $skip: Int, $fi
 
 class LeetCodeClient:
 
-    def __init__(self, graphql_url: str) -> None:
+    def __init__(self, graphql_url: str, store: Optional[ProblemStore] = None) -> None:
         self._url = graphql_url
+        self.store = store
 
+    @traced("leetcode.fetch_problem", "slug")
     def fetch_problem(self, slug: str) -> Problem:
+        if self.store:
+            cached = self.store.get(slug)
+            if cached:
+                log.info("Loaded problem #%s: %s from store", cached.id, cached.title)
+                return cached
+
+        try:
+            raw = self._query(_PROBLEM_QUERY, {"titleSlug": slug})["question"]
+        except (httpx.HTTPError, KeyError, ValueError) as e:
+            # Fall back to an expired copy rather than failing the run
+            stale = self.store.get(slug, allow_stale=True) if self.store else None
+            if stale is None:
+                raise
+            log.warning("Fetching %s failed (%s), using stored copy", slug, e)
+            return stale
+
+        problem = self._to_problem(raw)
+        log.info("Fetched problem #%s: %s (%s)", problem.id, problem.title, problem.difficulty)
 
-        raw = self._query(_PROBLEM_QUERY, {"titleSlug": slug})["question"]
+        if self.store:
+            self.store.put(problem)
+        return problem
 
+    @traced("leetcode.fetch_problems")
+    def fetch_problems(self, slugs: list[str], batch_size: int = 20) -> dict[str, Problem]:
+        """Fetch many problems, `batch_size` aliased lookups per GraphQL request.
+
+        Slugs that don't exist (or fail with no stored copy) are left out of the result.
+        """
+        problems: dict[str, Problem] = {}
+        missing: list[str] = []
+        for slug in dict.fromkeys(slugs):
+            cached = self.store.get(slug) if self.store else None
+            if cached:
+                problems[slug] = cached
+            else:
+                missing.append(slug)
+
+        if problems:
+            log.info("Loaded %d / %d problems from store", len(problems), len(problems) + len(missing))
+
+        for start in range(0, len(missing), batch_size):
+            batch = missing[start:start + batch_size]
+            params = ", ".join(f"$s{i}: String!" for i in range(len(batch)))
+            fields = "\n".join(
+                f"    q{i}: question(titleSlug: $s{i}) {{{_PROBLEM_FIELDS}    }}" for i in range(len(batch))
+            )
+            query = f"query getQuestionDetails({params}) {{\n{fields}\n}}"
+
+            try:
+                data = self._query(query, {f"s{i}": slug for i, slug in enumerate(batch)})
+            except (httpx.HTTPError, KeyError, ValueError) as e:
+                log.warning("Batch fetch failed (%s), using stored copies where possible", e)
+                for slug in batch:
+                    stale = self.store.get(slug, allow_stale=True) if self.store else None
+                    if stale:
+                        problems[slug] = stale
+                continue
+
+            for i, slug in enumerate(batch):
+                raw = data.get(f"q{i}")
+                if raw is None:
+                    log.warning("Problem %s not found", slug)
+                    continue
+                problem = self._to_problem(raw)
+                problems[slug] = problem
+                if self.store:
+                    self.store.put(problem)
+
+            log.info("Fetched %d problems in one request", len(batch))
+
+        return problems
+
+    @staticmethod
+    def _to_problem(raw: dict) -> Problem:
         python3_stub = ""
         for snippet in raw["codeSnippets"]:
             if snippet["langSlug"] == "python3":
                 python3_stub = snippet["code"]
                 break
 
-        problem = Problem(
+        return Problem(
             id=raw["questionId"],
             title=raw["title"],
             slug=raw["titleSlug"],
             difficulty=raw["difficulty"],
             description=raw["content"],
+            description_md=html_to_markdown(raw["content"]),
             code_stub=python3_stub,
         )
-        log.info("Fetched problem #%s: %s (%s)", problem.id, problem.title, problem.difficulty)
-        return problem
 
-    def fetch_problem_list(self, category: str = "algorithms") -> list[dict]:
+    def fetch_problem_list(self, category: str = "algorithms", max_workers: int = 4) -> list[dict]:
         page_size = 100
-        skip = 0
-        problems: list[dict] = []
-
-        while True:
-            data = self._query(_PROBLEMSET_QUERY, {
-                "categorySlug": category,
-                "limit": page_size,
-                "skip": skip,
-                "filters": {},
-            })["problemsetQuestionList"]
-
-            for q in data["questions"]:
-                problems.append({
-                    "id": q["questionFrontendId"],
-                    "slug": q["titleSlug"],
-                    "title": q["title"],
-                    "difficulty": q["difficulty"],
-                    "paid_only": q["isPaidOnly"],
-                })
-
-            total = data["total"]
-            skip += page_size
-            log.info("Fetched %d / %d problems", len(problems), total)
-
-            if skip >= total:
-                break
+
+        # First page tells us the total, the rest are fetched in parallel
+        first = self._fetch_problem_page(category, 0, page_size)
+        total = first["total"]
+        problems = [self._to_list_entry(q) for q in first["questions"]]
+        log.info("Fetched %d / %d problems", len(problems), total)
+
+        skips = range(page_size, total, page_size)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            # map() keeps page order, so the list comes back sorted like the API
+            for page in pool.map(lambda skip: self._fetch_problem_page(category, skip, page_size), skips):
+                problems.extend(self._to_list_entry(q) for q in page["questions"])
+                log.info("Fetched %d / %d problems", len(problems), total)
 
         return problems
 
+    def _fetch_problem_page(self, category: str, skip: int, limit: int) -> dict:
+        return self._query(_PROBLEMSET_QUERY, {
+            "categorySlug": category,
+            "limit": limit,
+            "skip": skip,
+            "filters": {},
+        })["problemsetQuestionList"]
+
+    @staticmethod
+    def _to_list_entry(q: dict) -> dict:
+        return {
+            "id": q["questionFrontendId"],
+            "slug": q["titleSlug"],
+            "title": q["title"],
+            "difficulty": q["difficulty"],
+            "paid_only": q["isPaidOnly"],
+        }
+
     def _query(self, query: str, variables: dict) -> dict:
 
         response = httpx.post(
@@ -107,4 +202,9 @@ class LeetCodeClient:
             timeout=30,
         )
         response.raise_for_status()
-        return response.json()["data"]
+        payload = response.json()
+        if payload.get("data") is None:
+            # GraphQL errors come back as 200 with "data": null
+            errors = "; ".join(e.get("message", "?") for e in payload.get("errors") or [])
+            raise ValueError(f"GraphQL error: {errors or 'no data'}")
+        return payload["data"]
@@ -1,57 +1,53 @@
 import logging
 import time
+from typing import Optional
+
 import httpx
 
+from src.clients.judge_poller import JudgePoller
+from src.clients.submission_cache import SubmissionCache
+from src.clients.submission_rate_limiter import SubmissionRateLimiter
+from src.clients.submission_details import STATUS_CODES, SUBMISSION_DETAILS_FIELDS, to_submission_result
 from src.models.result import SubmissionResult
+from src.utils.tracing import annotate, span, traced
 
 log = logging.getLogger(__name__)
 
-_SUBMISSION_DETAILS_QUERY = """
-query submissionDetails($submissionId: Int!) {
-    submissionDetails(submissionId: $submissionId) {
-        statusCode
-        runtimePercentile
-        memoryPercentile
-        totalCorrect
-        totalTestcases
-        compileError
-        runtimeError
-        lastTestcase
-        codeOutput
-        expectedOutput
-    }
-}
+_SUBMISSION_DETAILS_QUERY = f"""
+query submissionDetails($submissionId: Int!) {{
+    submissionDetails(submissionId: $submissionId) {{{SUBMISSION_DETAILS_FIELDS}    }}
+}}
 """
 
-# These are the status codes returned by LeetCode's submissionDetails API ( it's in a docs)
-STATUS_CODES = {
-    10: "Accepted",
-    11: "Wrong Answer",
-    12: "Memory Limit Exceeded",
-    13: "Output Limit Exceeded",
-    14: "Time Limit Exceeded",
-    15: "Runtime Error",
-    16: "Internal Error",
-    20: "Compile Error",
-}
-
 
 class LeetCodeSubmitter:
 
-    def __init__(self, session_cookie: str, graphql_url: str = "https://leetcode.com/graphql") -> None:
+    def __init__(self, session_cookie: str, graphql_url: str = "https://leetcode.com/graphql",
+                 batch_poll: bool = False, cache: Optional[SubmissionCache] = None,
+                 rate_limiter: Optional[SubmissionRateLimiter] = None, base_url: Optional[str] = None,
+                 judge_latency: float = 10.0) -> None:
         self._graphql_url = graphql_url
+        # Site root for the submit endpoint; defaults to the GraphQL URL's (e.g. a local mock server)
+        self._base_url = (base_url or graphql_url.removesuffix("/graphql")).rstrip("/")
+        # Expected time for the judge to finish, before the first poll
+        self.judge_latency = judge_latency
+        self.cache = cache
+        self.rate_limiter = rate_limiter or SubmissionRateLimiter()
 
         # Fetching csrftoken automatically
         self._http = httpx.Client(
             cookies={"LEETCODE_SESSION": session_cookie},
             headers={
-                "Referer": "https://leetcode.com",
+                "Referer": self._base_url,
                 "User-Agent": "Mozilla/5.0",
             },
             timeout=30,
         )
         self._refresh_csrf()
 
+        # Shared poller that checks all in-flight submissions in one request
+        self._poller = JudgePoller(self._http, graphql_url, initial_latency=judge_latency) if batch_poll else None
+
     def _refresh_csrf(self) -> None:
         """Fetch a fresh CSRF token and update headers + cookies."""
         self._http.cookies.delete("csrftoken")
@@ -61,38 +57,66 @@ class LeetCodeSubmitter:
         csrf = self._http.cookies["csrftoken"]
         self._http.headers["x-csrftoken"] = csrf
 
+    @traced("leetcode.submit", "slug")
     def submit(self, slug: str, question_id: str, code: str, lang: str = "python3",
-               max_retries: int = 3) -> SubmissionResult:
+               max_retries: int = 3, priority: int = 0) -> SubmissionResult:
+        """Submit and wait for the verdict. Lower `priority` gets a rate-limit slot sooner."""
+        if self.cache:
+            cached = self.cache.get(slug, lang, code)
+            if cached:
+                log.info("Same code for %s was already judged: %s (cached)", slug, cached.status)
+                annotate(cached=True)
+                return cached
+
+        result = self._submit(slug, question_id, code, lang, max_retries, priority)
+        if self.cache:
+            self.cache.put(lang, code, result)
+        return result
+
+    def _submit(self, slug: str, question_id: str, code: str, lang: str, max_retries: int,
+                priority: int) -> SubmissionResult:
         log.info("Submitting %s (%s)", slug, lang)
 
         for attempt in range(max_retries):
-            resp = self._http.post(
-                f"https://leetcode.com/problems/{slug}/submit/",
-                json={
-                    "question_id": question_id,
-                    "lang": lang,
-                    "typed_code": code,
-                },
-            )
-            if resp.status_code == 403 and attempt < max_retries - 1:
-                wait = 15 * (attempt + 1)
-                log.warning("Got 403, retrying in %ds (attempt %d/%d)", wait, attempt + 1, max_retries)
-                time.sleep(wait)
-                self._refresh_csrf()
+            with span("leetcode.rate_limit", priority=priority):
+                self.rate_limiter.acquire(priority)
+            with span("leetcode.post", attempt=attempt + 1):
+                resp = self._http.post(
+                    f"{self._base_url}/problems/{slug}/submit/",
+                    json={
+                        "question_id": question_id,
+                        "lang": lang,
+                        "typed_code": code,
+                    },
+                )
+            if resp.status_code in (403, 429) and attempt < max_retries - 1:
+                retry_after = resp.headers.get("Retry-After")
+                log.warning("Got %d, backing off (attempt %d/%d)", resp.status_code, attempt + 1, max_retries)
+                self.rate_limiter.on_throttled(float(retry_after) if retry_after and retry_after.isdigit() else None)
+                if resp.status_code == 403:
+                    self._refresh_csrf()
+                # A retry already waited once, let it go ahead of fresh submissions
+                priority -= 1
                 continue
             resp.raise_for_status()
+            self.rate_limiter.on_success()
             break
 
         submission_id = resp.json()["submission_id"]
         log.info("Submitted, id=%s — waiting for judge", submission_id)
 
-        return self._poll_result(slug, submission_id)
+        with span("leetcode.judge", submission_id=submission_id):
+            if self._poller:
+                # The poller gives up after max_wait; the margin covers its last poll interval and request
+                timeout = self._poller.max_wait + self._poller.max_interval + 30
+                return self._poller.watch(slug, submission_id).result(timeout=timeout)
+            return self._poll_result(slug, submission_id)
 
     def _poll_result(self, slug: str, submission_id: int, max_wait: int = 60) -> SubmissionResult:
         deadline = time.time() + max_wait
 
         # Leetcode needs time to judge, which is 10s in the docs
-        time.sleep(10)
+        time.sleep(self.judge_latency)
 
         while time.time() < deadline:
             resp = self._http.post(
@@ -110,21 +134,11 @@ class LeetCodeSubmitter:
                 time.sleep(3)
                 continue
 
-            status_code = details["statusCode"]
-            return SubmissionResult(
-                slug=slug,
-                submission_id=submission_id,
-                accepted=status_code == 10,
-                status=STATUS_CODES.get(status_code, f"Unknown ({status_code})"),
-                total_correct=details["totalCorrect"],
-                total_testcases=details["totalTestcases"],
-                runtime_percentile=details["runtimePercentile"],
-                memory_percentile=details["memoryPercentile"],
-                compile_error=details["compileError"],
-                runtime_error=details["runtimeError"],
-                last_testcase=details["lastTestcase"],
-                code_output=details["codeOutput"],
-                expected_output=details["expectedOutput"],
-            )
+            return to_submission_result(slug, submission_id, details)
+
+        raise TimeoutError(f"Judge did not finish within {max_wait}s for submission {submission_id}")
 
-        raise TimeoutError(f"Judge did not finish within {max_wait}s for submission {submission_id}")
\ No newline at end of file
+    def close(self) -> None:
+        if self._poller:
+            self._poller.close()
+        self._http.close()
\ No newline at end of file
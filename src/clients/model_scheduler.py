@@ -0,0 +1,120 @@
+import asyncio
+import logging
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Optional, Union
+
+log = logging.getLogger(__name__)
+
+KeepAlive = Union[str, int]
+
+
+class ModelScheduler:
+    """Orders generation requests so one model load serves many of them.
+
+    Requests queue per model and only the active model runs. The active
+    model changes once it has nothing in flight and either its queue is empty
+    or it has served `max_batch` requests while others were waiting. The next
+    model is the one with the longest queue.
+
+    `keep_alive` is chosen per request. The active model stays loaded while it
+    has work queued. The last request before a switch gets keep_alive=0, so its
+    VRAM is freed for the next model instead of waiting for eviction.
+
+    If the server's loaded models (/api/ps) show that every model in demand
+    is resident at once, they fit together and requests are not serialized.
+    """
+
+    def __init__(
+        self,
+        loaded_models: Callable[[], Awaitable[set[str]]],
+        keep_alive: KeepAlive = "10m",
+        max_batch: int = 16,
+        refresh_interval: float = 10.0,
+    ) -> None:
+        self._loaded_models = loaded_models
+        self.keep_alive = keep_alive
+        self.max_batch = max_batch
+        self.refresh_interval = refresh_interval
+        self.switches = 0
+
+        self._cond = asyncio.Condition()
+        self._waiting: Counter[str] = Counter()
+        self._running: Counter[str] = Counter()
+        self._active: Optional[str] = None
+        self._served = 0
+        self._shared = False
+        self._refreshed_at = float("-inf")
+
+    @asynccontextmanager
+    async def slot(self, model: str) -> AsyncIterator[KeepAlive]:
+        """Wait until `model` may run; yields the keep_alive to send with the request."""
+        await self._refresh_residency(model)
+
+        async with self._cond:
+            self._waiting[model] += 1
+            await self._cond.wait_for(lambda: self._may_run(model))
+            self._waiting[model] -= 1
+
+            if model != self._active:
+                if self._active is not None:
+                    self.switches += 1
+                    log.info("Switching %s -> %s (%d queued)", self._active, model, self._waiting[model] + 1)
+                self._active = model
+                self._served = 0
+            self._running[model] += 1
+            self._served += 1
+            keep_alive = self._keep_alive_for(model)
+            self._cond.notify_all()
+
+        try:
+            yield keep_alive
+        finally:
+            async with self._cond:
+                self._running[model] -= 1
+                self._cond.notify_all()
+
+    def _others_waiting(self, model: str) -> bool:
+        return any(n for m, n in self._waiting.items() if m != model)
+
+    def _batch_done(self) -> bool:
+        return self._served >= self.max_batch and self._others_waiting(self._active)
+
+    def _may_run(self, model: str) -> bool:
+        if self._shared or self._active is None:
+            return True
+        if model == self._active:
+            return not self._batch_done()
+        if self._running[self._active] or (self._waiting[self._active] and not self._batch_done()):
+            return False
+        return model == self._next_model()
+
+    def _next_model(self) -> Optional[str]:
+        candidates = [m for m, n in self._waiting.items() if n]
+        if self._batch_done():
+            candidates = [m for m in candidates if m != self._active]
+        return max(candidates, key=lambda m: self._waiting[m], default=None)
+
+    def _keep_alive_for(self, model: str) -> KeepAlive:
+        if not self._shared and not self._waiting[model] and self._others_waiting(model):
+            return 0
+        return self.keep_alive
+
+    async def _refresh_residency(self, model: str) -> None:
+        now = time.monotonic()
+        if now - self._refreshed_at < self.refresh_interval:
+            return
+        self._refreshed_at = now
+
+        try:
+            resident = await self._loaded_models()
+        except Exception as e:
+            log.warning("Could not list loaded models: %s", e)
+            return
+
+        demanded = {m for m in (self._waiting + self._running)} | {model}
+        shared = len(demanded) > 1 and demanded <= resident
+        if shared != self._shared:
+            log.info("Models %s %s resident together", sorted(demanded), "are" if shared else "are not")
+            self._shared = shared
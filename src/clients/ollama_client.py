@@ -1,36 +1,197 @@
+import json
 import logging
+import time
+from typing import Any, Optional, Union
+
 from ollama import Client
 
+from src.clients.response_cache import ResponseCache
+from src.models.generation import CodeGeneration, GenerationStats
+from src.utils.parsers import CodeBlockStream, ends_at_first_block, extract_code
+from src.utils.telemetry import record_generation, stats_from_response
+from src.utils.tracing import annotate, traced
+
 log = logging.getLogger(__name__)
 
+
+def code_cache_key(model: str, messages: list[dict[str, str]], temperature: float, options: Optional[dict]) -> str:
+    """Cache key for a code generation; single-turn chats keep the same key as before conversations existed."""
+    system = messages[0]["content"] if messages and messages[0]["role"] == "system" else ""
+    turns = messages[1:] if system else messages
+    prompt = turns[0]["content"] if len(turns) == 1 else json.dumps(turns, ensure_ascii=False)
+    # Truncated responses must not be served to plain generate() calls
+    return ResponseCache.key(model, system, prompt, temperature, {**(options or {}), "stop_at": "code_fence"})
+
+
+def code_generation_from_stream(full_lengths: dict[str, float], model: str, block: CodeBlockStream, chunks: int,
+                                final: Optional[Any], started: float, first_at: Optional[float]) -> CodeGeneration:
+    """Build the result of a streamed generation, recording its stats and updating the length average.
+
+    Only the final (done) chunk carries Ollama's counters, so final=None means
+    the stream was cut early and timings are measured here instead.
+    """
+    stopped_early = final is None
+    eval_count = (final.eval_count or chunks) if final is not None else None
+    tokens_saved = 0
+    if stopped_early:
+        tokens_saved = max(0, round(full_lengths.get(model, 0) - chunks))
+    else:
+        previous = full_lengths.get(model, eval_count)
+        full_lengths[model] = 0.8 * previous + 0.2 * eval_count
+
+    if final is not None:
+        stats = stats_from_response(model, final)
+    else:
+        now = time.monotonic()
+        first_at = first_at or now
+        stats = GenerationStats(
+            model=model,
+            eval_count=chunks,
+            prompt_eval_duration=first_at - started,
+            eval_duration=now - first_at,
+            total_duration=now - started,
+            estimated=True,
+        )
+    record_generation(stats)
+
+    log.info("Response: %d chars, %d tokens%s", len(block.text), chunks,
+             f" (stopped at code fence, ~{tokens_saved} tokens saved)" if stopped_early else "")
+    return CodeGeneration(
+        text=block.text,
+        code=block.code if block.code is not None else extract_code(block.text),
+        tokens_generated=eval_count or chunks,
+        tokens_saved=tokens_saved,
+        stopped_early=stopped_early,
+        stats=stats,
+    )
+
+
 class OllamaClient:
 
-    def __init__(self, host: str, timeout: int = 300) -> None:
+    def __init__(self, host: str, timeout: int = 300, cache: Optional[ResponseCache] = None) -> None:
         self._client = Client(host=host, timeout=timeout)
+        self.cache = cache
+        # Running average of full response length per model, to estimate tokens saved by early stop
+        self._full_lengths: dict[str, float] = {}
 
+    @traced("ollama.generate", "model")
     def generate(
         self,
         model: str,
         prompt: str,
         system: str = "",
         temperature: float = 0.2,
+        options: Optional[dict] = None,
+        format: Optional[Union[str, dict]] = None,
     ) -> str:
+        """Single chat turn; `format` ("json" or a JSON schema) constrains the output."""
         
         messages: list[dict[str, str]] = []
         if system:
             messages.append({"role": "system", "content": system})
         messages.append({"role": "user", "content": prompt})
 
+        key = None
+        if self.cache:
+            key = ResponseCache.key(
+                model, system, prompt, temperature, {**(options or {}), "format": format} if format else options,
+            )
+            cached = self.cache.get(key)
+            if cached is not None:
+                log.info("Cache hit for model=%s (%d chars)", model, len(cached))
+                annotate(cached=True)
+                record_generation(GenerationStats(model=model, cached=True))
+                return cached
+
         log.info("Calling model=%s (prompt length=%d chars)", model, len(prompt))
         response = self._client.chat(
             model=model,
             messages=messages,
-            options={"temperature": temperature},
+            options={**(options or {}), "temperature": temperature},
+            format=format,
         )
         text = response.message.content
         log.info("Response: %d chars", len(text))
+        record_generation(stats_from_response(model, response))
+
+        if key:
+            self.cache.put(key, model, text)
         return text
 
+    def generate_code(
+        self,
+        model: str,
+        prompt: str,
+        system: str = "",
+        temperature: float = 0.2,
+        options: Optional[dict] = None,
+    ) -> CodeGeneration:
+        """Stream the response and stop as soon as the first code block is closed.
+
+        Only the first block is used by extract_code, so whatever the model
+        writes after it is wasted decode time.
+        """
+        messages: list[dict[str, str]] = []
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.append({"role": "user", "content": prompt})
+        return self.chat_code(model, messages, temperature, options)
+
+    @traced("ollama.generate_code", "model")
+    def chat_code(
+        self,
+        model: str,
+        messages: list[dict[str, str]],
+        temperature: float = 0.2,
+        options: Optional[dict] = None,
+        keep_alive: Optional[str] = None,
+    ) -> CodeGeneration:
+        """generate_code for a whole conversation; `keep_alive` keeps the model (and its KV cache) loaded."""
+        key = None
+        if self.cache:
+            key = code_cache_key(model, messages, temperature, options)
+            cached = self.cache.get(key)
+            if cached is not None:
+                log.info("Cache hit for model=%s (%d chars)", model, len(cached))
+                annotate(cached=True)
+                record_generation(GenerationStats(model=model, cached=True))
+                # The cache keeps only the text; if it ends at the first block, assume the stream was cut there
+                return CodeGeneration(
+                    text=cached, code=extract_code(cached), stopped_early=ends_at_first_block(cached), cached=True,
+                )
+
+        log.info("Streaming model=%s (%d messages, %d chars)", model, len(messages),
+                 sum(len(m["content"]) for m in messages))
+        started = time.monotonic()
+        stream = self._client.chat(
+            model=model,
+            messages=messages,
+            options={**(options or {}), "temperature": temperature},
+            stream=True,
+            keep_alive=keep_alive,
+        )
+        block = CodeBlockStream()
+        chunks = 0
+        first_at = final = None
+        try:
+            for chunk in stream:
+                chunks += 1
+                first_at = first_at or time.monotonic()
+                if chunk.done:
+                    final = chunk
+                if block.feed(chunk.message.content or ""):
+                    break
+        finally:
+            # Closing the stream drops the connection, which makes Ollama stop decoding
+            stream.close()
+
+        result = code_generation_from_stream(
+            self._full_lengths, model, block, chunks, final, started, first_at,
+        )
+        if key:
+            self.cache.put(key, model, result.text)
+        return result
+
     def list_models(self) -> list[str]:
         response = self._client.list()
         return [m.model for m in response.models]
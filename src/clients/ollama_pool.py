@@ -0,0 +1,187 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Optional, TypeVar, Union
+
+import httpx
+
+from src.clients.async_ollama_client import AsyncOllamaClient
+from src.clients.model_scheduler import KeepAlive
+from src.clients.response_cache import ResponseCache
+from src.models.generation import CodeGeneration
+from src.utils.tracing import span
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Errors that mean the host is unreachable, as opposed to a bad request
+_HOST_ERRORS = (httpx.TransportError, ConnectionError, asyncio.TimeoutError)
+
+
+def parse_hosts(spec: str) -> dict[str, Optional[list[str]]]:
+    """Parse "http://gpu1:11434, http://gpu2:11434=qwen2.5-coder:14b|gemma2:9b".
+
+    A host without "=models" serves every model.
+    """
+    hosts: dict[str, Optional[list[str]]] = {}
+    for item in spec.replace(",", " ").split():
+        url, _, models = item.partition("=")
+        hosts[url] = models.split("|") if models else None
+    return hosts
+
+
+class _Host:
+
+    def __init__(self, url: str, models: Optional[list[str]], client: AsyncOllamaClient) -> None:
+        self.url = url
+        self.models = set(models) if models else None
+        self.client = client
+        self.healthy = True
+        self.resident: set[str] = set()
+        self.in_flight = 0
+        self.requests = 0
+        self.failures = 0
+
+    def serves(self, model: str) -> bool:
+        return self.models is None or model in self.models
+
+
+class OllamaPool:
+    """AsyncOllamaClient over several Ollama hosts.
+
+    Each call goes to the healthy host serving the model with the fewest
+    requests in flight. A host that doesn't have the model loaded counts as
+    `load_penalty` extra requests, so a warm host wins ties. A background
+    task checks every host's /api/ps. It marks hosts up or down and refreshes
+    which models they hold. A call that fails because its host is
+    unreachable marks the host down and is retried on the next best one.
+    """
+
+    def __init__(
+        self,
+        hosts: dict[str, Optional[list[str]]],
+        timeout: int = 300,
+        max_concurrency: int = 2,
+        cache: Optional[ResponseCache] = None,
+        group_models: bool = False,
+        keep_alive: KeepAlive = "10m",
+        health_interval: float = 15.0,
+        load_penalty: int = 2,
+    ) -> None:
+        if not hosts:
+            raise ValueError("OllamaPool needs at least one host")
+        self.cache = cache
+        self.health_interval = health_interval
+        self.load_penalty = load_penalty
+        self._hosts = [
+            _Host(url, models, AsyncOllamaClient(
+                host=url,
+                timeout=timeout,
+                max_concurrency=max_concurrency,
+                cache=cache,
+                group_models=group_models,
+                keep_alive=keep_alive,
+            ))
+            for url, models in hosts.items()
+        ]
+        self._health_task: Optional[asyncio.Task] = None
+
+    async def generate(self, model: str, prompt: str, system: str = "", temperature: float = 0.2,
+                       options: Optional[dict] = None, format: Optional[Union[str, dict]] = None) -> str:
+        return await self._route(model, lambda c: c.generate(model, prompt, system, temperature, options, format))
+
+    async def generate_code(self, model: str, prompt: str, system: str = "", temperature: float = 0.2,
+                            options: Optional[dict] = None) -> CodeGeneration:
+        return await self._route(model, lambda c: c.generate_code(model, prompt, system, temperature, options))
+
+    async def chat_code(self, model: str, messages: list[dict[str, str]], temperature: float = 0.2,
+                        options: Optional[dict] = None, keep_alive: Optional[str] = None) -> CodeGeneration:
+        return await self._route(model, lambda c: c.chat_code(model, messages, temperature, options, keep_alive))
+
+    async def list_models(self) -> list[str]:
+        models: set[str] = set()
+        for host in self._hosts:
+            if host.healthy:
+                models.update(m for m in await host.client.list_models() if host.serves(m))
+        return sorted(models)
+
+    async def loaded_models(self) -> set[str]:
+        await self.check_health()
+        return set().union(*(h.resident for h in self._hosts if h.healthy))
+
+    async def ping(self, model: str = "tinyllama") -> bool:
+        return any(await asyncio.gather(*(h.client.ping(model) for h in self._hosts if h.serves(model))))
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        return {
+            h.url: {
+                "healthy": h.healthy,
+                "requests": h.requests,
+                "failures": h.failures,
+                "switches": h.client.scheduler.switches if h.client.scheduler else None,
+            }
+            for h in self._hosts
+        }
+
+    async def check_health(self) -> None:
+        async def check(host: _Host) -> None:
+            try:
+                host.resident = await asyncio.wait_for(host.client.loaded_models(), timeout=10)
+            except Exception as e:
+                if host.healthy:
+                    log.warning("Ollama host %s is down: %s", host.url, e)
+                host.healthy = False
+                return
+            if not host.healthy:
+                log.info("Ollama host %s is back", host.url)
+            host.healthy = True
+
+        await asyncio.gather(*(check(h) for h in self._hosts))
+
+    async def aclose(self) -> None:
+        if self._health_task:
+            self._health_task.cancel()
+            self._health_task = None
+
+    async def _health_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_interval)
+            await self.check_health()
+
+    def _pick(self, model: str, exclude: set[str]) -> Optional[_Host]:
+        candidates = [h for h in self._hosts if h.serves(model) and h.url not in exclude]
+        healthy = [h for h in candidates if h.healthy]
+        # With every host marked down, still try one: the health check may just be stale
+        pool = healthy or candidates
+        if not pool:
+            return None
+        return min(pool, key=lambda h: h.in_flight + (0 if model in h.resident else self.load_penalty))
+
+    async def _route(self, model: str, call: Callable[[AsyncOllamaClient], Awaitable[T]]) -> T:
+        if self._health_task is None or self._health_task.done():
+            self._health_task = asyncio.create_task(self._health_loop())
+
+        tried: set[str] = set()
+        while True:
+            host = self._pick(model, tried)
+            if host is None and tried:
+                raise ConnectionError(f"All Ollama hosts serving {model} failed: {sorted(tried)}")
+            if host is None:
+                raise ValueError(f"No Ollama host serves {model}")
+
+            tried.add(host.url)
+            host.in_flight += 1
+            host.requests += 1
+            try:
+                with span("ollama.host", host=host.url):
+                    result = await call(host.client)
+            except _HOST_ERRORS as e:
+                host.healthy = False
+                host.failures += 1
+                log.warning("Ollama host %s failed (%s), trying another host", host.url, e)
+                continue
+            finally:
+                host.in_flight -= 1
+
+            host.resident.add(model)
+            return result
@@ -0,0 +1,57 @@
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from src.clients.leetcode_client import LeetCodeClient
+from src.models.problem import Problem
+from src.utils.tracing import traced
+
+log = logging.getLogger(__name__)
+
+
+class ProblemPrefetcher:
+    """Loads problem details in the background, `ahead` slugs in front of the reader.
+
+    get(slug) blocks only if that slug's batch hasn't arrived yet, and queues
+    the batches that cover the next `ahead` slugs. Batches go through
+    LeetCodeClient.fetch_problems, so each one is a single GraphQL request.
+    """
+
+    def __init__(self, client: LeetCodeClient, slugs: list[str], ahead: int = 5) -> None:
+        self._client = client
+        self._slugs = list(dict.fromkeys(slugs))
+        self._index = {slug: i for i, slug in enumerate(self._slugs)}
+        self._ahead = max(1, ahead)
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+        self._lock = threading.Lock()
+        self._batches: dict[str, Future] = {}
+        self._scheduled = 0
+
+        self._schedule_through(0)
+
+    @traced("prefetch.get", "slug")
+    def get(self, slug: str) -> Problem:
+        if slug not in self._index:
+            return self._client.fetch_problem(slug)
+
+        self._schedule_through(self._index[slug])
+        problems = self._batches[slug].result()
+        if slug not in problems:
+            raise LookupError(f"problem {slug} could not be fetched")
+        return problems[slug]
+
+    def _schedule_through(self, index: int) -> None:
+        # Make sure everything up to index + ahead has a batch queued
+        with self._lock:
+            target = min(index + 1 + self._ahead, len(self._slugs))
+            while self._scheduled < target:
+                batch = self._slugs[self._scheduled:self._scheduled + self._ahead]
+                future = self._executor.submit(self._client.fetch_problems, batch)
+                for slug in batch:
+                    self._batches[slug] = future
+                self._scheduled += len(batch)
+                log.info("Prefetching %d problems (%d / %d queued)", len(batch), self._scheduled, len(self._slugs))
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,90 @@
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from pydantic import ValidationError
+
+from src.models.problem import Problem
+
+log = logging.getLogger(__name__)
+
+# Bump when the Problem model changes, so old rows get refetched
+SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS problems (
+    slug TEXT PRIMARY KEY,
+    id TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_problems_id ON problems(id);
+"""
+
+
+class ProblemStore:
+    """Local SQLite copy of fetched problems, indexed by slug and id.
+
+    A row counts as fresh if it was written with the current SCHEMA_VERSION
+    and is younger than `ttl_seconds` (None = never expires). Stale rows are
+    still returned by get(..., allow_stale=True) as a fallback when the API fails.
+    """
+
+    def __init__(self, path: Path, ttl_seconds: Optional[float] = None) -> None:
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+
+    def get(self, slug: str, allow_stale: bool = False) -> Optional[Problem]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT version, fetched_at, data FROM problems WHERE slug = ?", (slug,),
+            ).fetchone()
+        return self._load(row, allow_stale)
+
+    def get_by_id(self, problem_id: str, allow_stale: bool = False) -> Optional[Problem]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT version, fetched_at, data FROM problems WHERE id = ?", (problem_id,),
+            ).fetchone()
+        return self._load(row, allow_stale)
+
+    def put(self, problem: Problem) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO problems (slug, id, version, fetched_at, data) VALUES (?, ?, ?, ?, ?)",
+                (problem.slug, problem.id, SCHEMA_VERSION, time.time(), problem.model_dump_json()),
+            )
+            self._db.commit()
+
+    def _is_fresh(self, version: int, fetched_at: float) -> bool:
+        if version != SCHEMA_VERSION:
+            return False
+        return self.ttl_seconds is None or time.time() - fetched_at < self.ttl_seconds
+
+    def _load(self, row: Optional[tuple], allow_stale: bool) -> Optional[Problem]:
+        if row is None:
+            return None
+        version, fetched_at, data = row
+        if not allow_stale and not self._is_fresh(version, fetched_at):
+            return None
+        try:
+            return Problem.model_validate_json(data)
+        except ValidationError:
+            log.warning("Stored problem does not match the current model, ignoring it")
+            return None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM problems").fetchone()[0]
+
+    def close(self) -> None:
+        self._db.close()
@@ -0,0 +1,106 @@
+import ast
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from src.models.result import SubmissionResult
+
+log = logging.getLogger(__name__)
+
+# Verdicts that can differ between two runs of the same code are not cached
+_UNSTABLE_STATUSES = {"Time Limit Exceeded", "Internal Error"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS submissions (
+    slug TEXT NOT NULL,
+    lang TEXT NOT NULL,
+    code_hash TEXT NOT NULL,
+    result TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (slug, lang, code_hash)
+);
+"""
+
+
+def _strip_docstrings(tree: ast.AST) -> ast.AST:
+    for node in ast.walk(tree):
+        body = getattr(node, "body", None)
+        if (
+            isinstance(body, list) and body
+            and isinstance(body[0], ast.Expr)
+            and isinstance(body[0].value, ast.Constant)
+            and isinstance(body[0].value.value, str)
+        ):
+            node.body = body[1:] or [ast.Pass()]
+    return tree
+
+
+def normalized_code_hash(code: str) -> str:
+    """Hash of the code's AST, so comments, formatting and docstrings don't matter.
+
+    Code that doesn't parse is hashed on its whitespace-normalized text.
+    """
+    try:
+        normalized = ast.dump(_strip_docstrings(ast.parse(code)))
+    except SyntaxError:
+        normalized = "\n".join(line.rstrip() for line in code.strip().splitlines())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class SubmissionCache:
+    """Persistent (slug, lang, normalized code) -> SubmissionResult map.
+
+    A repeat of an already judged solution is answered locally instead of
+    costing another submission.
+    """
+
+    def __init__(self, path: Path, enabled: bool = True) -> None:
+        self.path = Path(path)
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if enabled:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.executescript(_SCHEMA)
+
+    def get(self, slug: str, lang: str, code: str) -> Optional[SubmissionResult]:
+        if self._db is None:
+            return None
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT result FROM submissions WHERE slug = ? AND lang = ? AND code_hash = ?",
+                (slug, lang, normalized_code_hash(code)),
+            ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return SubmissionResult.model_validate_json(row[0])
+
+    def put(self, lang: str, code: str, result: SubmissionResult) -> None:
+        if self._db is None or result.status in _UNSTABLE_STATUSES or result.status.startswith("Unknown"):
+            return
+
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO submissions (slug, lang, code_hash, result, created_at) VALUES (?, ?, ?, ?, ?)",
+                (result.slug, lang, normalized_code_hash(code), result.model_dump_json(), time.time()),
+            )
+            self._db.commit()
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,46 @@
+from src.models.result import SubmissionResult
+
+# Fields requested from LeetCode's submissionDetails API
+SUBMISSION_DETAILS_FIELDS = """
+        statusCode
+        runtimePercentile
+        memoryPercentile
+        totalCorrect
+        totalTestcases
+        compileError
+        runtimeError
+        lastTestcase
+        codeOutput
+        expectedOutput
+"""
+
+# These are the status codes returned by LeetCode's submissionDetails API ( it's in a docs)
+STATUS_CODES = {
+    10: "Accepted",
+    11: "Wrong Answer",
+    12: "Memory Limit Exceeded",
+    13: "Output Limit Exceeded",
+    14: "Time Limit Exceeded",
+    15: "Runtime Error",
+    16: "Internal Error",
+    20: "Compile Error",
+}
+
+
+def to_submission_result(slug: str, submission_id: int, details: dict) -> SubmissionResult:
+    status_code = details["statusCode"]
+    return SubmissionResult(
+        slug=slug,
+        submission_id=submission_id,
+        accepted=status_code == 10,
+        status=STATUS_CODES.get(status_code, f"Unknown ({status_code})"),
+        total_correct=details["totalCorrect"],
+        total_testcases=details["totalTestcases"],
+        runtime_percentile=details["runtimePercentile"],
+        memory_percentile=details["memoryPercentile"],
+        compile_error=details["compileError"],
+        runtime_error=details["runtimeError"],
+        last_testcase=details["lastTestcase"],
+        code_output=details["codeOutput"],
+        expected_output=details["expectedOutput"],
+    )
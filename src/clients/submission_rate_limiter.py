@@ -0,0 +1,91 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Optional
+
+log = logging.getLogger(__name__)
+
+
+class SubmissionRateLimiter:
+    """Token bucket shared by every thread that submits to LeetCode.
+
+    The rate is learned AIMD-style: each 403/429 halves it and remembers
+    the rate that triggered the throttle. Successes add a little back, but
+    stay just under that ceiling until enough successes in a row suggest
+    the limit has moved. Waiters are served lowest `priority` first (FIFO
+    within a priority), so a pipeline deep in a fix loop isn't starved by
+    fresh submissions.
+    """
+
+    def __init__(
+        self,
+        rate: float = 0.2,
+        burst: int = 2,
+        min_rate: float = 0.01,
+        max_rate: float = 2.0,
+        increase: float = 0.01,
+        probe_after: int = 20,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.probe_after = probe_after
+
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+        self._ceiling: Optional[float] = None
+        self._successes = 0
+
+        self._cond = threading.Condition()
+        self._waiters: list[tuple[int, int]] = []
+        self._seq = itertools.count()
+
+    def acquire(self, priority: int = 0) -> None:
+        ticket = (priority, next(self._seq))
+        with self._cond:
+            heapq.heappush(self._waiters, ticket)
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if self._waiters[0] == ticket and self._tokens >= 1 and now >= self._blocked_until:
+                    heapq.heappop(self._waiters)
+                    self._tokens -= 1
+                    self._cond.notify_all()
+                    return
+                self._cond.wait(timeout=self._time_to_next_token(now))
+
+    def on_success(self) -> None:
+        with self._cond:
+            self._successes += 1
+            new_rate = self.rate + self.increase
+            if self._ceiling is not None:
+                if self._successes >= self.probe_after:
+                    # Long quiet stretch — allow probing above the old limit
+                    self._ceiling = None
+                else:
+                    new_rate = min(new_rate, 0.9 * self._ceiling)
+            self.rate = max(self.rate, min(new_rate, self.max_rate))
+
+    def on_throttled(self, retry_after: Optional[float] = None) -> None:
+        with self._cond:
+            self._ceiling = self.rate
+            self._successes = 0
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = 0.0
+            wait = retry_after if retry_after is not None else 1 / self.rate
+            self._blocked_until = time.monotonic() + wait
+            log.warning("Throttled by leetcode — rate now %.3f/s, pausing %.0fs", self.rate, wait)
+            self._cond.notify_all()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def _time_to_next_token(self, now: float) -> float:
+        missing = max(0.0, 1 - self._tokens) / self.rate
+        return max(missing, self._blocked_until - now, 0.05)
@@ -0,0 +1,11 @@
+from src.evaluation.checkpoint import Checkpoint
+from src.evaluation.local_judge import LocalJudge, local_failure, parse_examples
+from src.evaluation.mock_servers import Latency, MockLeetCode, MockOllama
+from src.evaluation.results_store import ResultsStore
+from src.evaluation.static_check import check_solution, static_failure, undefined_names
+from src.evaluation.scheduler import BoundedSubmitter, JobScheduler
+
+__all__ = [
+    "BoundedSubmitter", "Checkpoint", "JobScheduler", "Latency", "LocalJudge", "MockLeetCode", "MockOllama",
+    "ResultsStore", "check_solution", "local_failure", "parse_examples", "static_failure", "undefined_names",
+]
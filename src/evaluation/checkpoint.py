@@ -0,0 +1,92 @@
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+log = logging.getLogger(__name__)
+
+
+class Checkpoint:
+    """Append-only JSONL log of finished records, so an interrupted run can resume.
+
+    The first line holds the run settings. Each later line is
+    {"key": [...], "done": bool, "record": {...}}. A later line for the same
+    key replaces an earlier one. Records with done=False (e.g. a tunnel error)
+    are kept for the report but run again on resume. A torn last line from a
+    crash mid-write is ignored.
+    """
+
+    def __init__(self, path: Path, settings: dict, resume: bool = False) -> None:
+        self.path = Path(path)
+        self.settings = json.loads(json.dumps(settings))
+        self.records: dict[tuple, dict] = {}
+        self._done: set[tuple] = set()
+        self._lock = threading.Lock()
+
+        if resume:
+            self._load()
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "x", encoding="utf-8") as f:
+                f.write(json.dumps({"settings": self.settings}) + "\n")
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def _load(self) -> None:
+        with open(self.path, encoding="utf-8") as f:
+            text = f.read()
+        lines = text.splitlines()
+
+        header = json.loads(lines[0]) if lines else {}
+        if header.get("settings") != self.settings:
+            raise ValueError(
+                f"Checkpoint {self.path} was written with different settings: {header.get('settings')}"
+            )
+
+        for n, line in enumerate(lines[1:], start=2):
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                log.warning("Ignoring unreadable line %d in %s", n, self.path)
+                continue
+            key = tuple(row["key"])
+            self.records[key] = row["record"]
+            if row["done"]:
+                self._done.add(key)
+            else:
+                self._done.discard(key)
+
+        if not text.endswith("\n"):
+            # Terminate a torn last line so the next record starts on its own line
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("\n")
+
+        log.info("Resuming from %s: %d records, %d done", self.path, len(self.records), len(self._done))
+
+    def is_done(self, *key: str) -> bool:
+        return key in self._done
+
+    def get(self, *key: str) -> Optional[dict]:
+        return self.records.get(key)
+
+    def append(self, key: tuple, record: dict, done: bool = True) -> None:
+        line = json.dumps({"key": list(key), "done": done, "record": record}, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.records[key] = record
+            if done:
+                self._done.add(key)
+            else:
+                self._done.discard(key)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "Checkpoint":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
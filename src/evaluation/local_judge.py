@@ -0,0 +1,306 @@
+"""Local pre-judge: runs a solution on the examples from the problem description.
+
+Only catches the obvious failures (wrong answer on an example, crashes,
+syntax errors) — it is a cheap filter before a real LeetCode submission,
+not a replacement for it.
+"""
+
+import ast
+import html
+import json
+import logging
+import math
+import re
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from src.evaluation.static_check import static_failure, undefined_names
+from src.models.problem import Problem
+from src.models.result import LocalJudgeResult
+from src.utils.tracing import annotate, traced
+
+log = logging.getLogger(__name__)
+
+_TAG = re.compile(r"<[^>]+>")
+_EXAMPLE = re.compile(r"Input:\s*(.+?)\s*Output:\s*([^\n]+)", re.DOTALL)
+_METHOD = re.compile(r"def (\w+)\(self,?\s*([^)]*)\)\s*(?:->\s*([^:]+))?:")
+_ARG_NAME = re.compile(r"^\s*([A-Za-z_]\w*)\s*=\s*(.*)$", re.DOTALL)
+
+# Descriptions that allow more than one correct output: a mismatch with the example proves nothing
+_MULTIPLE_ANSWERS = re.compile(
+    r"return any (?:of them|one of them|valid|such|possible|solution|answer)"
+    r"|any (?:valid|possible|correct) (?:answer|solution|result|output)"
+    r"|(?:multiple|several|many|more than one) (?:valid |possible |correct )?(?:answers|solutions)",
+    re.IGNORECASE,
+)
+
+# Types that need conversion between LeetCode's list notation and objects
+_UNSUPPORTED_TYPES = ("ListNode", "TreeNode", "Node")
+
+# Runs inside the subprocess; limits are applied before the untrusted code is exec'd
+_RUNNER = r"""
+import json, sys, traceback
+data = json.load(sys.stdin)
+try:
+    import resource
+    resource.setrlimit(resource.RLIMIT_CPU, (data["cpu_seconds"], data["cpu_seconds"] + 1))
+    resource.setrlimit(resource.RLIMIT_AS, (data["memory_bytes"], data["memory_bytes"]))
+except (ImportError, ValueError, OSError):
+    pass
+
+def emit(obj):
+    sys.stdout.write(json.dumps(obj, default=repr))
+    sys.exit(0)
+
+ns = {}
+prelude = (
+    "from typing import *\n"
+    "import collections, heapq, math, bisect, itertools, functools, string, re, sys, random, copy, operator\n"
+    "from collections import *\n"
+    "from heapq import *\n"
+    "from bisect import *\n"
+    "from math import ceil, comb, floor, gcd, inf, isqrt, lcm, log2, perm, sqrt\n"
+    "from functools import *\n"
+    "from itertools import *\n"
+    "from copy import deepcopy\n"
+)
+exec(prelude, ns)
+try:
+    exec("from sortedcontainers import SortedList, SortedDict, SortedSet", ns)
+except ImportError:
+    pass
+try:
+    exec(compile(data["code"], "solution.py", "exec"), ns)
+except SyntaxError as e:
+    emit({"status": "Compile Error", "error": traceback.format_exception_only(type(e), e)[-1].strip()})
+except MemoryError:
+    emit({"status": "Memory Limit Exceeded"})
+except Exception as e:
+    emit({"status": "Runtime Error", "error": traceback.format_exception_only(type(e), e)[-1].strip()})
+
+outputs = []
+for case in data["cases"]:
+    try:
+        got = getattr(ns["Solution"](), data["method"])(**case)
+    except MemoryError:
+        emit({"status": "Memory Limit Exceeded", "outputs": outputs})
+    except Exception as e:
+        emit({"status": "Runtime Error", "outputs": outputs,
+              "error": traceback.format_exception_only(type(e), e)[-1].strip()})
+    outputs.append(got)
+emit({"status": "ok", "outputs": outputs})
+"""
+
+
+@dataclass
+class Example:
+    raw_input: str
+    args: dict[str, Any]
+    expected: Any
+
+
+def _strip_html(description: str) -> str:
+    text = html.unescape(_TAG.sub("", description))
+    return text.replace("\xa0", " ")
+
+
+def _split_top_level(text: str) -> list[str]:
+    # Split on commas that are not inside brackets or string literals
+    parts, depth, quote, start = [], 0, None, 0
+    for i, ch in enumerate(text):
+        if quote:
+            if ch == quote and text[i - 1] != "\\":
+                quote = None
+        elif ch in "\"'":
+            quote = ch
+        elif ch in "[{(":
+            depth += 1
+        elif ch in "]})":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return parts
+
+
+def _parse_value(text: str) -> Any:
+    text = text.strip()
+    try:
+        return json.loads(text)
+    except ValueError:
+        return ast.literal_eval(text)
+
+
+def parse_examples(description: str) -> list[Example]:
+    """Pull `Input: a = ..., b = ...` / `Output: ...` pairs out of the HTML description.
+
+    Examples that can't be parsed are skipped.
+    """
+    examples: list[Example] = []
+    for raw_input, raw_output in _EXAMPLE.findall(_strip_html(description)):
+        args: dict[str, Any] = {}
+        try:
+            for part in _split_top_level(raw_input):
+                match = _ARG_NAME.match(part)
+                if not match:
+                    raise ValueError(f"not an assignment: {part!r}")
+                args[match.group(1)] = _parse_value(match.group(2))
+            expected = _parse_value(raw_output)
+        except (ValueError, SyntaxError) as e:
+            log.debug("Skipping example %r: %s", raw_input, e)
+            continue
+        examples.append(Example(raw_input=" ".join(raw_input.split()), args=args, expected=expected))
+    return examples
+
+
+def _matches(got: Any, expected: Any, any_order: bool = False) -> bool:
+    if isinstance(got, tuple):
+        got = list(got)
+    if isinstance(expected, float) or isinstance(got, float):
+        try:
+            return math.isclose(got, expected, rel_tol=1e-5, abs_tol=1e-5)
+        except TypeError:
+            return False
+    if isinstance(got, list) and isinstance(expected, list):
+        if len(got) != len(expected):
+            return False
+        if any_order:
+            got = sorted(got, key=lambda x: json.dumps(x, default=repr))
+            expected = sorted(expected, key=lambda x: json.dumps(x, default=repr))
+        return all(_matches(g, e) for g, e in zip(got, expected))
+    return got == expected
+
+
+class LocalJudge:
+    """Runs solutions on description examples in sandboxed subprocesses.
+
+    Each judge() call gets a fresh interpreter with CPU-time and address-space
+    limits; up to `max_workers` of them run at once.
+    """
+
+    def __init__(self, max_workers: int = 4, cpu_seconds: int = 2, memory_mb: int = 512) -> None:
+        self.cpu_seconds = cpu_seconds
+        self.memory_mb = memory_mb
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="local-judge")
+
+    @traced("local_judge")
+    def judge(self, problem: Problem, code: str) -> LocalJudgeResult:
+        result = self._pool.submit(self._judge, problem, code).result()
+        annotate(status=result.status)
+        return result
+
+    def _judge(self, problem: Problem, code: str) -> LocalJudgeResult:
+        match = _METHOD.search(problem.code_stub)
+        if not match or "class Solution" not in problem.code_stub:
+            return LocalJudgeResult(status="Skipped", error="no Solution method in stub")
+        method, params, returns = match.group(1), match.group(2), (match.group(3) or "").strip()
+
+        if any(t in problem.code_stub for t in _UNSUPPORTED_TYPES) or returns == "None":
+            return LocalJudgeResult(status="Skipped", error="unsupported signature")
+
+        names = [p.split(":")[0].strip() for p in params.split(",") if p.strip()]
+        examples = [e for e in parse_examples(problem.description) if list(e.args) == names]
+        if not examples:
+            return LocalJudgeResult(status="Skipped", error="no usable examples")
+
+        payload = {
+            "code": code,
+            "method": method,
+            "cases": [e.args for e in examples],
+            "cpu_seconds": self.cpu_seconds,
+            "memory_bytes": self.memory_mb * 1024 * 1024,
+        }
+        try:
+            proc = subprocess.run(
+                [sys.executable, "-I", "-c", _RUNNER],
+                input=json.dumps(payload),
+                capture_output=True,
+                text=True,
+                timeout=self.cpu_seconds * 3 + 2,
+            )
+        except subprocess.TimeoutExpired:
+            return LocalJudgeResult(status="Time Limit Exceeded", total=len(examples))
+
+        if proc.returncode != 0 or not proc.stdout:
+            # Killed by RLIMIT_CPU (SIGXCPU / SIGKILL) or crashed hard
+            status = "Time Limit Exceeded" if proc.returncode < 0 else "Runtime Error"
+            return LocalJudgeResult(status=status, total=len(examples), error=proc.stderr[-500:] or None)
+
+        report = json.loads(proc.stdout)
+        outputs = report.get("outputs", [])
+        any_order = "any order" in problem.description.lower()
+        multiple_answers = _MULTIPLE_ANSWERS.search(problem.description) is not None
+        mismatched = False
+
+        for i, (example, got) in enumerate(zip(examples, outputs)):
+            if not _matches(got, example.expected, any_order):
+                if multiple_answers:
+                    # Another valid answer than the example's; only crashes can still fail the code
+                    mismatched = True
+                    continue
+                log.info("Local judge: wrong answer on example %d of %s", i + 1, problem.slug)
+                return LocalJudgeResult(
+                    status="Wrong Answer",
+                    passed=i,
+                    total=len(examples),
+                    last_testcase=example.raw_input,
+                    code_output=json.dumps(got, default=repr),
+                    expected_output=json.dumps(example.expected),
+                )
+
+        if report["status"] != "ok":
+            # "outputs" is only present when a specific example failed
+            failed = examples[len(outputs)] if "outputs" in report and len(outputs) < len(examples) else None
+            return LocalJudgeResult(
+                status=report["status"],
+                passed=len(outputs),
+                total=len(examples),
+                error=report.get("error"),
+                last_testcase=failed.raw_input if failed else None,
+            )
+
+        if mismatched:
+            return LocalJudgeResult(status="Skipped", total=len(examples),
+                                    error="several valid answers; output differs from the example")
+        return LocalJudgeResult(status="Accepted", passed=len(examples), total=len(examples))
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False)
+
+
+def is_local_failure(result: LocalJudgeResult) -> bool:
+    return result.status not in ("Accepted", "Skipped")
+
+
+def describe_failure(result: LocalJudgeResult) -> str:
+    """Error text for writer_error_prompt, shaped like LeetCode's feedback."""
+    lines = []
+    if result.error:
+        lines.append(result.error)
+    if result.last_testcase:
+        lines.append(f"Input: {result.last_testcase}")
+    if result.code_output is not None:
+        lines.append(f"Output: {result.code_output}")
+    if result.expected_output is not None:
+        lines.append(f"Expected: {result.expected_output}")
+    return "\n".join(lines)
+
+
+def local_failure(judge: Optional[LocalJudge], problem: Problem, code: str) -> Optional[tuple[str, str]]:
+    """(error_type, error_msg) if the static checks or the local judge reject the code, otherwise None."""
+    failure = static_failure(problem, code)
+    if failure is not None:
+        log.info("Static check failed for %s: %s", problem.slug, failure[1].splitlines()[0])
+        return failure
+    for warning in undefined_names(problem, code):
+        log.info("Static check warning for %s: %s", problem.slug, warning)
+    if judge is None:
+        return None
+    result = judge.judge(problem, code)
+    if not is_local_failure(result):
+        return None
+    return result.status, describe_failure(result)
@@ -0,0 +1,471 @@
+"""Local stand-ins for the Ollama and LeetCode HTTP APIs, for offline benchmarks.
+
+Both servers speak just enough of the real protocols for the clients in
+src/clients to work unchanged against them:
+
+- MockOllama serves /api/chat (streamed and not), /api/tags and /api/ps.
+  It simulates model loads, with `max_loaded` models resident at once and
+  keep_alive=0 evicting, time to first token and a token rate.
+- MockLeetCode serves the csrftoken cookie, the question and
+  submissionDetails GraphQL queries (plain or aliased batches) and
+  /problems/<slug>/submit/. It judges with a scripted verdict after a
+  sampled judge latency and can throttle with 429s.
+
+Latencies are drawn from `Latency` distributions and all randomness comes
+from a seeded RNG, so runs are comparable.
+"""
+
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Optional
+
+from src.evaluation.static_check import check_solution
+from src.models.problem import Problem
+
+log = logging.getLogger(__name__)
+
+_NS = 1_000_000_000
+_STUB_SIGNATURE = re.compile(r"def \w+\(self[^)]*\)[^:\n]*:")
+_ALIASED = re.compile(r"(\w+):\s*(question|submissionDetails)\((?:titleSlug|submissionId):\s*\$(\w+)\)")
+_PLAIN = re.compile(r"(?<![\w:])\s(question|submissionDetails)\((?:titleSlug|submissionId):\s*\$(\w+)\)")
+
+DEFAULT_VERDICTS = {"Accepted": 0.6, "Wrong Answer": 0.25, "Runtime Error": 0.1, "Time Limit Exceeded": 0.05}
+_STATUS_CODES = {
+    "Accepted": 10, "Wrong Answer": 11, "Memory Limit Exceeded": 12, "Output Limit Exceeded": 13,
+    "Time Limit Exceeded": 14, "Runtime Error": 15, "Internal Error": 16, "Compile Error": 20,
+}
+
+
+@dataclass
+class Latency:
+    """Seconds drawn from a lognormal around `median`; `spread` is the sigma of its log."""
+
+    median: float = 0.0
+    spread: float = 0.0
+
+    def sample(self, rng: random.Random) -> float:
+        if self.median <= 0:
+            return 0.0
+        return self.median * math.exp(rng.gauss(0.0, self.spread)) if self.spread else self.median
+
+    def scaled(self, factor: float) -> "Latency":
+        return Latency(self.median * factor, self.spread)
+
+    @classmethod
+    def parse(cls, spec: str) -> "Latency":
+        """"2.0" or "2.0:0.5" (median:spread)."""
+        median, _, spread = spec.partition(":")
+        return cls(float(median), float(spread or 0.0))
+
+
+def synthetic_problems(n: int) -> list[Problem]:
+    """`n` small problems with an example and a one-method stub, cycling through difficulties."""
+    difficulties = ("Easy", "Medium", "Hard")
+    return [
+        Problem(
+            id=str(i + 1),
+            title=f"Mock Problem {i + 1}",
+            slug=f"mock-problem-{i + 1}",
+            difficulty=difficulties[i % 3],
+            description=(
+                f"<p>Given an integer array <code>nums</code> and an integer <code>k</code>, return the "
+                f"number of elements of <code>nums</code> greater than <code>k + {i}</code>.</p>\n"
+                f"<p><strong class=\"example\">Example 1:</strong></p>\n<pre>\n"
+                f"<strong>Input:</strong> nums = [{i + 1},{i + 5},{i}], k = 0\n"
+                f"<strong>Output:</strong> 2\n</pre>\n"
+                f"<p><strong>Constraints:</strong></p>\n<ul>\n"
+                f"\t<li><code>1 &lt;= nums.length &lt;= 10<sup>5</sup></code></li>\n</ul>\n"
+            ),
+            code_stub=f"class Solution:\n    def countAbove{i + 1}(self, nums: List[int], k: int) -> int:\n        ",
+        )
+        for i in range(n)
+    ]
+
+
+class _MockServer:
+    """ThreadingHTTPServer on a free local port, served from a daemon thread."""
+
+    def __init__(self, seed: int = 0) -> None:
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self.requests = 0
+
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                mock._count()
+                mock.handle(self, "GET", None)
+
+            def do_POST(self) -> None:
+                mock._count()
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                mock.handle(self, "POST", body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                log.debug("%s %s", type(mock).__name__, format % args)
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "_MockServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name=type(self).__name__, daemon=True)
+        self._thread.start()
+        log.info("%s listening on %s", type(self).__name__, self.url)
+        return self
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "_MockServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def handle(self, request: BaseHTTPRequestHandler, method: str, body: Optional[dict]) -> None:
+        raise NotImplementedError
+
+    def _count(self) -> None:
+        with self._rng_lock:
+            self.requests += 1
+
+    def _random(self) -> float:
+        with self._rng_lock:
+            return self._rng.random()
+
+    def _sample(self, latency: Latency) -> float:
+        with self._rng_lock:
+            return latency.sample(self._rng)
+
+    @staticmethod
+    def _send_json(request: BaseHTTPRequestHandler, payload: Any, status: int = 200,
+                   headers: Optional[dict[str, str]] = None) -> None:
+        data = json.dumps(payload).encode()
+        request.send_response(status)
+        request.send_header("Content-Type", "application/json")
+        request.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            request.send_header(name, value)
+        request.end_headers()
+        request.wfile.write(data)
+
+
+class MockOllama(_MockServer):
+    """Ollama chat API with simulated model loads and token-rate generation.
+
+    Writer prompts get a code block implementing the stub's method; reviewer
+    prompts get ACCEPT with probability `accept_rate`, otherwise REVISE,
+    as free text or as the JSON verdict when a `format` schema is sent.
+    Pass `responder(model, messages, format) -> str` to script replies.
+    """
+
+    def __init__(
+        self,
+        first_token: Latency = Latency(0.3, 0.3),
+        tokens_per_second: float = 40.0,
+        load: Latency = Latency(3.0, 0.2),
+        max_loaded: int = 1,
+        num_parallel: int = 4,
+        accept_rate: float = 0.7,
+        responder: Optional[Callable[[str, list[dict], Any], str]] = None,
+        seed: int = 0,
+    ) -> None:
+        super().__init__(seed)
+        self.first_token = first_token
+        self.tokens_per_second = tokens_per_second
+        self.load = load
+        self.max_loaded = max_loaded
+        self.accept_rate = accept_rate
+        self.responder = responder or self._default_reply
+        self.loads = 0
+
+        self._resident: OrderedDict[str, None] = OrderedDict()
+        self._known: set[str] = set()
+        self._models_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(num_parallel)
+
+    def handle(self, request: BaseHTTPRequestHandler, method: str, body: Optional[dict]) -> None:
+        if request.path == "/api/tags":
+            with self._models_lock:
+                models = sorted(self._known)
+            self._send_json(request, {"models": [{"name": m, "model": m} for m in models]})
+        elif request.path == "/api/ps":
+            with self._models_lock:
+                models = list(self._resident)
+            self._send_json(request, {"models": [{"name": m, "model": m} for m in models]})
+        elif request.path == "/api/chat" and body is not None:
+            self._chat(request, body)
+        else:
+            self._send_json(request, {"error": f"{method} {request.path} not found"}, status=404)
+
+    def _chat(self, request: BaseHTTPRequestHandler, body: dict) -> None:
+        model = body["model"]
+        started = time.monotonic()
+        with self._slots:
+            load_seconds = self._ensure_loaded(model)
+            reply = self.responder(model, body.get("messages", []), body.get("format"))
+            limit = (body.get("options") or {}).get("num_predict")
+            tokens = [reply[i:i + 4] for i in range(0, len(reply), 4)][:limit]
+
+            prompt_chars = sum(len(m.get("content", "")) for m in body.get("messages", []))
+            prompt_seconds = self._sample(self.first_token)
+            time.sleep(prompt_seconds)
+            eval_started = time.monotonic()
+
+            if body.get("stream", True):
+                sent = self._stream(request, model, tokens)
+            else:
+                time.sleep(len(tokens) / self.tokens_per_second)
+                sent = len(tokens)
+            eval_seconds = time.monotonic() - eval_started
+
+        if body.get("keep_alive") in (0, "0", "0s"):
+            with self._models_lock:
+                self._resident.pop(model, None)
+        if sent is None:
+            return  # client hung up mid-stream
+
+        final = {
+            "model": model,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "message": {"role": "assistant", "content": "" if body.get("stream", True) else "".join(tokens)},
+            "done": True,
+            "done_reason": "stop",
+            "total_duration": int((time.monotonic() - started) * _NS),
+            "load_duration": int(load_seconds * _NS),
+            "prompt_eval_count": prompt_chars // 4,
+            "prompt_eval_duration": int(prompt_seconds * _NS),
+            "eval_count": sent,
+            "eval_duration": int(eval_seconds * _NS),
+        }
+        if body.get("stream", True):
+            self._write_line(request, final)
+            self._write_chunk(request, b"")
+        else:
+            self._send_json(request, final)
+
+    def _ensure_loaded(self, model: str) -> float:
+        # One load at a time, like a single GPU; evicts the least recently used model
+        with self._models_lock:
+            self._known.add(model)
+            if model in self._resident:
+                self._resident.move_to_end(model)
+                return 0.0
+            seconds = self._sample(self.load)
+            time.sleep(seconds)
+            while len(self._resident) >= self.max_loaded:
+                self._resident.popitem(last=False)
+            self._resident[model] = None
+            self.loads += 1
+            return seconds
+
+    def _stream(self, request: BaseHTTPRequestHandler, model: str, tokens: list[str]) -> Optional[int]:
+        request.send_response(200)
+        request.send_header("Content-Type", "application/x-ndjson")
+        request.send_header("Transfer-Encoding", "chunked")
+        request.end_headers()
+        try:
+            for n, token in enumerate(tokens, start=1):
+                time.sleep(1 / self.tokens_per_second)
+                self._write_line(request, {
+                    "model": model,
+                    "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                    "message": {"role": "assistant", "content": token},
+                    "done": False,
+                })
+        except (BrokenPipeError, ConnectionResetError):
+            # Early stop at the closing code fence, or a cancelled candidate
+            request.close_connection = True
+            return None
+        return len(tokens)
+
+    def _write_line(self, request: BaseHTTPRequestHandler, payload: dict) -> None:
+        self._write_chunk(request, json.dumps(payload).encode() + b"\n")
+
+    @staticmethod
+    def _write_chunk(request: BaseHTTPRequestHandler, data: bytes) -> None:
+        request.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        request.wfile.flush()
+
+    def _default_reply(self, model: str, messages: list[dict], format: Any) -> str:
+        system = next((m["content"] for m in messages if m.get("role") == "system"), "")
+        if "reviewer" in system.lower():
+            accepted = self._random() < self.accept_rate
+            if format is not None:
+                return json.dumps({"verdict": "ACCEPT" if accepted else "REVISE",
+                                   "issues": [] if accepted else ["Handle an empty nums."]})
+            return "ACCEPT\nThe solution is correct." if accepted else "REVISE\nHandle an empty nums."
+
+        text = "\n".join(m.get("content", "") for m in messages)
+        signatures = _STUB_SIGNATURE.findall(text)
+        signature = signatures[-1] if signatures else "def solve(self) -> int:"
+        return (
+            "Here is the solution.\n\n```python\nclass Solution:\n"
+            f"    {signature}\n        return 0\n```\n\nIt runs in O(n) time."
+        )
+
+
+@dataclass
+class _Submission:
+    slug: str
+    ready_at: float
+    details: dict
+
+
+class MockLeetCode(_MockServer):
+    """LeetCode GraphQL and submit endpoints with scripted verdicts.
+
+    Code that fails the static checks is judged Compile Error; anything else
+    gets a verdict drawn from `verdicts` (status -> weight), or from
+    `verdict(slug, code) -> status` if given. With `rate_limit` set, submits
+    beyond that many per second get a 429 with Retry-After.
+    """
+
+    def __init__(
+        self,
+        problems: list[Problem],
+        judge_latency: Latency = Latency(2.0, 0.3),
+        post_latency: Latency = Latency(0.2, 0.3),
+        verdicts: Optional[dict[str, float]] = None,
+        verdict: Optional[Callable[[str, str], str]] = None,
+        rate_limit: Optional[float] = None,
+        seed: int = 0,
+    ) -> None:
+        super().__init__(seed)
+        self.problems = {p.slug: p for p in problems}
+        self.judge_latency = judge_latency
+        self.post_latency = post_latency
+        self.verdicts = verdicts or DEFAULT_VERDICTS
+        self.verdict = verdict
+        self.rate_limit = rate_limit
+        self.submissions_received = 0
+        self.throttled = 0
+
+        self._submissions: dict[int, _Submission] = {}
+        self._lock = threading.Lock()
+        self._last_submit = float("-inf")
+
+    def handle(self, request: BaseHTTPRequestHandler, method: str, body: Optional[dict]) -> None:
+        if method == "GET":
+            self._send_json(request, {}, headers={"Set-Cookie": "csrftoken=mock-csrf; Path=/"})
+        elif request.path.rstrip("/") == "/graphql" and body is not None:
+            self._graphql(request, body)
+        elif request.path.startswith("/problems/") and request.path.endswith("/submit/") and body is not None:
+            self._submit(request, request.path.split("/")[2], body)
+        else:
+            self._send_json(request, {"error": f"{method} {request.path} not found"}, status=404)
+
+    def _graphql(self, request: BaseHTTPRequestHandler, body: dict) -> None:
+        query, variables = body.get("query", ""), body.get("variables") or {}
+        data: dict[str, Any] = {}
+        if "questionList" in query:
+            data["problemsetQuestionList"] = self._question_list(variables)
+        fields = _ALIASED.findall(query) + [(name, name, var) for name, var in _PLAIN.findall(query)]
+        for alias, field, var in fields:
+            value = variables.get(var)
+            data[alias] = self._question(value) if field == "question" else self._details(value)
+        self._send_json(request, {"data": data})
+
+    def _question(self, slug: str) -> Optional[dict]:
+        problem = self.problems.get(slug)
+        if problem is None:
+            return None
+        return {
+            "questionId": problem.id,
+            "title": problem.title,
+            "titleSlug": problem.slug,
+            "difficulty": problem.difficulty,
+            "content": problem.description,
+            "codeSnippets": [{"langSlug": "python3", "code": problem.code_stub}],
+        }
+
+    def _question_list(self, variables: dict) -> dict:
+        skip, limit = variables.get("skip", 0), variables.get("limit", 100)
+        problems = list(self.problems.values())
+        return {
+            "total": len(problems),
+            "questions": [
+                {"questionFrontendId": p.id, "title": p.title, "titleSlug": p.slug,
+                 "difficulty": p.difficulty, "isPaidOnly": False}
+                for p in problems[skip:skip + limit]
+            ],
+        }
+
+    def _details(self, submission_id: int) -> Optional[dict]:
+        with self._lock:
+            submission = self._submissions.get(submission_id)
+        if submission is None or time.monotonic() < submission.ready_at:
+            return None
+        return submission.details
+
+    def _submit(self, request: BaseHTTPRequestHandler, slug: str, body: dict) -> None:
+        time.sleep(self._sample(self.post_latency))
+        with self._lock:
+            now = time.monotonic()
+            if self.rate_limit and now - self._last_submit < 1 / self.rate_limit:
+                self.throttled += 1
+                retry_after = math.ceil(1 / self.rate_limit - (now - self._last_submit))
+                self._send_json(request, {"error": "too many requests"}, status=429,
+                                headers={"Retry-After": str(retry_after)})
+                return
+            self._last_submit = now
+            self.submissions_received += 1
+            submission_id = self.submissions_received
+
+        code = body.get("typed_code", "")
+        status = self._judge(slug, code)
+        with self._lock:
+            self._submissions[submission_id] = _Submission(
+                slug=slug,
+                ready_at=time.monotonic() + self._sample(self.judge_latency),
+                details=self._verdict_details(status, code),
+            )
+        self._send_json(request, {"submission_id": submission_id})
+
+    def _judge(self, slug: str, code: str) -> str:
+        problem = self.problems.get(slug)
+        if problem is not None and check_solution(problem, code):
+            return "Compile Error"
+        if self.verdict is not None:
+            return self.verdict(slug, code)
+        draw = self._random() * sum(self.verdicts.values())
+        for status, weight in self.verdicts.items():
+            draw -= weight
+            if draw < 0:
+                return status
+        return next(iter(self.verdicts))
+
+    @staticmethod
+    def _verdict_details(status: str, code: str) -> dict:
+        accepted = status == "Accepted"
+        return {
+            "statusCode": _STATUS_CODES.get(status, 16),
+            "runtimePercentile": 50.0 if accepted else None,
+            "memoryPercentile": 50.0 if accepted else None,
+            "totalCorrect": 100 if accepted else 37,
+            "totalTestcases": 100,
+            "compileError": "Line 1: SyntaxError: invalid syntax" if status == "Compile Error" else None,
+            "runtimeError": "IndexError: list index out of range" if status == "Runtime Error" else None,
+            "lastTestcase": None if accepted else "[1,2,3]\n0",
+            "codeOutput": "0" if status == "Wrong Answer" else None,
+            "expectedOutput": "3" if status == "Wrong Answer" else None,
+        }
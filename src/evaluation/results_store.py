@@ -0,0 +1,232 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterator, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    kind TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    total_time_seconds REAL,
+    meta TEXT NOT NULL,
+    supersedes TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    slug TEXT NOT NULL,
+    title TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    model TEXT NOT NULL,
+    pipeline TEXT NOT NULL,
+    accepted INTEGER,
+    status TEXT,
+    seconds REAL,
+    record TEXT NOT NULL,
+    PRIMARY KEY (run_id, pipeline, slug)
+);
+CREATE INDEX IF NOT EXISTS idx_results_model ON results(model, pipeline, difficulty);
+CREATE INDEX IF NOT EXISTS idx_results_pipeline ON results(pipeline);
+CREATE INDEX IF NOT EXISTS idx_results_slug ON results(slug);
+CREATE INDEX IF NOT EXISTS idx_results_difficulty ON results(difficulty);
+CREATE INDEX IF NOT EXISTS idx_runs_created ON runs(created_at);
+"""
+
+_FILTERS = ("model", "pipeline", "slug", "difficulty")
+
+# Columns returned by query()
+_COLUMNS = ("run", "created_at", "slug", "title", "difficulty", "model", "pipeline", "accepted", "status", "seconds")
+
+
+def _rows(payload: dict) -> Iterator[tuple]:
+    """(slug, title, difficulty, model, pipeline, accepted, status, seconds, record) per result in a payload."""
+    if "pipelines" in payload:
+        model = payload.get("writer_model", "?")
+        for entry in payload["entries"]:
+            for name in payload["pipelines"]:
+                if name not in entry:
+                    continue
+                r = entry[name]
+                yield (entry["slug"], entry["title"], entry["difficulty"], model, name,
+                       r.get("accepted"), r.get("status"), r.get("time"), r)
+    else:
+        model = payload.get("model", "?")
+        for entry in payload["entries"]:
+            solve, sub = entry["solve"], entry.get("submission")
+            status = sub["status"] if sub else ("no code" if not solve["extracted_code"] else "not submitted")
+            yield (solve["slug"], solve["title"], solve["difficulty"], model, "benchmark",
+                   sub["accepted"] if sub else None, status, solve["generation_seconds"], entry)
+
+
+class ResultsStore:
+    """SQLite index of every benchmark/compare run, one row per (run, pipeline, problem).
+
+    Runs are keyed by name (the results file stem), so saving a resumed run
+    again replaces its rows. Rows are indexed on model, pipeline, slug,
+    difficulty and run, so questions across many runs don't need to open
+    any results JSON.
+
+    A re-evaluated run (reevaluate.py) supersedes the run it was made from;
+    queries skip superseded runs unless asked for all runs, so the same
+    problems aren't counted twice.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA foreign_keys = ON")
+        self._db.executescript(_SCHEMA)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(runs)")}
+        if "supersedes" not in columns:
+            # Databases from before re-evaluated runs were linked to their original
+            self._db.execute("ALTER TABLE runs ADD COLUMN supersedes TEXT")
+
+    def save_run(self, name: str, payload: dict, created_at: Optional[float] = None) -> int:
+        """Store a benchmark.py or compare_methods.py payload as run `name`; returns its id."""
+        kind = "compare" if "pipelines" in payload else "benchmark"
+        meta = {k: v for k, v in payload.items() if k != "entries"}
+        supersedes = Path(payload["reevaluated_from"]).stem if payload.get("reevaluated_from") else None
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM runs WHERE name = ?", (name,))
+            run_id = self._db.execute(
+                "INSERT INTO runs (name, kind, created_at, total_time_seconds, meta, supersedes) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (name, kind, created_at or time.time(), payload.get("total_time_seconds"), json.dumps(meta),
+                 supersedes),
+            ).lastrowid
+            self._db.executemany(
+                "INSERT OR REPLACE INTO results (run_id, slug, title, difficulty, model, pipeline, accepted, status, "
+                "seconds, record) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (run_id, slug, title, difficulty, model, pipeline,
+                     None if accepted is None else int(accepted), status, seconds, json.dumps(record))
+                    for slug, title, difficulty, model, pipeline, accepted, status, seconds, record in _rows(payload)
+                ],
+            )
+        return run_id
+
+    def import_json(self, path: Path) -> int:
+        """Store an existing results JSON under its file stem (backfills runs from before the store)."""
+        path = Path(path)
+        with open(path, encoding="utf-8") as f:
+            payload = json.load(f)
+        return self.save_run(path.stem, payload, created_at=path.stat().st_mtime)
+
+    def runs(self) -> list[dict]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT r.name, r.kind, r.created_at, r.total_time_seconds, COUNT(x.slug), "
+                "GROUP_CONCAT(DISTINCT x.model), r.supersedes, "
+                "(SELECT s.name FROM runs s WHERE s.supersedes = r.name ORDER BY s.created_at DESC LIMIT 1) "
+                "FROM runs r LEFT JOIN results x ON x.run_id = r.id GROUP BY r.id ORDER BY r.created_at",
+            ).fetchall()
+        keys = ("name", "kind", "created_at", "total_time_seconds", "results", "models", "supersedes",
+                "superseded_by")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def _where(self, run: Optional[str], since: Optional[float], filters: dict,
+               include_superseded: bool = False) -> tuple[str, list]:
+        unknown = set(filters) - set(_FILTERS)
+        if unknown:
+            raise ValueError(f"cannot filter on {', '.join(sorted(unknown))}")
+        clauses, params = [], []
+        for column, value in filters.items():
+            if value is not None:
+                clauses.append(f"x.{column} = ?")
+                params.append(value)
+        if run is not None:
+            clauses.append("r.name = ?")
+            params.append(run)
+        if since is not None:
+            clauses.append("r.created_at >= ?")
+            params.append(since)
+        if not include_superseded and run is None:
+            clauses.append("r.name NOT IN (SELECT supersedes FROM runs WHERE supersedes IS NOT NULL)")
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query(self, run: Optional[str] = None, since: Optional[float] = None, include_superseded: bool = False,
+              **filters: Optional[str]) -> list[dict]:
+        """Matching results, oldest run first. Filters: model, pipeline, slug, difficulty."""
+        where, params = self._where(run, since, filters, include_superseded)
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT r.name, r.created_at, x.slug, x.title, x.difficulty, x.model, x.pipeline, x.accepted, "
+                f"x.status, x.seconds FROM results x JOIN runs r ON r.id = x.run_id{where} "
+                "ORDER BY r.created_at, x.slug, x.pipeline",
+                params,
+            ).fetchall()
+        return [dict(zip(_COLUMNS, row)) for row in rows]
+
+    def pass_rates(self, run: Optional[str] = None, since: Optional[float] = None, include_superseded: bool = False,
+                   **filters: Optional[str]) -> list[dict]:
+        """Accepted/submitted per (model, pipeline, difficulty), computed in SQL."""
+        where, params = self._where(run, since, filters, include_superseded)
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT x.model, x.pipeline, x.difficulty, SUM(x.accepted), COUNT(x.accepted), "
+                f"COUNT(DISTINCT r.id) FROM results x JOIN runs r ON r.id = x.run_id{where} "
+                "GROUP BY x.model, x.pipeline, x.difficulty ORDER BY x.model, x.pipeline, x.difficulty",
+                params,
+            ).fetchall()
+        keys = ("model", "pipeline", "difficulty", "accepted", "submitted", "runs")
+        return [dict(zip(keys, (*row[:3], row[3] or 0, *row[4:]))) for row in rows]
+
+    def iter_outcomes(self, run: Optional[str] = None, since: Optional[float] = None, include_superseded: bool = False,
+                      **filters: Optional[str]) -> Iterator[tuple[str, str, str, str, Optional[bool]]]:
+        """(model, pipeline, difficulty, slug, accepted) per matching result, for ResultsAggregator.add_rows."""
+        where, params = self._where(run, since, filters, include_superseded)
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT x.model, x.pipeline, x.difficulty, x.slug, x.accepted "
+                f"FROM results x JOIN runs r ON r.id = x.run_id{where}",
+                params,
+            ).fetchall()
+        for model, pipeline, difficulty, slug, accepted in rows:
+            yield model, pipeline, difficulty, slug, None if accepted is None else bool(accepted)
+
+    def report_payload(self, run: str) -> dict:
+        """Run `run` in the shape ReportGenerator reads (benchmark runs get one column for the model)."""
+        with self._lock:
+            row = self._db.execute("SELECT id, kind, meta FROM runs WHERE name = ?", (run,)).fetchone()
+            if row is None:
+                raise KeyError(run)
+            run_id, kind, meta = row
+            results = self._db.execute(
+                "SELECT slug, title, difficulty, model, pipeline, accepted, status, seconds, record "
+                "FROM results WHERE run_id = ? ORDER BY rowid",
+                (run_id,),
+            ).fetchall()
+
+        payload = json.loads(meta)
+        entries: dict[str, dict] = {}
+        for slug, title, difficulty, model, pipeline, accepted, status, seconds, record in results:
+            entry = entries.setdefault(slug, {"slug": slug, "title": title, "difficulty": difficulty})
+            if kind == "compare":
+                entry[pipeline] = json.loads(record)
+            else:
+                entry[model] = {"time": seconds, "accepted": None if accepted is None else bool(accepted),
+                                "status": status}
+        if kind == "benchmark":
+            payload["writer_model"] = payload.get("model", "?")
+            payload["pipelines"] = [payload["writer_model"]]
+        payload["entries"] = list(entries.values())
+        return payload
+
+    def execute(self, sql: str, params: tuple = ()) -> tuple[list[str], list[tuple]]:
+        """Read-only ad-hoc SQL: (column names, rows)."""
+        with self._lock:
+            self._db.execute("PRAGMA query_only = ON")
+            try:
+                cursor = self._db.execute(sql, params)
+                return [d[0] for d in cursor.description or ()], cursor.fetchall()
+            finally:
+                self._db.execute("PRAGMA query_only = OFF")
+
+    def close(self) -> None:
+        self._db.close()
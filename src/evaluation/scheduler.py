@@ -0,0 +1,58 @@
+import asyncio
+import logging
+import threading
+from typing import Awaitable, Callable, Sequence, TypeVar
+
+from src.clients.leetcode_submitter import LeetCodeSubmitter
+from src.models.result import SubmissionResult
+from src.utils.tracing import span
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class BoundedSubmitter:
+    """LeetCodeSubmitter wrapper that caps how many submissions run at once.
+
+    Async agents call submit() from worker threads, so a threading
+    semaphore is used instead of an asyncio one.
+    """
+
+    def __init__(self, submitter: LeetCodeSubmitter, max_concurrency: int = 2) -> None:
+        self._submitter = submitter
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+
+    def submit(self, slug: str, question_id: str, code: str, **kwargs) -> SubmissionResult:
+        with span("leetcode.queue"):
+            self._slots.acquire()
+        try:
+            return self._submitter.submit(slug, question_id, code, **kwargs)
+        finally:
+            self._slots.release()
+
+
+class JobScheduler:
+    """Runs independent jobs concurrently, at most `max_jobs` at a time.
+
+    Jobs are started in the given order and results come back in the same
+    order, so the output does not depend on which job finished first.
+    Ollama and LeetCode limits are enforced by the clients themselves
+    (AsyncOllamaClient and BoundedSubmitter).
+    """
+
+    def __init__(self, max_jobs: int = 4) -> None:
+        self.max_jobs = max_jobs
+
+    async def run(self, jobs: Sequence[Callable[[], Awaitable[T]]]) -> list[T]:
+        slots = asyncio.Semaphore(self.max_jobs)
+
+        async def _run(job: Callable[[], Awaitable[T]]) -> T:
+            async with slots:
+                return await job()
+
+        log.info("Scheduling %d jobs (max %d at once)", len(jobs), self.max_jobs)
+        return list(await asyncio.gather(*(_run(job) for job in jobs)))
+
+    def run_sync(self, jobs: Sequence[Callable[[], Awaitable[T]]]) -> list[T]:
+        return asyncio.run(self.run(jobs))
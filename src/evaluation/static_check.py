@@ -0,0 +1,140 @@
+"""Static checks on a solution before it is run or submitted.
+
+Hard errors are what LeetCode would report as a Compile Error or an
+immediate failure on every test: code that doesn't parse, a missing class
+or method from the stub, or a method taking the wrong number of
+arguments. Names that are never defined are only warnings: they ignore
+scoping and can't see everything LeetCode's environment provides, so
+they are logged but never used to reject a solution.
+"""
+
+import ast
+import builtins
+import importlib
+import re
+from typing import Optional
+
+from src.models.problem import Problem
+
+_CLASS = re.compile(r"^\s*class (\w+)", re.MULTILINE)
+_DEF = re.compile(r"^\s*def (\w+)\(self,?\s*([^)]*)\)", re.MULTILINE)
+_WORD = re.compile(r"[A-Za-z_]\w*")
+
+# LeetCode's Python 3 prelude: these modules are imported, the second group is also star-imported
+_PRELUDE_MODULES = (
+    "array", "bisect", "collections", "copy", "datetime", "decimal", "fractions", "functools", "heapq",
+    "itertools", "math", "operator", "random", "re", "statistics", "string", "sys", "typing",
+)
+_STAR_IMPORTED = ("bisect", "collections", "copy", "functools", "heapq", "itertools", "math", "typing")
+
+_PRELUDE = set(_PRELUDE_MODULES) | {"SortedList", "SortedDict", "SortedSet", "ListNode", "TreeNode"} | {
+    name
+    for module in map(importlib.import_module, _STAR_IMPORTED)
+    for name in getattr(module, "__all__", dir(module))
+    if not name.startswith("_")
+}
+
+_BUILTINS = set(dir(builtins))
+
+
+def _stub_code(stub: str) -> str:
+    # The stub's ListNode / TreeNode definitions are commented out, but LeetCode provides them
+    return "\n".join(line.lstrip("# ") if line.lstrip().startswith("#") else line for line in stub.splitlines())
+
+
+def _stub_methods(stub: str) -> tuple[list[str], dict[str, int]]:
+    """Class names and {method: number of parameters besides self} declared by the stub."""
+    code = "\n".join(line for line in stub.splitlines() if not line.lstrip().startswith("#"))
+    classes = _CLASS.findall(code)
+    methods = {name: len([p for p in params.split(",") if p.strip()]) for name, params in _DEF.findall(code)}
+    return classes, methods
+
+
+def _bound_names(tree: ast.AST) -> set[str]:
+    names: set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, (ast.Store, ast.Del)):
+            names.add(node.id)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, ast.arg):
+            names.add(node.arg)
+        elif isinstance(node, ast.alias):
+            names.add((node.asname or node.name).split(".")[0])
+        elif isinstance(node, (ast.Global, ast.Nonlocal)):
+            names.update(node.names)
+        elif isinstance(node, ast.ExceptHandler) and node.name:
+            names.add(node.name)
+        elif isinstance(node, (ast.MatchAs, ast.MatchStar)) and node.name:
+            names.add(node.name)
+        elif isinstance(node, ast.MatchMapping) and node.rest:
+            names.add(node.rest)
+    return names
+
+
+def _star_imports(tree: ast.AST) -> set[str]:
+    return {
+        node.module for node in ast.walk(tree)
+        if isinstance(node, ast.ImportFrom) and node.module and any(a.name == "*" for a in node.names)
+    }
+
+
+def _arity_error(func: ast.FunctionDef, expected: int) -> Optional[str]:
+    positional = func.args.posonlyargs + func.args.args
+    params = len(positional) - 1  # self
+    required = params - len(func.args.defaults)
+    if func.args.vararg or required <= expected <= params:
+        return None
+    return f"{func.name}() takes {params} arguments besides self, the stub passes {expected}"
+
+
+def check_solution(problem: Problem, code: str) -> list[str]:
+    """Hard errors in `code` that can be seen without running it; empty if none."""
+    try:
+        tree = ast.parse(code)
+    except SyntaxError as e:
+        return [f"SyntaxError: {e.msg} (line {e.lineno})"]
+
+    errors: list[str] = []
+    classes = {node.name: node for node in tree.body if isinstance(node, ast.ClassDef)}
+    stub_classes, stub_methods = _stub_methods(problem.code_stub)
+
+    defined: dict[str, ast.FunctionDef] = {}
+    for cls in stub_classes:
+        if cls not in classes:
+            errors.append(f"class {cls} from the starting code is missing")
+            continue
+        defined.update((f.name, f) for f in classes[cls].body if isinstance(f, (ast.FunctionDef, ast.AsyncFunctionDef)))
+    if len(errors) < len(stub_classes):
+        for method, arity in stub_methods.items():
+            if method not in defined:
+                errors.append(f"method {method}() from the starting code is missing")
+            elif (error := _arity_error(defined[method], arity)) is not None:
+                errors.append(error)
+    return errors
+
+
+def undefined_names(problem: Problem, code: str) -> list[str]:
+    """Warnings for names `code` uses but never binds, imports or gets from LeetCode's prelude."""
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return []
+    if _star_imports(tree) - set(_STAR_IMPORTED):
+        # Can't tell what else a star import brings in
+        return []
+
+    known = _PRELUDE | _BUILTINS | _bound_names(tree) | set(_WORD.findall(_stub_code(problem.code_stub)))
+    undefined = {
+        node.id for node in ast.walk(tree)
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load) and node.id not in known
+    }
+    return [f"name '{name}' may not be defined" for name in sorted(undefined)]
+
+
+def static_failure(problem: Problem, code: str) -> Optional[tuple[str, str]]:
+    """(error_type, error_msg) for writer_error_prompt if check_solution finds anything, otherwise None."""
+    errors = check_solution(problem, code)
+    if not errors:
+        return None
+    return "Compile Error", "\n".join(errors)
@@ -1,9 +1,10 @@
 from src.models.config import SolveConfig
+from src.models.generation import CodeGeneration, GenerationStats
 from src.models.pipeline_run_result import PipelineRunResult
 from src.models.problem import Problem
-from src.models.result import BenchmarkEntry, SolveResult, SubmissionResult, ReviewerFeedback
+from src.models.result import BenchmarkEntry, LocalJudgeResult, SolveResult, SubmissionResult, ReviewerFeedback
 
 __all__ = [
-    "BenchmarkEntry", "PipelineRunResult", "Problem",
+    "BenchmarkEntry", "CodeGeneration", "GenerationStats", "LocalJudgeResult", "PipelineRunResult", "Problem",
     "SolveConfig", "SolveResult", "SubmissionResult", "ReviewerFeedback",
 ]
\ No newline at end of file
@@ -5,4 +5,11 @@ from dataclasses import dataclass
 class SolveConfig:
     writer_model: str
     reviewer_model: str
-    max_iterations: int = 3
\ No newline at end of file
+    max_iterations: int = 3
+    # Send revisions as extra turns of one writer conversation so Ollama can reuse its KV cache
+    conversation: bool = False
+    # How long Ollama keeps the writer model loaded between turns
+    keep_alive: str = "10m"
+    # Ask the reviewer for a JSON {verdict, issues} capped at review_max_tokens instead of free text
+    structured_review: bool = False
+    review_max_tokens: int = 256
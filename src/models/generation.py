@@ -0,0 +1,31 @@
+from pydantic import BaseModel
+
+
+class GenerationStats(BaseModel):
+    """Token counts and timings Ollama reports for one call (durations in seconds)."""
+    model: str
+    prompt_eval_count: int = 0
+    eval_count: int = 0
+    load_duration: float = 0.0
+    prompt_eval_duration: float = 0.0
+    eval_duration: float = 0.0
+    total_duration: float = 0.0
+    cached: bool = False
+    # Stream was cut early, so timings were measured client-side (load is included in prompt eval)
+    estimated: bool = False
+    # Filled in by WriterSession: prompt eval avoided by reusing the conversation's KV cache
+    prompt_eval_saved: float = 0.0
+
+
+class CodeGeneration(BaseModel):
+    text: str
+    code: str | None
+    # Streamed chunks received (Ollama sends about one token per chunk)
+    tokens_generated: int = 0
+    # Estimated from the model's average full response length, 0 if unknown
+    tokens_saved: int = 0
+    # Stream cut at the closing fence of the first code block: `text` ends there
+    stopped_early: bool = False
+    cached: bool = False
+    # Same object that was recorded for telemetry; None for cache hits
+    stats: GenerationStats | None = None
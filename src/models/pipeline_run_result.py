@@ -6,4 +6,23 @@ class PipelineRunResult(BaseModel):
     time: float
     accepted: Optional[bool] = None
     status: str
-    num_reviews: int = 0
\ No newline at end of file
+    num_reviews: int = 0
+    # Set when the run crashed (tunnel drop, HTTP error) rather than finishing; such runs are retried on --resume
+    error: Optional[str] = None
+    # Ollama telemetry summed over every model call of the run
+    generations: int = 0
+    prompt_tokens: int = 0
+    eval_tokens: int = 0
+    load_seconds: float = 0.0
+    prompt_eval_seconds: float = 0.0
+    eval_seconds: float = 0.0
+    gpu_seconds: float = 0.0
+    # Estimated prompt eval avoided by writer conversations (SolveConfig.conversation)
+    prompt_eval_saved_seconds: float = 0.0
+    # Unparsed model outputs, so scripts/reevaluate.py can replay them through newer parsers
+    code: Optional[str] = None
+    raw_response: Optional[str] = None
+    # raw_response was cut at the closing fence of its first code block
+    raw_stopped_early: bool = False
+    raw_reviews: list[str] = []
+    review_verdicts: list[bool] = []
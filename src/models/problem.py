@@ -1,5 +1,7 @@
 """Data model for a LeetCode problem."""
 
+from typing import Optional
+
 from pydantic import BaseModel
 
 
@@ -10,3 +12,5 @@ class Problem(BaseModel):
     difficulty: str
     description: str
     code_stub: str
+    # Markdown version of the HTML description, used in prompts
+    description_md: Optional[str] = None
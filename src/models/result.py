@@ -10,6 +10,10 @@ class SolveResult(BaseModel):
     extracted_code: str | None
     generation_seconds: float
     error: str | None = None
+    # Estimated tokens not generated because the stream stopped at the closing code fence
+    tokens_saved: int = 0
+    # raw_response ends at that fence, so a replay can't see what the model would have written after it
+    stopped_early: bool = False
 
 
 class SubmissionResult(BaseModel):
@@ -38,3 +42,16 @@ class ReviewerFeedback(BaseModel):
     feedback: str
     model: str
     message_number: int
+    # Unparsed reviewer output, so verdicts can be re-parsed offline
+    raw: str = ""
+
+
+class LocalJudgeResult(BaseModel):
+    # Same status strings as LeetCode, plus "Skipped" when the problem can't be judged locally
+    status: str
+    passed: int = 0
+    total: int = 0
+    error: str | None = None
+    last_testcase: str | None = None
+    code_output: str | None = None
+    expected_output: str | None = None
@@ -1,4 +1,19 @@
+from functools import lru_cache
+
+from src.models.config import SolveConfig
 from src.models.problem import Problem
+from src.utils.description import html_to_markdown
+
+
+@lru_cache(maxsize=256)
+def _markdown(html: str) -> str:
+    return html_to_markdown(html)
+
+
+def problem_text(problem: Problem) -> str:
+    """The description as sent to the model: the stored Markdown, converted on the fly if missing."""
+    return problem.description_md or _markdown(problem.description)
+
 
 WRITER_SYSTEM = "You are an expert Python programmer. Return only code in a ```python``` block."
 
@@ -6,7 +21,7 @@ def writer_prompt(problem: Problem) -> str:
     return (
         f"Solve this LeetCode problem in Python. Return ONLY the code, no explanation.\n\n"
         f"{problem.title}\n\n"
-        f"{problem.description}\n\n"
+        f"{problem_text(problem)}\n\n"
         f"Starting code:\n{problem.code_stub}"
     )
 
@@ -17,11 +32,40 @@ REVIEWER_SYSTEM = (
     "If REVISE, explain what needs to be fixed."
 )
 
+# Structured mode: a compact JSON verdict instead of free text (see SolveConfig.structured_review)
+REVIEWER_STRUCTURED_SYSTEM = (
+    "You are an expert code reviewer. "
+    "Review the given solution and answer in JSON: "
+    '{"verdict": "ACCEPT" or "REVISE", "issues": [short descriptions of what must be fixed]}. '
+    "Leave issues empty when the verdict is ACCEPT. Keep each issue to one sentence."
+)
+
+REVIEW_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "verdict": {"type": "string", "enum": ["ACCEPT", "REVISE"]},
+        "issues": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["verdict", "issues"],
+}
+
+
+def reviewer_request(config: SolveConfig) -> dict:
+    """Extra generate() arguments for the reviewer call, depending on the review mode."""
+    if not config.structured_review:
+        return {"system": REVIEWER_SYSTEM}
+    return {
+        "system": REVIEWER_STRUCTURED_SYSTEM,
+        "format": REVIEW_SCHEMA,
+        "options": {"num_predict": config.review_max_tokens},
+    }
+
+
 def reviewer_prompt(problem: Problem, code: str) -> str:
     return (
         f"Review this Python solution for the following LeetCode problem.\n\n"
         f"## Problem\n{problem.title}\n\n"
-        f"{problem.description}\n\n"
+        f"{problem_text(problem)}\n\n"
         f"## Submitted solution\n```python\n{code}\n```\n\n"
         f"First line: ACCEPT if correct, REVISE if not.\n"
         f"Then explain your reasoning."
@@ -32,7 +76,7 @@ def writer_revision_prompt(problem: Problem, code: str, feedback: str) -> str:
     return (
         f"Your previous solution was reviewed and needs revision.\n\n"
         f"## Problem\n{problem.title}\n\n"
-        f"{problem.description}\n\n"
+        f"{problem_text(problem)}\n\n"
         f"## Your previous solution\n```python\n{code}\n```\n\n"
         f"## Reviewer feedback\n{feedback}\n\n"
         f"Fix the issues and return ONLY the corrected code in a ```python``` block."
@@ -43,8 +87,27 @@ def writer_error_prompt(problem: Problem, code: str, error_type: str, error_msg:
     return (
         f"Your solution has a {error_type}.\n\n"
         f"## Problem\n{problem.title}\n\n"
-        f"{problem.description}\n\n"
+        f"{problem_text(problem)}\n\n"
         f"## Your solution\n```python\n{code}\n```\n\n"
         f"## Error message\n{error_msg}\n\n"
         f"Fix the error and return ONLY the corrected code in a ```python``` block."
     )
+
+
+# Follow-up turns for a writer conversation: the problem and the previous
+# solution are already in the history, so only the new information is sent.
+
+def writer_revision_turn(feedback: str) -> str:
+    return (
+        f"Your solution was reviewed and needs revision.\n\n"
+        f"## Reviewer feedback\n{feedback}\n\n"
+        f"Fix the issues and return ONLY the corrected code in a ```python``` block."
+    )
+
+
+def writer_error_turn(error_type: str, error_msg: str) -> str:
+    return (
+        f"Your solution has a {error_type}.\n\n"
+        f"## Error message\n{error_msg}\n\n"
+        f"Fix the error and return ONLY the corrected code in a ```python``` block."
+    )
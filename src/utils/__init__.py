@@ -1,4 +1,7 @@
-from src.utils.parsers import extract_code, parse_review
+from src.utils.aggregator import ResultsAggregator
+from src.utils.description import html_to_markdown
+from src.utils.parsers import CodeBlockStream, extract_code, parse_review, parse_structured_review
 from src.utils.report_generator import ReportGenerator
 
-__all__ = ["extract_code", "parse_review", "ReportGenerator"]
+__all__ = ["CodeBlockStream", "extract_code", "html_to_markdown", "parse_review", "parse_structured_review",
+           "ReportGenerator", "ResultsAggregator"]
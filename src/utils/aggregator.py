@@ -0,0 +1,216 @@
+"""Pass-rate statistics over any number of result files, folded in one pass.
+
+Each file is read once and reduced to per-problem counters keyed by
+(model, pipeline, difficulty, slug): how often the problem was submitted
+and how often it was accepted. Memory grows with the number of distinct
+problems, not with the number of runs, so dozens of compare_*.json files
+cost no more than one.
+
+Statistics are computed from those counters:
+- pass rate with a bootstrap confidence interval that resamples problems
+  (vectorized: all resamples are one index matrix),
+- pass@k, the unbiased estimator 1 - C(n-c, k) / C(n, k) averaged over
+  problems attempted at least k times.
+"""
+
+import json
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+
+DIFFICULTIES = ("Easy", "Medium", "Hard")
+
+
+@dataclass
+class PassRate:
+    passed: int
+    submitted: int
+    problems: int
+    rate: float
+    low: float
+    high: float
+
+
+def _iter_json(path: Path) -> Iterator[tuple[str, str, str, str, Optional[bool]]]:
+    with open(path, encoding="utf-8") as f:
+        payload = json.load(f)
+
+    if "pipelines" in payload:
+        model = payload.get("writer_model", "?")
+        for entry in payload["entries"]:
+            for name in payload["pipelines"]:
+                if name in entry:
+                    yield model, name, entry["difficulty"], entry["slug"], entry[name].get("accepted")
+    else:
+        model = payload.get("model", "?")
+        for entry in payload["entries"]:
+            solve, sub = entry["solve"], entry.get("submission")
+            yield model, "benchmark", solve["difficulty"], solve["slug"], sub["accepted"] if sub else None
+
+
+def _iter_jsonl(path: Path, difficulties: dict[str, str]) -> Iterator[tuple[str, str, str, str, Optional[bool]]]:
+    # A checkpoint: settings header, then rows where a later row for a key replaces an earlier one
+    latest: dict[tuple, Optional[bool]] = {}
+    meta: dict[str, str] = {}
+    settings: dict = {}
+    with open(path, encoding="utf-8") as f:
+        for n, line in enumerate(f):
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # torn last line
+            if n == 0 and "settings" in row:
+                settings = row["settings"]
+                continue
+            key, record = tuple(row["key"]), row["record"]
+            if "solve" in record:
+                meta[record["solve"]["slug"]] = record["solve"]["difficulty"]
+                sub = record.get("submission")
+                latest[key] = sub["accepted"] if sub else None
+            else:
+                latest[key] = record.get("accepted")
+
+    model = settings.get("writer_model") or settings.get("model", "?")
+    for key, accepted in latest.items():
+        slug = key[0]
+        pipeline = key[1] if len(key) > 1 else "benchmark"
+        difficulty = meta.get(slug) or difficulties.get(slug, "?")
+        yield model, pipeline, difficulty, slug, accepted
+
+
+class ResultsAggregator:
+    """Folds benchmark/compare results (final .json or checkpoint .jsonl) into pass-rate statistics.
+
+    `difficulties` maps slug -> difficulty for checkpoints of compare
+    runs, whose rows don't carry it (e.g. from data/problem_list.json).
+    """
+
+    def __init__(self, difficulties: Optional[dict[str, str]] = None, seed: int = 0, resamples: int = 2000) -> None:
+        self.difficulties = difficulties or {}
+        self.resamples = resamples
+        self.files = 0
+        self._rng = np.random.default_rng(seed)
+        # (model, pipeline) -> (difficulty, slug) -> [submitted, passed]
+        self._counts: dict[tuple[str, str], dict[tuple[str, str], list[int]]] = defaultdict(
+            lambda: defaultdict(lambda: [0, 0])
+        )
+
+    def add(self, path: Path) -> None:
+        path = Path(path)
+        self.add_rows(_iter_jsonl(path, self.difficulties) if path.suffix == ".jsonl" else _iter_json(path))
+        self.files += 1
+
+    def add_rows(self, rows: Iterable[tuple[str, str, str, str, Optional[bool]]]) -> None:
+        """Fold (model, pipeline, difficulty, slug, accepted) rows, e.g. from ResultsStore.iter_outcomes."""
+        for model, pipeline, difficulty, slug, accepted in rows:
+            if accepted is None:
+                continue  # not submitted, so neither a pass nor a fail
+            counts = self._counts[model, pipeline][difficulty, slug]
+            counts[0] += 1
+            counts[1] += bool(accepted)
+
+    def groups(self) -> list[tuple[str, str]]:
+        return sorted(self._counts)
+
+    def models(self) -> list[str]:
+        return sorted({model for model, _ in self._counts})
+
+    def _arrays(self, model: str, pipeline: Optional[str], difficulty: Optional[str]) -> tuple[np.ndarray, np.ndarray]:
+        # pipeline=None pools every pipeline of the model, one row per (pipeline, problem)
+        rows = [
+            counts
+            for (m, p), group in self._counts.items() if m == model and pipeline in (None, p)
+            for (d, _), counts in group.items() if difficulty in (None, d)
+        ]
+        counts = np.array(rows, dtype=np.int64).reshape(-1, 2)
+        return counts[:, 0], counts[:, 1]
+
+    def pass_rate(self, model: str, pipeline: Optional[str] = None, difficulty: Optional[str] = None,
+                  confidence: float = 0.95) -> Optional[PassRate]:
+        """Pooled pass rate, with a bootstrap interval over problems (all pipelines if `pipeline` is None)."""
+        submitted, passed = self._arrays(model, pipeline, difficulty)
+        if not submitted.size:
+            return None
+
+        idx = self._rng.integers(0, submitted.size, size=(self.resamples, submitted.size))
+        sampled_submitted = submitted[idx].sum(axis=1)
+        rates = passed[idx].sum(axis=1) / np.maximum(sampled_submitted, 1)
+        tail = (1 - confidence) / 2 * 100
+        low, high = np.percentile(rates, [tail, 100 - tail])
+        return PassRate(
+            passed=int(passed.sum()),
+            submitted=int(submitted.sum()),
+            problems=int(submitted.size),
+            rate=float(passed.sum() / submitted.sum()),
+            low=float(low),
+            high=float(high),
+        )
+
+    def pass_at_k(self, model: str, pipeline: str, k: int, difficulty: Optional[str] = None) -> Optional[float]:
+        """Mean unbiased pass@k over problems submitted at least k times; None if there are none."""
+        submitted, passed = self._arrays(model, pipeline, difficulty)
+        keep = submitted >= k
+        if not keep.any():
+            return None
+        n, c = submitted[keep], passed[keep]
+
+        # 1 - C(n-c, k) / C(n, k) = 1 - prod_{i=0}^{k-1} (n-c-i) / (n-i), computed for all problems at once
+        i = np.arange(k)
+        ratios = np.clip(n[:, None] - c[:, None] - i, 0, None) / (n[:, None] - i)
+        return float(np.mean(1 - ratios.prod(axis=1)))
+
+    def max_attempts(self) -> int:
+        return max((counts[0] for group in self._counts.values() for counts in group.values()), default=0)
+
+    def to_markdown(self, ks: tuple[int, ...] = (1, 3, 5)) -> str:
+        lines = [
+            "# Aggregated Results",
+            "",
+            *([f"- **Files**: {self.files}"] if self.files else []),
+            f"- **Problems**: {len({slug for group in self._counts.values() for _, slug in group})}",
+            "",
+            "## Pass rate (95% bootstrap CI)",
+            "",
+            "| Model | Pipeline | " + " | ".join(DIFFICULTIES) + " | Total |",
+            "|---|---|" + "---|" * (len(DIFFICULTIES) + 1),
+        ]
+        for model, pipeline in self.groups():
+            cells = [self._format_rate(self.pass_rate(model, pipeline, d)) for d in (*DIFFICULTIES, None)]
+            lines.append(f"| {model} | {pipeline} | " + " | ".join(cells) + " |")
+
+        lines += [
+            "",
+            "## By model (all pipelines)",
+            "",
+            "| Model | " + " | ".join(DIFFICULTIES) + " | Total |",
+            "|---|" + "---|" * (len(DIFFICULTIES) + 1),
+        ]
+        for model in self.models():
+            cells = [self._format_rate(self.pass_rate(model, None, d)) for d in (*DIFFICULTIES, None)]
+            lines.append(f"| {model} | " + " | ".join(cells) + " |")
+
+        ks = tuple(k for k in ks if k <= self.max_attempts())
+        if ks:
+            lines += [
+                "",
+                "## pass@k",
+                "",
+                "| Model | Pipeline | " + " | ".join(f"pass@{k}" for k in ks) + " |",
+                "|---|---|" + "---|" * len(ks),
+            ]
+            for model, pipeline in self.groups():
+                cells = [self.pass_at_k(model, pipeline, k) for k in ks]
+                lines.append(f"| {model} | {pipeline} | "
+                             + " | ".join(f"{v:.0%}" if v is not None else "—" for v in cells) + " |")
+
+        lines.append("")
+        return "\n".join(lines)
+
+    @staticmethod
+    def _format_rate(stats: Optional[PassRate]) -> str:
+        if stats is None:
+            return "—"
+        return f"{stats.rate:.0%} [{stats.low:.0%}, {stats.high:.0%}] ({stats.passed}/{stats.submitted})"
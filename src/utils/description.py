@@ -0,0 +1,91 @@
+"""Turns LeetCode's HTML problem descriptions into compact Markdown for prompts."""
+
+import re
+from html.parser import HTMLParser
+
+_INLINE = {"strong": "**", "b": "**", "em": "*", "i": "*", "code": "`"}
+_BLOCKS = {"p", "div", "pre", "ul", "ol", "blockquote", "h1", "h2", "h3", "h4", "h5", "h6"}
+_BLANK_LINES = re.compile(r"\n{3,}")
+_SPACES = re.compile(r"[ \t\r\f\v]+")
+
+
+class _MarkdownWriter(HTMLParser):
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.out: list[str] = []
+        self._pre = 0
+        self._lists: list[list[int]] = []  # one [counter] per open list, 0 = unordered
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        if tag in _BLOCKS:
+            self._block()
+        if tag == "pre":
+            self._pre += 1
+        elif tag in ("ul", "ol"):
+            self._lists.append([1 if tag == "ol" else 0])
+        elif tag == "li":
+            self._newline()
+            counter = self._lists[-1] if self._lists else [0]
+            indent = "  " * max(0, len(self._lists) - 1)
+            if counter[0]:
+                self.out.append(f"{indent}{counter[0]}. ")
+                counter[0] += 1
+            else:
+                self.out.append(f"{indent}- ")
+        elif tag == "br":
+            self._newline()
+        elif tag == "sup":
+            self.out.append("^")
+        elif tag == "sub":
+            self.out.append("_")
+        elif tag in _INLINE and not self._pre:
+            self.out.append(_INLINE[tag])
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _INLINE and not self._pre:
+            self.out.append(_INLINE[tag])
+        elif tag == "pre":
+            self._pre = max(0, self._pre - 1)
+        elif tag in ("ul", "ol") and self._lists:
+            self._lists.pop()
+        if tag in _BLOCKS:
+            self._block()
+
+    def handle_startendtag(self, tag: str, attrs: list) -> None:
+        if tag == "br":
+            self._newline()
+        # Images (diagrams) carry nothing the model can read
+
+    def handle_data(self, data: str) -> None:
+        data = data.replace("\xa0", " ")
+        if self._pre:
+            self.out.append(data)
+        else:
+            self.out.append(_SPACES.sub(" ", data.replace("\n", " ")))
+
+    def _newline(self) -> None:
+        self.out.append("\n")
+
+    def _block(self) -> None:
+        self.out.append("\n\n")
+
+
+def _tidy_inline(text: str) -> str:
+    # Drop markers left empty by tags around whitespace, e.g. "<strong> </strong>"
+    return re.sub(r"(\*\*|`)\s*\1", " ", text)
+
+
+def html_to_markdown(html: str) -> str:
+    """Convert a LeetCode description to Markdown with as few characters as possible.
+
+    Keeps emphasis, inline code, lists and the line structure of the
+    <pre> example blocks; drops images, attributes and entities.
+    """
+    writer = _MarkdownWriter()
+    writer.feed(html)
+    writer.close()
+
+    lines = [_tidy_inline(line).rstrip() for line in "".join(writer.out).split("\n")]
+    text = "\n".join(line if line.strip() else "" for line in lines)
+    return _BLANK_LINES.sub("\n\n", text).strip()
@@ -1,3 +1,4 @@
+import json
 import re
 
 _CODE_BLOCK = re.compile(r"```(?:python)?\s*\n(.+?)```", re.DOTALL)
@@ -8,8 +9,49 @@ def extract_code(response: str) -> str | None:
     return match.group(1).strip() if match else None
 
 
+def ends_at_first_block(response: str) -> bool:
+    """Nothing but whitespace follows the first code block, as in a stream stopped at its closing fence."""
+    match = _CODE_BLOCK.search(response)
+    return match is not None and not response[match.end():].strip()
+
+
+class CodeBlockStream:
+    """Incremental extract_code for streamed responses.
+
+    feed() returns True once the first code block is closed; `code` then
+    holds the same value extract_code would return for the full response.
+    """
+
+    def __init__(self) -> None:
+        self.text = ""
+        self.code: str | None = None
+
+    def feed(self, chunk: str) -> bool:
+        # A fence can be split across chunks, so look a little behind the new text
+        scan_from = max(0, len(self.text) - 2)
+        self.text += chunk
+        if self.code is None and "```" in self.text[scan_from:]:
+            self.code = extract_code(self.text)
+        return self.code is not None
+
+
 def parse_review(response: str) -> tuple[bool, str]:
     first_line = response.strip().split("\n", 1)[0].upper()
     accepted = "ACCEPT" in first_line
     feedback = response.strip()
-    return accepted, feedback
\ No newline at end of file
+    return accepted, feedback
+
+
+def parse_structured_review(response: str) -> tuple[bool, str]:
+    """Parse a {"verdict", "issues"} review; anything else goes through parse_review."""
+    try:
+        review = json.loads(response)
+        verdict = review["verdict"].strip().upper()
+        issues = [str(issue).strip() for issue in review.get("issues") or []]
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return parse_review(response)
+    if verdict not in ("ACCEPT", "REVISE"):
+        return parse_review(response)
+
+    feedback = verdict + "".join(f"\n- {issue}" for issue in issues if issue)
+    return verdict == "ACCEPT", feedback
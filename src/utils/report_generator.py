@@ -1,5 +1,9 @@
 import json
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.evaluation import ResultsStore
 
 
 class ReportGenerator:
@@ -23,6 +27,8 @@ class ReportGenerator:
 
         lines.append(self._summary_table())
         lines.append(self._details_table())
+        if any("eval_tokens" in e.get(name, {}) for e in self.entries for name in self.pipeline_names):
+            lines.append(self._throughput_table())
 
         return "\n".join(lines)
 
@@ -33,22 +39,32 @@ class ReportGenerator:
         separator = "|---|" + "|".join(["---"] * len(self.pipeline_names)) + "|"
         lines.extend([header, separator])
 
+        # One pass over the entries: (difficulty, pipeline) -> [accepted, submitted]
+        counts: dict[tuple[str, str], list[int]] = {}
+        for e in self.entries:
+            for name in self.pipeline_names:
+                accepted = e.get(name, {}).get("accepted")
+                if accepted is None:
+                    continue
+                for key in ((e["difficulty"], name), ("Total", name)):
+                    cell = counts.setdefault(key, [0, 0])
+                    cell[0] += bool(accepted)
+                    cell[1] += 1
+
+        present = {e["difficulty"] for e in self.entries}
         for diff in ["Easy", "Medium", "Hard"]:
-            group = [e for e in self.entries if e["difficulty"] == diff]
-            if not group:
+            if diff not in present:
                 continue
             cells = [diff]
             for name in self.pipeline_names:
-                submitted = [e for e in group if e.get(name, {}).get("accepted") is not None]
-                accepted = sum(1 for e in submitted if e[name]["accepted"])
-                cells.append(f"{accepted}/{len(submitted)}")
+                accepted, submitted = counts.get((diff, name), (0, 0))
+                cells.append(f"{accepted}/{submitted}")
             lines.append("| " + " | ".join(cells) + " |")
 
         total_cells = ["**Total**"]
         for name in self.pipeline_names:
-            submitted = [e for e in self.entries if e.get(name, {}).get("accepted") is not None]
-            accepted = sum(1 for e in submitted if e[name]["accepted"])
-            total_cells.append(f"**{accepted}/{len(submitted)}**")
+            accepted, submitted = counts.get(("Total", name), (0, 0))
+            total_cells.append(f"**{accepted}/{submitted}**")
         lines.append("| " + " | ".join(total_cells) + " |")
 
         lines.append("")
@@ -77,7 +93,40 @@ class ReportGenerator:
         lines.append("")
         return "\n".join(lines)
 
+    def _throughput_table(self) -> str:
+        lines = ["## Throughput", ""]
+
+        lines.append(
+            "| Pipeline | Calls | Prompt tokens | Output tokens | Tokens/s | Load time | Prompt eval saved "
+            "| GPU time | Accepts/GPU-s |"
+        )
+        lines.append("|---|---|---|---|---|---|---|---|---|")
+
+        for name in self.pipeline_names:
+            results = [e[name] for e in self.entries if "eval_tokens" in e.get(name, {})]
+            calls = sum(r["generations"] for r in results)
+            prompt_tokens = sum(r["prompt_tokens"] for r in results)
+            eval_tokens = sum(r["eval_tokens"] for r in results)
+            eval_seconds = sum(r["eval_seconds"] for r in results)
+            load_seconds = sum(r["load_seconds"] for r in results)
+            saved_seconds = sum(r.get("prompt_eval_saved_seconds", 0) for r in results)
+            gpu_seconds = sum(r.get("gpu_seconds", 0) for r in results)
+            accepted = sum(1 for r in results if r.get("accepted"))
+            rate = f"{eval_tokens / eval_seconds:.1f}" if eval_seconds else "—"
+            efficiency = f"{accepted / gpu_seconds:.4f}" if gpu_seconds else "—"
+            lines.append(
+                f"| {name} | {calls} | {prompt_tokens} | {eval_tokens} | {rate} | {load_seconds:.1f}s "
+                f"| {saved_seconds:.1f}s | {gpu_seconds:.0f}s | {efficiency} |"
+            )
+
+        lines.append("")
+        return "\n".join(lines)
+
     @classmethod
     def from_json(cls, path: Path) -> "ReportGenerator":
         with open(path, encoding="utf-8") as f:
-            return cls(json.load(f))
\ No newline at end of file
+            return cls(json.load(f))
+
+    @classmethod
+    def from_store(cls, store: "ResultsStore", run: str) -> "ReportGenerator":
+        return cls(store.report_payload(run))
\ No newline at end of file
@@ -0,0 +1,59 @@
+"""Per-call generation stats, collected for whatever code is running inside collect_generations().
+
+Uses a ContextVar, so concurrent pipelines (asyncio tasks or threads started
+with asyncio.to_thread) each see only their own calls.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
+
+from src.models.generation import GenerationStats
+
+_NS = 1e9
+
+_current: ContextVar[Optional[list[GenerationStats]]] = ContextVar("generation_stats", default=None)
+
+
+@contextmanager
+def collect_generations() -> Iterator[list[GenerationStats]]:
+    calls: list[GenerationStats] = []
+    token = _current.set(calls)
+    try:
+        yield calls
+    finally:
+        _current.reset(token)
+
+
+def record_generation(stats: GenerationStats) -> None:
+    calls = _current.get()
+    if calls is not None:
+        calls.append(stats)
+
+
+def stats_from_response(model: str, response: Any) -> GenerationStats:
+    """Read the counters from a final (done) ollama chat response; durations come in nanoseconds."""
+    return GenerationStats(
+        model=model,
+        prompt_eval_count=response.prompt_eval_count or 0,
+        eval_count=response.eval_count or 0,
+        load_duration=(response.load_duration or 0) / _NS,
+        prompt_eval_duration=(response.prompt_eval_duration or 0) / _NS,
+        eval_duration=(response.eval_duration or 0) / _NS,
+        total_duration=(response.total_duration or 0) / _NS,
+    )
+
+
+def summarize_generations(calls: list[GenerationStats]) -> dict:
+    """Totals in the shape of PipelineRunResult's telemetry fields."""
+    return {
+        "generations": len(calls),
+        "prompt_tokens": sum(c.prompt_eval_count for c in calls),
+        "eval_tokens": sum(c.eval_count for c in calls),
+        "load_seconds": round(sum(c.load_duration for c in calls), 2),
+        "prompt_eval_seconds": round(sum(c.prompt_eval_duration for c in calls), 2),
+        "eval_seconds": round(sum(c.eval_duration for c in calls), 2),
+        # Server time spent on this run's calls, including load and cancelled generations
+        "gpu_seconds": round(sum(c.total_duration for c in calls), 2),
+        "prompt_eval_saved_seconds": round(sum(c.prompt_eval_saved for c in calls), 2),
+    }
@@ -0,0 +1,176 @@
+"""Nested timing spans for pipeline stages, exported as JSONL or Chrome trace.
+
+Spans are only recorded inside use_tracer(); otherwise span() does nothing.
+The parent span travels in a ContextVar, so it follows asyncio tasks and
+asyncio.to_thread calls. Child spans inherit their parent's attributes
+(problem, pipeline, iteration), which keeps every stage filterable.
+"""
+
+import functools
+import inspect
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+
+@dataclass
+class Span:
+    id: int
+    parent_id: Optional[int]
+    root_id: int
+    name: str
+    start: float
+    end: float = 0.0
+    thread: str = ""
+    attrs: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+class Tracer:
+    """Collects finished spans; safe to share between threads."""
+
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+        self._origin = time.perf_counter()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _now(self) -> float:
+        return time.perf_counter() - self._origin
+
+    def _finish(self, span: Span) -> None:
+        span.end = self._now()
+        with self._lock:
+            self.spans.append(span)
+
+    def write_jsonl(self, path: Path) -> None:
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s.start)
+        with open(path, "w", encoding="utf-8") as f:
+            for s in spans:
+                f.write(json.dumps({**asdict(s), "duration": round(s.duration, 6)}, default=str) + "\n")
+
+    def write_chrome_trace(self, path: Path) -> None:
+        """Trace Event Format, loadable in chrome://tracing or Perfetto.
+
+        Each top-level span (one pipeline run) gets its own row, so concurrent
+        runs sharing the event loop don't overlap.
+        """
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s.start)
+
+        pid = os.getpid()
+        events = []
+        for s in spans:
+            events.append({
+                "name": s.name,
+                "cat": s.name.split(".")[0],
+                "ph": "X",
+                "ts": round(s.start * 1e6),
+                "dur": round(s.duration * 1e6),
+                "pid": pid,
+                "tid": s.root_id,
+                "args": {**s.attrs, "thread": s.thread},
+            })
+        # Label rows by their root span
+        for s in spans:
+            if s.parent_id is None:
+                label = " ".join(str(v) for v in s.attrs.values()) or s.name
+                events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": s.id, "args": {"name": label}})
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+_tracer: ContextVar[Optional[Tracer]] = ContextVar("tracer", default=None)
+_parent: ContextVar[Optional[Span]] = ContextVar("trace_parent", default=None)
+
+
+@contextmanager
+def use_tracer(tracer: Optional[Tracer]) -> Iterator[Optional[Tracer]]:
+    """Record spans into `tracer` for the enclosed block; None leaves tracing off."""
+    token = _tracer.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _tracer.reset(token)
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Optional[Span]]:
+    """Time the enclosed block as a child of the current span."""
+    tracer = _tracer.get()
+    if tracer is None:
+        yield None
+        return
+
+    parent = _parent.get()
+    span_id = next(tracer._ids)
+    current = Span(
+        id=span_id,
+        parent_id=parent.id if parent else None,
+        root_id=parent.root_id if parent else span_id,
+        name=name,
+        start=tracer._now(),
+        thread=threading.current_thread().name,
+        attrs={**(parent.attrs if parent else {}), **attrs},
+    )
+    token = _parent.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.attrs["error"] = type(e).__name__
+        raise
+    finally:
+        _parent.reset(token)
+        tracer._finish(current)
+
+
+def annotate(**attrs: Any) -> None:
+    """Add attributes to the current span, if any."""
+    current = _parent.get()
+    if current is not None and _tracer.get() is not None:
+        current.attrs.update(attrs)
+
+
+def traced(name: str, *arg_names: str) -> Callable:
+    """Decorator that runs the function (sync or async) inside span(name).
+
+    `arg_names` are copied from the call's arguments into the span attributes.
+    """
+    def decorator(fn: Callable) -> Callable:
+        signature = inspect.signature(fn)
+
+        def attrs_of(args: tuple, kwargs: dict) -> dict[str, Any]:
+            if not arg_names:
+                return {}
+            bound = signature.bind_partial(*args, **kwargs).arguments
+            return {a: bound[a] for a in arg_names if a in bound}
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                if _tracer.get() is None:
+                    return await fn(*args, **kwargs)
+                with span(name, **attrs_of(args, kwargs)):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _tracer.get() is None:
+                return fn(*args, **kwargs)
+            with span(name, **attrs_of(args, kwargs)):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator